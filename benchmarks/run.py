@@ -0,0 +1,379 @@
+"""
+Times the app's hot paths against a seeded database and compares them
+with stored baselines.
+
+    python -m benchmarks.run                        # seed a temp db, compare with baseline.json
+    python -m benchmarks.run --scale medium --db data/bench.db
+    python -m benchmarks.run --update-baseline      # after an intended change, or on a new machine
+
+Each benchmark runs in several rounds and the quickest round's median
+counts. Results are written as JSON (--output). A benchmark regresses
+when that median is more than its threshold slower than the baseline's
+and by more than --min-delta-ms, which keeps sub-millisecond noise from
+failing a run; the exit status is 1 if anything regressed. Baselines
+only compare on the machine and scale they were recorded with.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlalchemy
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from benchmarks.seed import ADMIN_USER, PASSWORD, SeedConfig, add_seed_arguments, config_from_args, seed
+from data.database import create_db_engine
+from models.invoice import Invoice
+from models.product import Product
+from core.services.cart_service import Cart, CartService, ProductCatalog
+from core.services.invoice_service import InvoiceService
+from core.services.product_service import ProductService
+from core.services.report_service import ReportService
+from core.services.sales_journal import SalesJournal
+from core.services.user_service import UserService
+from core.settings import get_settings
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCH_DIR, "results", "latest.json")
+
+DEFAULT_THRESHOLD = 0.25
+MIN_DELTA_MS = 0.5
+PER_PAGE = 10 # what the list screens show
+
+
+class Context:
+    """The seeded database and the sample keys benchmarks draw from"""
+
+    def __init__(self, engine: Engine, config: SeedConfig):
+        self.engine = engine
+        self.config = config
+        self.random = random.Random(config.seed)
+        with Session(engine) as db:
+            self.barcodes = db.scalars(select(Product.barcode).order_by(Product.id)).all()
+            # Enough stock for every sale the benchmark makes
+            self.stocked_ids = db.scalars(select(Product.id).where(Product.quantity >= 100)).all()
+            self.products = db.scalar(select(func.count(Product.id)))
+            self.invoices = db.scalar(select(func.count(Invoice.id)))
+            self.newest = db.scalar(select(func.max(Invoice.date))) or datetime.now()
+        self._journal: Optional[SalesJournal] = None
+        self._journal_dir: Optional[str] = None
+
+    def session(self) -> Session:
+        return Session(bind=self.engine, autoflush=False)
+
+    def journal(self) -> SalesJournal:
+        """A sales journal on the seeded database, configured like the till's, in a temp dir"""
+        if self._journal is None:
+            options = dict(get_settings()["journal"])
+            options.pop("path")
+            self._journal_dir = tempfile.mkdtemp(prefix="cashier-bench-journal-")
+            self._journal = SalesJournal(self.engine, os.path.join(self._journal_dir, "sales.journal"), **options)
+            self._journal.open()
+        return self._journal
+
+    def close(self) -> None:
+        """Stop the journal once its sales are applied"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+            shutil.rmtree(self._journal_dir, ignore_errors=True)
+
+    def middle_page(self, rows: int) -> int:
+        return max(1, (rows // PER_PAGE) // 2)
+
+
+@dataclass
+class Benchmark:
+    name: str
+    # Takes the context, returns the operation to time; one fresh Session per call
+    setup: Callable[[Context], Callable[[Session], object]]
+    repeat: int = 50
+    warmup: int = 3
+    threshold: float = DEFAULT_THRESHOLD
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, **options):
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, setup, **options))
+        return setup
+    return register
+
+
+@benchmark("cart.checkout", repeat=100)
+def _checkout(ctx: Context):
+    # The till's path: a cart of catalog entries, journaled by CartService
+    journal = ctx.journal()
+    with ctx.session() as db:
+        catalog = ProductCatalog(db)
+        catalog.load()
+
+    def run(db: Session):
+        cart = Cart()
+        for product_id in ctx.random.sample(ctx.stocked_ids, min(3, len(ctx.stocked_ids))):
+            cart.add(catalog.get(product_id))
+        CartService(db, journal).checkout(cart)
+    return run
+
+
+@benchmark("product.search", repeat=20)
+def _search_products(ctx: Context):
+    terms = ["rice", "premium", "cedar", "1kg", "#12", "200000001"]
+    return lambda db: ProductService(db).search_products(ctx.random.choice(terms))
+
+
+@benchmark("product.barcode", repeat=200)
+def _barcode_lookup(ctx: Context):
+    return lambda db: ProductService(db).get_product_by_barcode(ctx.random.choice(ctx.barcodes))
+
+
+@benchmark("list.products.first", repeat=100)
+def _products_first_page(ctx: Context):
+    return lambda db: ProductService(db).get_products_paginated(1, PER_PAGE)
+
+
+@benchmark("list.products.middle", repeat=100)
+def _products_middle_page(ctx: Context):
+    page = ctx.middle_page(ctx.products)
+    return lambda db: ProductService(db).get_products_paginated(page, PER_PAGE)
+
+
+@benchmark("list.invoices.first", repeat=100)
+def _invoices_first_page(ctx: Context):
+    return lambda db: InvoiceService(db).get_invoices_paginated(1, PER_PAGE)
+
+
+@benchmark("list.invoices.middle", repeat=100)
+def _invoices_middle_page(ctx: Context):
+    page = ctx.middle_page(ctx.invoices)
+    return lambda db: InvoiceService(db).get_invoices_paginated(page, PER_PAGE)
+
+
+@benchmark("list.users", repeat=100)
+def _users_page(ctx: Context):
+    return lambda db: UserService(db).get_users_paginated(1, PER_PAGE)
+
+
+@benchmark("report.daily", repeat=50)
+def _daily_report(ctx: Context):
+    day = ctx.newest.date()
+    return lambda db: ReportService(db).get_daily_sales_report(day)
+
+
+@benchmark("report.monthly", repeat=10)
+def _monthly_report(ctx: Context):
+    # The last full month of sales
+    month_end = ctx.newest.date().replace(day=1) - timedelta(days=1)
+    return lambda db: ReportService(db).get_monthly_sales_report(month_end.year, month_end.month)
+
+
+@benchmark("auth.login", repeat=5, warmup=1, threshold=0.5)
+def _login(ctx: Context):
+    # bcrypt is calibrated to a target time, so this mostly tracks security.target_ms
+    def run(db: Session):
+        if UserService(db).login(ADMIN_USER, PASSWORD) is None:
+            raise ValueError("Benchmark login failed")
+    return run
+
+
+def measure(bench: Benchmark, ctx: Context, rounds: int = 1) -> Dict[str, float]:
+    """
+    `rounds` runs of `repeat` calls each. The median reported is the
+    lowest round's: a busy machine only ever slows a round down, so the
+    quickest is the one least disturbed.
+    """
+    operation = bench.setup(ctx)
+    medians = []
+    timings = []
+    for _ in range(rounds):
+        round_timings = []
+        for n in range(bench.warmup + bench.repeat):
+            with ctx.session() as db:
+                started = time.perf_counter()
+                operation(db)
+                elapsed = (time.perf_counter() - started) * 1000
+            if n >= bench.warmup:
+                round_timings.append(elapsed)
+        medians.append(statistics.median(round_timings))
+        timings.extend(round_timings)
+    return summarize(timings, min(medians), bench.repeat, rounds, bench.threshold)
+
+
+def summarize(timings: List[float], median: float, repeat: int, rounds: int, threshold: float) -> Dict[str, float]:
+    timings = sorted(timings)
+    return {
+        "repeat": repeat,
+        "rounds": rounds,
+        "median_ms": round(median, 4),
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "min_ms": round(timings[0], 4),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+        "max_ms": round(timings[-1], 4),
+        "threshold": threshold,
+    }
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "machine": platform.node(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "sqlalchemy": sqlalchemy.__version__,
+    }
+
+
+def compare(results: Dict, baseline: Dict, min_delta_ms: float) -> List[Dict]:
+    """One row per benchmark in both runs; `regressed` marks the failures"""
+    rows = []
+    for name, result in results["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            continue
+        change = result["median_ms"] / base["median_ms"] - 1 if base["median_ms"] else 0.0
+        regressed = (
+            change > result["threshold"]
+            and result["median_ms"] - base["median_ms"] > min_delta_ms
+        )
+        rows.append({
+            "name": name, "baseline_ms": base["median_ms"], "median_ms": result["median_ms"],
+            "change": round(change, 4), "regressed": regressed,
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the cashier's services on synthetic data")
+    parser.add_argument("--db", help="seeded database to use, seeded first if missing (default: a temp file)")
+    add_seed_arguments(parser)
+    parser.add_argument("--only", action="append", help="run benchmarks whose name starts with this")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per benchmark; the quickest round counts")
+    add_output_arguments(parser, RESULTS_PATH, BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    config = config_from_args(args)
+    temp_dir = None
+    path = args.db
+    if path is None:
+        temp_dir = tempfile.mkdtemp(prefix="cashier-bench-")
+        path = os.path.join(temp_dir, "bench.db")
+    try:
+        engine = create_db_engine(path)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            started = time.perf_counter()
+            counts = seed(engine, config)
+            print(f"Seeded {path} in {time.perf_counter() - started:.1f} s: "
+                  + ", ".join(f"{count:,} {name}" for name, count in counts.items()))
+
+        ctx = Context(engine, config)
+        results = {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "environment": environment(),
+            "seed": asdict(config),
+            "benchmarks": {},
+        }
+        for bench in BENCHMARKS:
+            if args.only and not any(bench.name.startswith(prefix) for prefix in args.only):
+                continue
+            results["benchmarks"][bench.name] = measure(bench, ctx, args.rounds)
+            result = results["benchmarks"][bench.name]
+            print(f"{bench.name:<24} median {result['median_ms']:>10.3f} ms   p95 {result['p95_ms']:>10.3f} ms")
+        ctx.close()
+        engine.dispose()
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return finish(results, args)
+
+
+def add_output_arguments(parser: argparse.ArgumentParser, results_path: str, baseline_path: str) -> None:
+    parser.add_argument("--output", default=results_path, help="where to write the results JSON")
+    parser.add_argument("--baseline", default=baseline_path)
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=MIN_DELTA_MS)
+
+
+def finish(results: Dict, args: argparse.Namespace) -> int:
+    """Write the results, store or compare with the baseline; the exit status"""
+    if args.update_baseline:
+        _write(args.output, results)
+        _write(args.baseline, _merged_baseline(results, args.baseline))
+        print(f"Results written to {args.output}; baseline updated: {args.baseline}")
+        return 0
+
+    rows = _compare_with_baseline(results, args.baseline, args.min_delta_ms)
+    if rows is not None:
+        results["comparison"] = {"baseline": args.baseline, "min_delta_ms": args.min_delta_ms, "rows": rows}
+    _write(args.output, results)
+    print(f"Results written to {args.output}")
+    if not rows:
+        return 0
+
+    width = max(len(row["name"]) for row in rows)
+    print()
+    print(f"{'benchmark':<{width}} {'baseline':>12} {'now':>12} {'change':>8}")
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(f"{row['name']:<{width}} {row['baseline_ms']:>9.3f} ms {row['median_ms']:>9.3f} ms {row['change']:>+8.1%}{flag}")
+    regressions = [row["name"] for row in rows if row["regressed"]]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def _merged_baseline(results: Dict, path: str) -> Dict:
+    """This run as the baseline, keeping the entries of benchmarks it skipped (--only)"""
+    if not os.path.exists(path):
+        return results
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("seed") != results["seed"]:
+        return results
+    return {**results, "benchmarks": {**baseline["benchmarks"], **results["benchmarks"]}}
+
+
+def _compare_with_baseline(results: Dict, path: str, min_delta_ms: float):
+    """Comparison rows, or None when there is no baseline that fits this run"""
+    if not os.path.exists(path):
+        print("No baseline to compare with; record one with --update-baseline")
+        return None
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("seed") != results["seed"]:
+        print("The baseline was recorded at a different scale; not comparing")
+        return None
+    if baseline.get("environment") != results["environment"]:
+        print("The baseline was recorded in another environment; expect differences that aren't regressions")
+    return compare(results, baseline, min_delta_ms)
+
+
+def _write(path: str, data: Dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""
+Fills a database with a store's worth of synthetic data for benchmarks.
+
+    python -m benchmarks.seed --db data/bench.db --scale medium
+    python -m benchmarks.seed --db data/bench.db --products 50000 --invoices 500000
+
+The same seed always gives the same data, dated back from today.
+Volumes and shapes follow a small shop: a few large categories and many
+small ones, prices spread log-normally, sales following a long-tailed
+popularity curve, more trade at lunch, in the evening and at weekends,
+and baskets of mostly one to four lines.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Dict, Iterable, List
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from data.database import create_db_engine, import_models
+from enums.invoice_status_enum import InvoiceStatus
+from enums.user_role_enum import UserRole
+from models.base import Base
+from models.category import Category
+from models.customer import Customer
+from models.invoice import Invoice
+from models.invoice_item import InvoiceItem
+from models.product import Product
+from models.user import User
+from core.security import hash_password
+from core.services.barcode_allocator import get_barcode_allocator
+
+# Logins the benchmarks use; every seeded user shares the password
+ADMIN_USER = "bench_admin"
+PASSWORD = "bench-password"
+
+CHUNK = 5000
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    categories: int = 20
+    products: int = 2000
+    customers: int = 500
+    invoices: int = 20000
+    users: int = 10
+    days: int = 180
+    seed: int = 1
+
+
+SCALES: Dict[str, SeedConfig] = {
+    "small": SeedConfig(),
+    "medium": SeedConfig(categories=50, products=20000, customers=5000, invoices=200000, users=25, days=365),
+    "large": SeedConfig(categories=100, products=100000, customers=20000, invoices=1000000, users=50, days=730),
+}
+
+_NOUNS = [
+    "Rice", "Sugar", "Tea", "Coffee", "Milk", "Cheese", "Yogurt", "Bread", "Pasta", "Flour",
+    "Oil", "Tuna", "Beans", "Lentils", "Chickpeas", "Biscuits", "Chocolate", "Juice", "Water", "Soda",
+    "Soap", "Shampoo", "Detergent", "Tissues", "Toothpaste", "Dates", "Olives", "Jam", "Honey", "Eggs",
+]
+_ADJECTIVES = ["Classic", "Premium", "Family", "Light", "Organic", "Extra", "Fresh", "Mini", "Gold", "Natural"]
+_BRANDS = ["Alpha", "Orchard", "Sunrise", "Delta", "Nour", "Crown", "Meadow", "Atlas", "Riviera", "Cedar"]
+_SIZES = ["100g", "250g", "500g", "1kg", "2kg", "330ml", "500ml", "1L", "1.5L", "6 pack", "12 pack"]
+_FIRST_NAMES = ["Ahmad", "Sara", "Omar", "Lina", "Yusuf", "Maya", "Karim", "Rana", "Sami", "Huda", "Ziad", "Nadia"]
+_LAST_NAMES = ["Haddad", "Khalil", "Nasser", "Saleh", "Aziz", "Darwish", "Mansour", "Yousef", "Hamdan", "Issa"]
+
+# Share of the day's sales per opening hour, 8:00 to 21:00: a lunch and an evening peak
+_HOURS = list(range(8, 22))
+_HOUR_WEIGHTS = [2, 3, 4, 6, 9, 8, 5, 4, 5, 7, 9, 8, 5, 3]
+# Monday first; Friday and the weekend are busier
+_WEEKDAY_WEIGHTS = [0.9, 0.85, 0.9, 0.95, 1.2, 1.35, 1.1]
+
+
+def _chunks(rows: Iterable[dict], size: int = CHUNK) -> Iterable[List[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Seeder:
+    """Writes one SeedConfig into an empty database with bulk inserts"""
+
+    def __init__(self, engine: Engine, config: SeedConfig):
+        self.engine = engine
+        self.config = config
+        self.random = random.Random(config.seed)
+
+    def run(self) -> Dict[str, int]:
+        import_models()
+        Base.metadata.create_all(self.engine)
+        with self.engine.connect() as conn:
+            if conn.execute(Product.__table__.select().limit(1)).first() is not None:
+                raise ValueError("The database already has products; seed an empty one")
+
+        category_ids = self._categories()
+        products = self._products(category_ids)
+        customer_ids = self._customers()
+        self._users()
+        invoices, items = self._invoices(products, customer_ids)
+        return {
+            "categories": len(category_ids), "products": len(products), "customers": len(customer_ids),
+            "users": self.config.users, "invoices": invoices, "invoice_items": items,
+        }
+
+    def _insert(self, table, rows: Iterable[dict]) -> None:
+        with self.engine.begin() as conn:
+            for chunk in _chunks(rows):
+                conn.execute(insert(table), chunk)
+
+    def _ids(self, table) -> List[int]:
+        with self.engine.connect() as conn:
+            return conn.execute(table.select().with_only_columns(table.c.id).order_by(table.c.id)).scalars().all()
+
+    def _categories(self) -> List[int]:
+        names = list(_NOUNS)
+        names += [f"{noun} {n}" for n in range(2, self.config.categories // len(_NOUNS) + 2) for noun in _NOUNS]
+        self._insert(Category.__table__, (
+            {"name": name, "description": f"{name} and related products"}
+            for name in names[:self.config.categories]
+        ))
+        return self._ids(Category.__table__)
+
+    def _products(self, category_ids: List[int]) -> List[dict]:
+        rnd = self.random
+        # A few large categories and a long tail of small ones
+        category_weights = list(accumulate(rnd.paretovariate(1.2) for _ in category_ids))
+        barcodes = get_barcode_allocator(self.engine).take(self.config.products)
+        rows = []
+        for index, barcode in enumerate(barcodes):
+            # Median price 20, most between 5 and 80
+            price = max(1, min(5000, round(rnd.lognormvariate(math.log(20), 0.7))))
+            # One product in ten is running low
+            quantity = rnd.randint(0, 9) if rnd.random() < 0.1 else rnd.randint(10, 400)
+            rows.append({
+                "name": f"{rnd.choice(_BRANDS)} {rnd.choice(_ADJECTIVES)} {rnd.choice(_NOUNS)} {rnd.choice(_SIZES)} #{index + 1}",
+                "price": price,
+                "quantity": quantity,
+                "barcode": barcode,
+                "category_id": rnd.choices(category_ids, cum_weights=category_weights)[0] if rnd.random() < 0.95 else None,
+            })
+        self._insert(Product.__table__, rows)
+        for row, product_id in zip(rows, self._ids(Product.__table__)):
+            row["id"] = product_id
+        return rows
+
+    def _customers(self) -> List[int]:
+        rnd = self.random
+
+        def customer(n: int) -> dict:
+            first, last = rnd.choice(_FIRST_NAMES), rnd.choice(_LAST_NAMES)
+            return {
+                "name": f"{first} {last}",
+                "phone": f"09{rnd.randint(10000000, 99999999)}" if rnd.random() < 0.8 else None,
+                "email": f"{first.lower()}.{last.lower()}{n}@example.com" if rnd.random() < 0.4 else None,
+            }
+
+        self._insert(Customer.__table__, (customer(n) for n in range(self.config.customers)))
+        return self._ids(Customer.__table__)
+
+    def _users(self) -> None:
+        # One hash for everyone: hashing is what login costs, not what seeding should
+        password_hash = hash_password(PASSWORD)
+        roles = [UserRole.EMPLOYEE] * 8 + [UserRole.MANAGER] * 2
+        rows = [{"user_name": ADMIN_USER, "password_hash": password_hash, "role": UserRole.ADMIN}]
+        rows += [
+            {"user_name": f"cashier{n:03d}", "password_hash": password_hash, "role": self.random.choice(roles)}
+            for n in range(1, self.config.users)
+        ]
+        self._insert(User.__table__, rows)
+
+    def _invoice_dates(self) -> List[datetime]:
+        """`invoices` timestamps over the last `days` days, oldest first"""
+        rnd, config = self.random, self.config
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        # Up to yesterday, so no sale is dated later in the day than now
+        days = [today - timedelta(days=offset) for offset in range(config.days, 0, -1)]
+        # Trade grows slowly over the period, with weekday swings and some noise
+        weights = [
+            _WEEKDAY_WEIGHTS[day.weekday()] * (1 + 0.3 * n / len(days)) * rnd.uniform(0.8, 1.2)
+            for n, day in enumerate(days)
+        ]
+        dates = []
+        for day in rnd.choices(days, weights, k=config.invoices):
+            hour = rnd.choices(_HOURS, _HOUR_WEIGHTS)[0]
+            dates.append(day + timedelta(hours=hour, seconds=rnd.randrange(3600)))
+        dates.sort()
+        return dates
+
+    def _invoices(self, products: List[dict], customer_ids: List[int]):
+        rnd = self.random
+        # Popularity follows a Zipf-like curve over a shuffled catalogue
+        ranked = products[:]
+        rnd.shuffle(ranked)
+        popularity = list(accumulate(1 / (rank + 1) ** 1.05 for rank in range(len(ranked))))
+
+        dates = self._invoice_dates()
+        newest = dates[-1] if dates else datetime.now()
+        invoice_count = item_count = 0
+        # Written a chunk at a time, so the large scale never holds every row in memory
+        with self.engine.begin() as conn:
+            for start in range(0, len(dates), CHUNK):
+                invoice_rows, item_rows = [], []
+                for invoice_id, when in enumerate(dates[start:start + CHUNK], start=start + 1):
+                    # Mostly one to four lines, now and then a big shop
+                    lines = min(1 + int(rnd.expovariate(0.45)), 25)
+                    chosen = {product["id"]: product for product in rnd.choices(ranked, cum_weights=popularity, k=lines)}
+                    amount = 0
+                    for product in chosen.values():
+                        quantity = rnd.choices((1, 2, 3, 4, 6), (70, 18, 6, 4, 2))[0]
+                        line_total = product["price"] * quantity
+                        amount += line_total
+                        item_rows.append({
+                            "invoice_id": invoice_id, "product_id": product["id"], "quantity": quantity,
+                            "unit_price": product["price"], "total_price": line_total,
+                        })
+                    # Only the last hours still have open invoices
+                    if newest - when < timedelta(hours=6) and rnd.random() < 0.3:
+                        status = InvoiceStatus.PENDING
+                    else:
+                        status = InvoiceStatus.CANCELLED if rnd.random() < 0.03 else InvoiceStatus.PAID
+                    invoice_rows.append({
+                        "id": invoice_id,
+                        "customer_id": rnd.choice(customer_ids) if customer_ids and rnd.random() < 0.25 else None,
+                        "date": when, "status": status, "total_amount": amount,
+                    })
+                conn.execute(insert(Invoice.__table__), invoice_rows)
+                conn.execute(insert(InvoiceItem.__table__), item_rows)
+                invoice_count += len(invoice_rows)
+                item_count += len(item_rows)
+        return invoice_count, item_count
+
+
+def seed(engine: Engine, config: SeedConfig) -> Dict[str, int]:
+    """Fill an empty database; returns the row counts written"""
+    return Seeder(engine, config).run()
+
+
+def config_from_args(args: argparse.Namespace) -> SeedConfig:
+    overrides = {
+        field: getattr(args, field) for field in asdict(SeedConfig())
+        if getattr(args, field, None) is not None
+    }
+    return replace(SCALES[args.scale], **overrides)
+
+
+def add_seed_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    for field in asdict(SeedConfig()):
+        parser.add_argument(f"--{field}", type=int, help=f"override the scale's {field}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Seed a database with synthetic store data")
+    parser.add_argument("--db", required=True, help="SQLite file to create")
+    add_seed_arguments(parser)
+    args = parser.parse_args(argv)
+    if os.path.exists(args.db):
+        parser.error(f"{args.db} already exists")
+
+    config = config_from_args(args)
+    started = time.perf_counter()
+    counts = seed(create_db_engine(args.db), config)
+    print(f"Seeded {args.db} in {time.perf_counter() - started:.1f} s: "
+          + ", ".join(f"{count:,} {name}" for name, count in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+"""
+Headless benchmarks of the heaviest widgets, on Qt's offscreen platform
+so they run on any Linux box without a display.
+
+    python -m benchmarks.ui
+    python -m benchmarks.ui --sizes 100 1000 --only ui.product_table
+    python -m benchmarks.ui --update-baseline
+
+Times construction (up to the first shown, laid-out frame), population
+of the product and invoice tables at 100, 1k and 10k rows and a full
+repaint, against rows loaded from a seeded database. Memory is the
+growth of the process's resident set, so it includes what Qt allocates
+in C++. It is measured before any timing, with every measured widget
+kept alive, so no memory freed by an earlier benchmark is reused; the
+figures are still approximate. Results and baselines work as in benchmarks.run.
+"""
+import argparse
+import ctypes
+import gc
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Before anything imports Qt
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent, qInstallMessageHandler
+from PySide6.QtWidgets import QApplication
+from sqlalchemy import select
+from sqlalchemy.orm import Session, close_all_sessions, joinedload
+
+from benchmarks.run import BENCH_DIR, DEFAULT_THRESHOLD, add_output_arguments, environment, finish, summarize
+from benchmarks.seed import ADMIN_USER, SeedConfig, seed
+from data.database import SessionLocal, create_db_engine
+from models.category import Category
+from models.invoice import Invoice
+from models.product import Product
+from models.user import User
+from core.theme import apply_theme
+from core.services.audit_log import close_audit_log, get_audit_log
+from viewmodels.dashboard.dashboard_viewmodel import DashboardViewModel
+from views.dashboard.dashboard_view import DashboardView
+from views.invoices.invoice_components import InvoiceTable
+from views.products.product_components import AddEditProductDialog, ProductTable
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "ui_baseline.json")
+RESULTS_PATH = os.path.join(BENCH_DIR, "results", "ui_latest.json")
+
+SIZES = (100, 1000, 10000)
+WINDOW_SIZE = (1280, 800)
+# Enough rows for the largest size, and a small shop's history behind the dashboard
+UI_SEED = SeedConfig(categories=30, products=10000, customers=2000, invoices=10000, users=5, days=60)
+
+
+try:
+    _libc = ctypes.CDLL("libc.so.6")
+except OSError:
+    _libc = None
+
+
+def _quiet_offscreen(mode, context, message) -> None:
+    # The offscreen platform warns about this on every top-level window shown
+    if "propagateSizeHints" not in message:
+        sys.stderr.write(message + "\n")
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process, None off Linux"""
+    gc.collect()
+    if _libc is not None:
+        # Hand freed heap back to the OS, so the growth that follows is all new
+        _libc.malloc_trim(0)
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+class Harness:
+    def __init__(self, app: QApplication, only: Optional[List[str]] = None):
+        self.app = app
+        self.only = only
+        self.results: Dict[str, Dict] = {}
+
+    def wanted(self, name: str) -> bool:
+        return not self.only or any(name.startswith(prefix) for prefix in self.only)
+
+    def settle(self) -> None:
+        """Let Qt run the polish, layout and paint events a change posted"""
+        self.app.processEvents()
+
+    def time(self, name: str, operation: Callable[[object], None], repeat: int,
+             setup: Callable[[], object] = lambda: None, teardown: Callable[[object], None] = lambda target: None,
+             threshold: float = DEFAULT_THRESHOLD, **extra) -> None:
+        """
+        Time `operation(setup())` plus the events it leaves behind, `repeat`
+        times; setup and teardown are not timed
+        """
+        timings = []
+        for _ in range(repeat):
+            target = setup()
+            self.settle()
+            started = time.perf_counter()
+            operation(target)
+            self.settle()
+            timings.append((time.perf_counter() - started) * 1000)
+            teardown(target)
+        result = summarize(timings, statistics.median(timings), repeat, 1, threshold)
+        result.update(extra)
+        self.results[name] = result
+        print(f"{name:<36} median {result['median_ms']:>10.3f} ms" + "".join(
+            f"   {key} {value:,}" for key, value in extra.items() if value is not None
+        ))
+
+    def dispose(self, widget) -> None:
+        widget.close()
+        widget.deleteLater()
+        QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        gc.collect()
+
+    def dispose_all(self, widgets: list) -> None:
+        for widget in widgets:
+            self.dispose(widget)
+
+    def construct(self, factory: Callable[[], object]) -> Callable[[list], None]:
+        """An operation that builds and shows one widget, kept in the list it is given for disposal"""
+        return lambda widgets: widgets.append(self.shown(factory))
+
+    def shown(self, factory: Callable[[], object]):
+        widget = factory()
+        widget.resize(*WINDOW_SIZE)
+        widget.show()
+        return widget
+
+
+def _repeat_for(rows: int) -> int:
+    return 5 if rows <= 100 else 3 if rows <= 1000 else 1
+
+
+def _growth(before: Optional[int], after: Optional[int], count: int) -> Optional[int]:
+    return (after - before) // count if before is not None and after is not None else None
+
+
+class TableBench:
+    """Construction, population and repaint of a table widget at several sizes"""
+
+    def __init__(self, name: str, factory: Callable[[], object], populate: Callable[[object, list], None], rows: list):
+        self.name = name
+        self.factory = factory
+        self.populate = populate
+        self.rows = rows
+        self.memory: Dict[int, Optional[int]] = {}
+
+    def sizes(self, harness: Harness, sizes: List[int]) -> List[int]:
+        usable = [size for size in sizes if size <= len(self.rows)]
+        for size in sorted(set(sizes) - set(usable)):
+            print(f"{self.name}: only {len(self.rows):,} rows seeded, skipping {size:,}")
+        return usable
+
+    def measure_memory(self, harness: Harness, sizes: List[int], keep: list) -> None:
+        """Resident growth per row; the tables stay alive in `keep`, so nothing freed is reused"""
+        for size in self.sizes(harness, sizes):
+            if not harness.wanted(f"{self.name}.populate.{size}"):
+                continue
+            table = harness.shown(self.factory)
+            keep.append(table)
+            harness.settle()
+            before = rss_bytes()
+            self.populate(table, self.rows[:size])
+            harness.settle()
+            self.memory[size] = _growth(before, rss_bytes(), size)
+
+    def run(self, harness: Harness, sizes: List[int]) -> None:
+        if harness.wanted(f"{self.name}.construct"):
+            harness.time(
+                f"{self.name}.construct", harness.construct(self.factory), repeat=10,
+                setup=list, teardown=harness.dispose_all,
+            )
+
+        for size in self.sizes(harness, sizes):
+            page = self.rows[:size]
+            if harness.wanted(f"{self.name}.populate.{size}"):
+                harness.time(
+                    f"{self.name}.populate.{size}", lambda table: self.populate(table, page), _repeat_for(size),
+                    setup=lambda: harness.shown(self.factory), teardown=harness.dispose,
+                    rss_per_row_bytes=self.memory.get(size),
+                )
+            if harness.wanted(f"{self.name}.repaint.{size}"):
+                table = harness.shown(self.factory)
+                self.populate(table, page)
+                harness.settle()
+                harness.time(f"{self.name}.repaint.{size}", lambda _: table.repaint(), repeat=10)
+                harness.dispose(table)
+
+
+class WidgetBench:
+    """
+    Construction of a window or dialog to its first frame, a repaint, and
+    the memory one instance holds, averaged over `memory_samples` live at
+    once; `cleanup` runs after instances are disposed of
+    """
+
+    def __init__(self, name: str, factory: Callable[[], object], repeat: int, memory_samples: int = 1,
+                 cleanup: Callable[[], None] = lambda: None):
+        self.name = name
+        self.factory = factory
+        self.repeat = repeat
+        self.memory_samples = memory_samples
+        self.cleanup = cleanup
+        self.memory: Optional[int] = None
+
+    def dispose(self, harness: Harness, widgets: list) -> None:
+        harness.dispose_all(widgets)
+        self.cleanup()
+
+    def measure_memory(self, harness: Harness, sizes: List[int], keep: list) -> None:
+        if not harness.wanted(f"{self.name}.construct"):
+            return
+        before = rss_bytes()
+        widgets = [harness.shown(self.factory) for _ in range(self.memory_samples)]
+        keep.extend(widgets)
+        harness.settle()
+        self.memory = _growth(before, rss_bytes(), self.memory_samples)
+
+    def run(self, harness: Harness, sizes: List[int]) -> None:
+        if harness.wanted(f"{self.name}.construct"):
+            harness.time(
+                f"{self.name}.construct", harness.construct(self.factory), self.repeat,
+                setup=list, teardown=lambda widgets: self.dispose(harness, widgets), rss_bytes=self.memory,
+            )
+        if harness.wanted(f"{self.name}.repaint"):
+            widget = harness.shown(self.factory)
+            harness.settle()
+            harness.time(f"{self.name}.repaint", lambda _: widget.repaint(), repeat=10)
+            self.dispose(harness, [widget])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark widget construction, population and painting offscreen")
+    parser.add_argument("--db", help="database seeded for the UI benchmarks, seeded first if missing (default: a temp file)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="table sizes in rows")
+    parser.add_argument("--only", action="append", help="run benchmarks whose name starts with this")
+    add_output_arguments(parser, RESULTS_PATH, BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    qInstallMessageHandler(_quiet_offscreen)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    apply_theme(app)
+
+    temp_dir = None
+    path = args.db
+    if path is None:
+        temp_dir = tempfile.mkdtemp(prefix="cashier-ui-bench-")
+        path = os.path.join(temp_dir, "bench.db")
+    engine = create_db_engine(path)
+    try:
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            seed(engine, UI_SEED)
+        # The screens open their own sessions from SessionLocal
+        SessionLocal.configure(bind=engine)
+        get_audit_log(engine)
+
+        results = {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "environment": {**environment(), "qt_platform": app.platformName()},
+            "seed": asdict(UI_SEED),
+            "benchmarks": {},
+        }
+        harness = Harness(app, args.only)
+        with Session(engine) as db:
+            products = db.scalars(
+                select(Product).options(joinedload(Product.category)).order_by(Product.id).limit(max(args.sizes))
+            ).all()
+            invoices = db.scalars(
+                select(Invoice).options(joinedload(Invoice.customer)).order_by(Invoice.id.desc()).limit(max(args.sizes))
+            ).all()
+            categories = db.scalars(select(Category).order_by(Category.name)).all()
+            admin = db.scalars(select(User).where(User.user_name == ADMIN_USER)).one()
+            run_benchmarks(harness, db, products, invoices, categories, admin, args.sizes)
+        results["benchmarks"] = harness.results
+    finally:
+        close_audit_log()
+        engine.dispose()
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return finish(results, args)
+
+
+def run_benchmarks(harness: Harness, db: Session, products: list, invoices: list, categories: list,
+                   admin: User, sizes: List[int]) -> None:
+    benches = [
+        TableBench("ui.product_table", ProductTable, lambda table, rows: table.set_products(rows), products),
+        TableBench("ui.invoice_table", InvoiceTable, lambda table, rows: table.set_invoices(rows), invoices),
+        WidgetBench(
+            "ui.product_dialog", lambda: AddEditProductDialog(None, products[0], categories=categories),
+            repeat=20, memory_samples=20,
+        ),
+        # Each screen on the dashboard opens a session of its own and never closes it
+        WidgetBench(
+            "ui.dashboard", lambda: DashboardView(DashboardViewModel(db, admin)), repeat=3,
+            cleanup=close_all_sessions,
+        ),
+    ]
+
+    # Memory first, while the heap holds nothing freed that new widgets could reuse
+    keep = []
+    for bench in benches:
+        bench.measure_memory(harness, sizes, keep)
+    harness.dispose_all(keep)
+    close_all_sessions()
+
+    for bench in benches:
+        bench.run(harness, sizes)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,4 +7,8 @@ class IProductRepository(BaseRepository[Product], ABC):
 
     @abstractmethod
     def get_by_barcode(self, barcode: str)->Optional[Product]:
+        pass
+
+    @abstractmethod
+    def get_many(self, product_ids: List[int])->List[Product]:
         pass
\ No newline at end of file
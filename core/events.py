@@ -0,0 +1,241 @@
+import threading
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Tuple, Type
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Event:
+    """Something that was committed to the database"""
+
+    @property
+    def key(self) -> Optional[Hashable]:
+        """Events with the same key describe the same thing; None never coalesces"""
+        return None
+
+    def merge(self, later: "Event") -> "Event":
+        """Fold a later event with the same key into this one"""
+        return later
+
+
+@dataclass(frozen=True)
+class ProductEvent(Event):
+    product_id: int
+
+    @property
+    def key(self):
+        return (type(self), self.product_id)
+
+
+@dataclass(frozen=True)
+class ProductCreated(ProductEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class ProductUpdated(ProductEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class ProductDeleted(ProductEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class StockChanged(ProductEvent):
+    quantity: int
+    previous: int
+
+    def merge(self, later):
+        return replace(later, previous=self.previous)
+
+
+@dataclass(frozen=True)
+class PriceChanged(ProductEvent):
+    price: int
+    previous: int
+
+    def merge(self, later):
+        return replace(later, previous=self.previous)
+
+
+@dataclass(frozen=True)
+class ProductsAdjusted(Event):
+    """One bulk price or stock adjustment, published instead of an event per product"""
+    product_ids: Tuple[int, ...]
+    field: str # "price" or "quantity"
+    description: str
+
+
+@dataclass(frozen=True)
+class CategoryEvent(Event):
+    category_id: int
+
+    @property
+    def key(self):
+        return (type(self), self.category_id)
+
+
+@dataclass(frozen=True)
+class CategoryCreated(CategoryEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class CategoryUpdated(CategoryEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class CategoryRenamed(CategoryEvent):
+    name: str
+
+
+@dataclass(frozen=True)
+class CategoryDeleted(CategoryEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class InvoiceCreated(Event):
+    invoice_id: int
+    total_amount: int
+    date: datetime
+
+
+@dataclass(frozen=True)
+class InvoiceCancelled(Event):
+    invoice_id: int
+    total_amount: int
+    date: datetime
+
+
+@dataclass(frozen=True)
+class UserEvent(Event):
+    user_id: int
+
+    @property
+    def key(self):
+        return (type(self), self.user_id)
+
+
+@dataclass(frozen=True)
+class UserCreated(UserEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class UserUpdated(UserEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class UserDeleted(UserEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class UserLoggedIn(Event):
+    user_id: int
+    user_name: str
+    method: str # "password" or "pin"
+
+
+Handler = Callable[[Event], None]
+
+
+def coalesce(events: List[Event]) -> List[Event]:
+    """Merge events with the same key, keeping the position of the first"""
+    merged: "OrderedDict[Hashable, Event]" = OrderedDict()
+    for index, event in enumerate(events):
+        key = event.key
+        if key is None:
+            merged[("unkeyed", index)] = event
+        elif key in merged:
+            merged[key] = merged[key].merge(event)
+        else:
+            merged[key] = event
+    return list(merged.values())
+
+
+class EventBus:
+    """
+    In-process publish/subscribe for committed changes. Handlers run on
+    the publishing thread; viewmodels subscribe through
+    viewmodels.base_vm.EventSubscriber to get them on the UI thread.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[Type[Event], List[Handler]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def subscribe(self, event_type: Type[Event], handler: Handler) -> Callable[[], None]:
+        """Handle `event_type` and its subclasses; returns a function that unsubscribes"""
+        with self._lock:
+            self._handlers[event_type].append(handler)
+
+        def unsubscribe():
+            with self._lock:
+                if handler in self._handlers[event_type]:
+                    self._handlers[event_type].remove(handler)
+
+        return unsubscribe
+
+    def publish(self, event: Event) -> None:
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.append(event)
+        else:
+            self._dispatch(event)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Hold back what this thread publishes and deliver it coalesced at the
+        end; nothing is delivered if the block raises.
+        """
+        if getattr(self._local, "pending", None) is not None:
+            # Nested: the outermost batch delivers
+            yield
+            return
+
+        self._local.pending = []
+        try:
+            yield
+            events = coalesce(self._local.pending)
+        finally:
+            self._local.pending = None
+        for event in events:
+            self._dispatch(event)
+
+    def _dispatch(self, event: Event) -> None:
+        with self._lock:
+            handlers = [
+                handler
+                for event_type in type(event).__mro__ if event_type in self._handlers
+                for handler in self._handlers[event_type]
+            ]
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Event handler failed for %s", event)
+
+
+_bus = EventBus()
+
+
+def get_event_bus() -> EventBus:
+    return _bus
+
+
+def publish(event: Event) -> None:
+    _bus.publish(event)
@@ -0,0 +1,40 @@
+import logging
+import os
+from logging.handlers import RotatingFileHandler
+
+from core.settings import DATA_DIR
+
+LOG_DIR = os.path.join(DATA_DIR, "logs")
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+_configured = False
+
+
+def _configure() -> None:
+    global _configured
+    root = logging.getLogger("cashier")
+    root.setLevel(logging.INFO)
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.addHandler(console)
+
+    try:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            os.path.join(LOG_DIR, "cashier.log"), maxBytes=1_000_000, backupCount=3, encoding="utf-8"
+        )
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(file_handler)
+    except OSError:
+        # Read-only install; console logging is enough
+        pass
+
+    _configured = True
+
+
+def get_logger(name: str = "") -> logging.Logger:
+    """Logger under the application's "cashier" namespace"""
+    if not _configured:
+        _configure()
+    return logging.getLogger(f"cashier.{name}" if name else "cashier")
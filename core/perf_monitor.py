@@ -0,0 +1,263 @@
+"""
+Opt-in UI latency instrumentation.
+
+A heartbeat QTimer measures how late the event loop gets to it, and every
+method of the viewmodel/view classes is wrapped so slots and signal handlers
+are timed by name. Anything slower than the stall threshold is recorded,
+optionally with a stack sample taken by a watchdog thread while the main
+thread is still blocked. Enable it with "perf_monitor.enabled" in
+data/settings.json or CASHIER_PERF=1.
+"""
+import functools
+import importlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from core.logger import get_logger
+from core.settings import BASE_DIR, get_settings, resolve_path
+
+logger = get_logger("perf")
+
+INSTRUMENTED_PACKAGES = ("viewmodels", "views")
+EVENT_LOOP = "event_loop"
+
+_monitor: Optional["PerfMonitor"] = None
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class PerfMonitor(QObject):
+    stallDetected = Signal(str, float) # name, duration ms
+
+    def __init__(
+        self,
+        heartbeat_ms: int = 50,
+        stall_threshold_ms: int = 100,
+        sample_stacks: bool = False,
+        buffer_size: int = 2048,
+        report_path: Optional[str] = None,
+    ):
+        super().__init__()
+        self.heartbeat_ms = heartbeat_ms
+        self.stall_threshold_ms = stall_threshold_ms
+        self.sample_stacks = sample_stacks
+        self.buffer_size = buffer_size
+        self.report_path = report_path
+
+        self._samples: Dict[str, deque] = {}
+        self.stalls: deque = deque(maxlen=200)
+
+        # Names of the instrumented calls currently running on the main thread
+        self._active: List[str] = []
+        # Counts outermost calls, so each run of a command can be told apart
+        self._invocation = 0
+        self._main_thread_id = threading.main_thread().ident
+        self._last_beat = time.perf_counter()
+        self._stack_sample: Optional[List[str]] = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(heartbeat_ms)
+        self._timer.timeout.connect(self._on_heartbeat)
+        self._watchdog: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self) -> None:
+        self._last_beat = time.perf_counter()
+        self._running = True
+        self._timer.start()
+        if self.sample_stacks:
+            self._watchdog = threading.Thread(target=self._watch, name="perf-watchdog", daemon=True)
+            self._watchdog.start()
+
+    def stop(self) -> None:
+        self._running = False
+        self._timer.stop()
+
+    def current_command(self) -> Optional[str]:
+        """Outermost instrumented call running on the main thread, if any"""
+        if threading.get_ident() != self._main_thread_id or not self._active:
+            return None
+        return self._active[0]
+
+    def current_invocation(self) -> Optional[Tuple[int, str]]:
+        """(sequence number, name) of the outermost call running on the main thread, if any"""
+        if threading.get_ident() != self._main_thread_id or not self._active:
+            return None
+        return self._invocation, self._active[0]
+
+    def record(self, name: str, duration_ms: float, check_stall: bool = True) -> None:
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self.buffer_size)
+        samples.append(duration_ms)
+
+        if check_stall and duration_ms >= self.stall_threshold_ms:
+            stall = {
+                "name": name,
+                "ms": round(duration_ms, 2),
+                "at": datetime.now().isoformat(timespec="seconds"),
+            }
+            if self._stack_sample:
+                stall["stack"] = self._stack_sample
+                self._stack_sample = None
+            self.stalls.append(stall)
+            logger.warning("UI stall %.1f ms in %s", duration_ms, name)
+            self.stallDetected.emit(name, duration_ms)
+
+    @contextmanager
+    def measure(self, name: str):
+        if not self._active:
+            self._invocation += 1
+        self._active.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self._active.pop()
+            # Nested calls feed the percentiles; only the outermost call is
+            # reported as the stall so one freeze shows up once
+            self.record(name, duration_ms, check_stall=not self._active)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        for name, samples in self._samples.items():
+            values = sorted(samples)
+            stats[name] = {
+                "count": len(values),
+                "p50": round(percentile(values, 0.50), 3),
+                "p95": round(percentile(values, 0.95), 3),
+                "p99": round(percentile(values, 0.99), 3),
+                "max": round(values[-1], 3),
+            }
+        return stats
+
+    def dump(self, path: Optional[str] = None) -> str:
+        path = resolve_path(path or self.report_path or os.path.join("data", "reports", "perf_report.json"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        report = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "heartbeat_ms": self.heartbeat_ms,
+            "stall_threshold_ms": self.stall_threshold_ms,
+            "stats": self.snapshot(),
+            "stalls": list(self.stalls),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return path
+
+    def instrument_class(self, cls: type) -> None:
+        """Wrap every method defined on `cls` so its calls are timed"""
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("__") or not inspect.isfunction(value):
+                continue
+            if getattr(value, "_perf_wrapped", False):
+                continue
+            setattr(cls, attr, self._timed(f"{cls.__name__}.{attr}", value))
+
+    def instrument_packages(self, packages: Iterable[str] = INSTRUMENTED_PACKAGES) -> None:
+        """Instrument every QObject subclass defined in the given packages"""
+        for module_name in _iter_modules(packages):
+            module = importlib.import_module(module_name)
+            for _, cls in inspect.getmembers(module, inspect.isclass):
+                if cls.__module__ == module.__name__ and issubclass(cls, QObject):
+                    self.instrument_class(cls)
+
+    def _timed(self, name: str, func):
+        code = func.__code__
+        # Qt drops surplus signal arguments based on the slot's signature;
+        # the wrapper hides that signature, so trim them here instead.
+        max_args = None if code.co_flags & inspect.CO_VARARGS else code.co_argcount
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if threading.get_ident() != self._main_thread_id:
+                return func(*args[:max_args], **kwargs)
+            with self.measure(name):
+                return func(*args[:max_args], **kwargs)
+
+        wrapper._perf_wrapped = True
+        return wrapper
+
+    def _on_heartbeat(self) -> None:
+        now = time.perf_counter()
+        lag_ms = (now - self._last_beat) * 1000 - self.heartbeat_ms
+        self._last_beat = now
+        if lag_ms < self.stall_threshold_ms:
+            self._stack_sample = None
+        self.record(EVENT_LOOP, max(lag_ms, 0.0))
+
+    def _watch(self) -> None:
+        interval = self.stall_threshold_ms / 2000
+        sampled_beat = None
+        while self._running:
+            time.sleep(interval)
+            beat = self._last_beat
+            blocked_ms = (time.perf_counter() - beat) * 1000
+            if blocked_ms < self.stall_threshold_ms or sampled_beat == beat:
+                continue
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is not None:
+                self._stack_sample = traceback.format_stack(frame)
+                sampled_beat = beat
+
+
+def _iter_modules(packages: Iterable[str]):
+    # The packages are plain directories without __init__.py, which pkgutil skips
+    for package in packages:
+        package_dir = os.path.join(BASE_DIR, package)
+        for root, dirs, files in os.walk(package_dir):
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            relative = os.path.relpath(root, BASE_DIR).replace(os.sep, ".")
+            for filename in sorted(files):
+                if filename.endswith(".py"):
+                    yield f"{relative}.{filename[:-3]}"
+
+
+def get_monitor() -> Optional[PerfMonitor]:
+    return _monitor
+
+
+def current_command() -> Optional[str]:
+    return _monitor.current_command() if _monitor else None
+
+
+def current_invocation() -> Optional[Tuple[int, str]]:
+    return _monitor.current_invocation() if _monitor else None
+
+
+def install(app, **options) -> PerfMonitor:
+    """Instrument the UI classes and start the heartbeat; call before any view is created"""
+    global _monitor
+    if _monitor is not None:
+        return _monitor
+
+    _monitor = PerfMonitor(**options)
+    _monitor.instrument_packages()
+    _monitor.start()
+    app.aboutToQuit.connect(lambda: logger.info("Perf report written to %s", _monitor.dump()))
+    return _monitor
+
+
+def install_from_settings(app) -> Optional[PerfMonitor]:
+    options = dict(get_settings()["perf_monitor"])
+    enabled = options.pop("enabled", False) or os.environ.get("CASHIER_PERF") == "1"
+    if not enabled:
+        return None
+    return install(app, **options)
@@ -0,0 +1,276 @@
+"""
+Opt-in SQL instrumentation.
+
+SQLAlchemy engine events time every statement and attribute it to the
+command that issued it: the instrumented call the perf monitor is timing,
+else the outermost viewmodel, view or service method on the stack. Each
+command gets its statement count, total time and slowest statements, and
+a statement shape repeated `n_plus_one_threshold` times within one
+invocation of a command is flagged as N+1. Enable it with
+"query_monitor.enabled" in data/settings.json or CASHIER_QUERIES=1.
+"""
+import heapq
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core import perf_monitor
+from core.logger import get_logger
+from core.settings import BASE_DIR, get_settings, resolve_path
+
+logger = get_logger("queries")
+
+COMMAND_PACKAGES = ("viewmodels", "views", os.path.join("core", "services"))
+# Off the main thread there is no event loop turn to end an invocation;
+# a pause this long between statements does instead
+WORKER_GAP_S = 0.2
+
+_COMMAND_DIRS = tuple(os.path.join(BASE_DIR, package) + os.sep for package in COMMAND_PACKAGES)
+_PROJECT_DIR = BASE_DIR + os.sep
+_THIS_FILE = os.path.abspath(__file__)
+_IN_LIST = re.compile(r"\bIN \((?:\?, )+\?\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(VALUES \([^()]*\))(?:, \([^()]*\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_monitor: Optional["QueryMonitor"] = None
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with whitespace collapsed and IN lists and VALUES rows folded to one"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _IN_LIST.sub("IN (?)", shape)
+    return _VALUES_ROWS.sub(r"\1", shape)
+
+
+class _Invocation:
+    """One run of a command on one thread"""
+
+    def __init__(self, command: str, key, now: float):
+        self.command = command
+        self.key = key
+        self.last = now
+        self.statements = 0
+        self.shapes: Counter = Counter()
+
+
+class QueryMonitor(QObject):
+    nPlusOneDetected = Signal(str, str, int) # command, statement shape, repeats
+
+    def __init__(
+        self,
+        slow_ms: float = 20,
+        keep_slowest: int = 10,
+        n_plus_one_threshold: int = 5,
+        report_path: Optional[str] = None,
+    ):
+        super().__init__()
+        self.slow_ms = slow_ms
+        self.keep_slowest = keep_slowest
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.report_path = report_path
+
+        self._lock = threading.Lock()
+        self._main_thread_id = threading.main_thread().ident
+        self._commands: Dict[str, Dict] = {}
+        # (command, shape) -> the worst repeat seen
+        self._n_plus_one: Dict[Tuple[str, str], Dict] = {}
+        self._invocations: Dict[int, _Invocation] = {}
+        # Statements on the main thread between two returns to the event loop
+        # belong to one invocation
+        self._turn = 0
+        self._turn_pending = False
+        self._seq = 0
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def detach(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before_execute)
+        event.remove(engine, "after_cursor_execute", self._after_execute)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._commands.clear()
+            self._n_plus_one.clear()
+            self._invocations.clear()
+
+    def record(self, command: str, key, statement: str, duration_ms: float, site: Optional[str]) -> None:
+        shape = statement_shape(statement)
+        thread_id = threading.get_ident()
+        now = time.monotonic()
+        flagged = None
+        with self._lock:
+            stats = self._commands.get(command)
+            if stats is None:
+                stats = self._commands[command] = {
+                    "invocations": 0, "statements": 0, "total_ms": 0.0, "max_statements": 0, "slowest": [],
+                }
+
+            invocation = self._invocations.get(thread_id)
+            if invocation is None or invocation.key != key or (
+                thread_id != self._main_thread_id and now - invocation.last > WORKER_GAP_S
+            ):
+                invocation = self._invocations[thread_id] = _Invocation(command, key, now)
+                stats["invocations"] += 1
+            invocation.last = now
+            invocation.statements += 1
+            invocation.shapes[shape] += 1
+            repeats = invocation.shapes[shape]
+
+            stats["statements"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_statements"] = max(stats["max_statements"], invocation.statements)
+            self._seq += 1
+            entry = (duration_ms, self._seq, {"ms": round(duration_ms, 3), "sql": shape, "site": site})
+            if len(stats["slowest"]) < self.keep_slowest:
+                heapq.heappush(stats["slowest"], entry)
+            elif self.keep_slowest:
+                heapq.heappushpop(stats["slowest"], entry)
+
+            if repeats >= self.n_plus_one_threshold:
+                found = self._n_plus_one.get((command, shape))
+                if found is None:
+                    flagged = self._n_plus_one[(command, shape)] = {"repeats": repeats, "site": site}
+                elif repeats > found["repeats"]:
+                    found["repeats"] = repeats
+
+        if duration_ms >= self.slow_ms:
+            logger.warning("Slow query %.1f ms in %s at %s: %s", duration_ms, command, site, shape)
+        if flagged is not None:
+            logger.warning("Possible N+1 in %s at %s: %s", command, site, shape)
+            self.nPlusOneDetected.emit(command, shape, repeats)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Per-command stats, the most expensive command first"""
+        with self._lock:
+            commands = sorted(self._commands.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+            return {
+                command: {
+                    "invocations": stats["invocations"],
+                    "statements": stats["statements"],
+                    "per_invocation": round(stats["statements"] / stats["invocations"], 2),
+                    "max_statements": stats["max_statements"],
+                    "total_ms": round(stats["total_ms"], 3),
+                    "slowest": [entry for _, _, entry in sorted(stats["slowest"], reverse=True)],
+                }
+                for command, stats in commands
+            }
+
+    def n_plus_one(self) -> List[Dict]:
+        with self._lock:
+            return [
+                {"command": command, "sql": shape, **found}
+                for (command, shape), found in sorted(self._n_plus_one.items(), key=lambda item: -item[1]["repeats"])
+            ]
+
+    def dump(self, path: Optional[str] = None) -> str:
+        path = resolve_path(path or self.report_path or os.path.join("data", "reports", "query_report.json"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        commands = self.snapshot()
+        report = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "slow_ms": self.slow_ms,
+            "n_plus_one_threshold": self.n_plus_one_threshold,
+            "commands": commands,
+            "n_plus_one": self.n_plus_one(),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        for command, stats in list(commands.items())[:10]:
+            logger.info(
+                "%s: %d statements in %d invocations (max %d), %.1f ms",
+                command, stats["statements"], stats["invocations"], stats["max_statements"], stats["total_ms"],
+            )
+        return path
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        command, key, site = self._attribute()
+        self.record(command, key, statement, duration_ms, site)
+
+    def _attribute(self) -> Tuple[str, object, Optional[str]]:
+        """(command, invocation key, call site) of the statement being executed"""
+        main_thread = threading.get_ident() == self._main_thread_id
+        if main_thread and not self._turn_pending:
+            self._turn_pending = True
+            QTimer.singleShot(0, self._end_turn)
+
+        site = None
+        commands = []
+        frame = sys._getframe(1)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(_PROJECT_DIR) and filename != _THIS_FILE and "site-packages" not in filename:
+                if site is None:
+                    site = f"{os.path.relpath(filename, BASE_DIR)}:{frame.f_lineno}"
+                if filename.startswith(_COMMAND_DIRS):
+                    commands.append(frame.f_code.co_qualname)
+            frame = frame.f_back
+
+        if main_thread:
+            invocation = perf_monitor.current_invocation()
+            if invocation is not None:
+                seq, name = invocation
+                return name, ("perf", seq), site
+            command = commands[-1] if commands else _thread_command()
+            return command, (command, self._turn), site
+
+        # A worker's outermost frame is its loop; the call below it is the command
+        if len(commands) > 1:
+            command = commands[-2]
+        else:
+            command = commands[0] if commands else _thread_command()
+        return command, command, site
+
+    def _end_turn(self) -> None:
+        self._turn += 1
+        self._turn_pending = False
+
+
+def _thread_command() -> str:
+    return f"thread:{threading.current_thread().name}"
+
+
+def get_monitor() -> Optional[QueryMonitor]:
+    return _monitor
+
+
+def install(app, engine: Engine, overlay: bool = True, **options) -> QueryMonitor:
+    """Hook the engine's statements; with `overlay`, also show the live query window"""
+    global _monitor
+    if _monitor is not None:
+        return _monitor
+
+    _monitor = QueryMonitor(**options)
+    _monitor.attach(engine)
+    app.aboutToQuit.connect(lambda: logger.info("Query report written to %s", _monitor.dump()))
+    if overlay:
+        from views.dev.query_overlay import QueryOverlay
+
+        # Kept on the application so it lives as long as the app does
+        app.query_overlay = QueryOverlay(_monitor)
+        app.query_overlay.show()
+    return _monitor
+
+
+def install_from_settings(app, engine: Engine) -> Optional[QueryMonitor]:
+    options = dict(get_settings()["query_monitor"])
+    enabled = options.pop("enabled", False) or os.environ.get("CASHIER_QUERIES") == "1"
+    if not enabled:
+        return None
+    return install(app, engine, **options)
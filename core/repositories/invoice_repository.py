@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from models.invoice import Invoice
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import date
@@ -62,6 +62,7 @@ class InvoiceRepository(IInvoiceRepository):
             offset_value = (page - 1) * per_page
             return (
                 self.db.query(Invoice)
+                .options(joinedload(Invoice.customer))
                 .offset(offset_value)
                 .limit(per_page)
                 .all()
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from models.product import Product
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List
@@ -26,7 +26,7 @@ class ProductRepository(IProductRepository):
     
     def list(self)->List[Product]:
         try:
-            return self.db.query(Product).all()
+            return self.db.query(Product).options(joinedload(Product.category)).all()
         except:
             return []
     
@@ -46,6 +46,11 @@ class ProductRepository(IProductRepository):
         except SQLAlchemyError:
             return False
 
+    def get_many(self, product_ids: List[int])->List[Product]:
+        if not product_ids:
+            return []
+        return self.db.query(Product).filter(Product.id.in_(product_ids)).all()
+
     def get_by_barcode(self, barcode: str)->Product:
         try:
             return (
@@ -61,6 +66,7 @@ class ProductRepository(IProductRepository):
             offset_value = (page - 1) * per_page
             return (
                 self.db.query(Product)
+                .options(joinedload(Product.category))
                 .offset(offset_value)
                 .limit(per_page)
                 .all()
@@ -0,0 +1,87 @@
+import math
+import threading
+import time
+from typing import Optional
+
+from passlib.hash import bcrypt, pbkdf2_sha256 # type: ignore
+
+from core.logger import get_logger
+from core.settings import get_settings
+
+logger = get_logger(__name__)
+
+_CALIBRATION_PASSWORD = "calibration-only"
+PIN_MIN_LENGTH = 4
+PIN_MAX_LENGTH = 8
+
+_rounds: Optional[int] = None
+_lock = threading.Lock()
+
+
+def calibrate_rounds(target_ms: float, min_rounds: int, max_rounds: int) -> int:
+    """The bcrypt cost whose hash takes about `target_ms` on this machine"""
+    start = time.perf_counter()
+    bcrypt.using(rounds=min_rounds).hash(_CALIBRATION_PASSWORD)
+    elapsed_ms = max((time.perf_counter() - start) * 1000, 0.001)
+    # Each extra round doubles the work
+    extra = math.floor(math.log2(target_ms / elapsed_ms)) if elapsed_ms < target_ms else 0
+    return max(min_rounds, min(max_rounds, min_rounds + extra))
+
+
+def bcrypt_rounds() -> int:
+    """
+    Cost for new hashes: the `security.rounds` setting if set, otherwise
+    calibrated once per process against `security.target_ms`.
+    """
+    global _rounds
+    with _lock:
+        if _rounds is None:
+            options = get_settings()["security"]
+            if options["rounds"]:
+                _rounds = options["rounds"]
+            else:
+                _rounds = calibrate_rounds(options["target_ms"], options["min_rounds"], options["max_rounds"])
+                logger.info("bcrypt cost calibrated to %d rounds", _rounds)
+        return _rounds
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """Pass `rounds` to hash without reading settings, e.g. in a worker process"""
+    return bcrypt.using(rounds=rounds or bcrypt_rounds()).hash(password)
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    try:
+        return bcrypt.verify(password, password_hash)
+    except ValueError:
+        # Not a bcrypt hash
+        return False
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """True for hashes made with a lower cost than new hashes get"""
+    try:
+        return bcrypt.from_string(password_hash).rounds < bcrypt_rounds()
+    except ValueError:
+        return True
+
+
+def validate_pin(pin: str) -> None:
+    if not pin.isdigit() or not PIN_MIN_LENGTH <= len(pin) <= PIN_MAX_LENGTH:
+        raise ValueError(f"PIN must be {PIN_MIN_LENGTH} to {PIN_MAX_LENGTH} digits")
+
+
+def hash_pin(pin: str, rounds: Optional[int] = None) -> str:
+    """
+    PINs unlock an already signed-in till, so they get a cheaper hash than
+    passwords (`security.pin_rounds` of PBKDF2); guessing is limited by
+    the lockout after `security.pin_max_attempts` instead.
+    """
+    return pbkdf2_sha256.using(rounds=rounds or get_settings()["security"]["pin_rounds"]).hash(pin)
+
+
+def verify_pin(pin: str, pin_hash: str) -> bool:
+    try:
+        return pbkdf2_sha256.verify(pin, pin_hash)
+    except ValueError:
+        return False
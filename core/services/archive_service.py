@@ -0,0 +1,292 @@
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import Column, Index, MetaData, Table, delete, func, insert, select, union_all, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from enums.invoice_status_enum import InvoiceStatus
+from models.archive_state import ArchiveState
+from models.invoice import Invoice
+from models.invoice_item import InvoiceItem
+from models.replication import ChangeLog, ReplicationPeer, RowVersion
+from core.services.replication_service import MASTER
+from core.logger import get_logger
+from core.settings import get_settings, resolve_path
+
+logger = get_logger(__name__)
+
+SCHEMA = "archive"
+CLOSED = (InvoiceStatus.PAID, InvoiceStatus.CANCELLED)
+
+Progress = Callable[[int], None] # invoices moved so far
+
+_invoices = Invoice.__table__
+_items = InvoiceItem.__table__
+_state = ArchiveState.__table__
+_log = ChangeLog.__table__
+_versions = RowVersion.__table__
+
+
+def _archived(table: Table, metadata: MetaData) -> Table:
+    # Same columns without the foreign keys: customers and products stay in cashier.db
+    columns = [Column(column.name, column.type, primary_key=column.primary_key) for column in table.columns]
+    return Table(table.name, metadata, *columns, schema=SCHEMA)
+
+
+_archive_metadata = MetaData()
+archived_invoices = _archived(_invoices, _archive_metadata)
+archived_items = _archived(_items, _archive_metadata)
+Index("ix_invoices_date", archived_invoices.c.date)
+Index("ix_invoice_items_invoice_id", archived_items.c.invoice_id)
+
+
+def archive_path() -> str:
+    return resolve_path(get_settings()["archive"]["path"])
+
+
+def attach(connection: Connection, path: str, create: bool = False) -> bool:
+    """
+    ATTACH the archive as `archive` to a pooled connection; it stays
+    attached for the life of the connection. False when there is no
+    archive file yet and `create` is off.
+    """
+    attached = connection.info.get(SCHEMA)
+    if attached == path:
+        return True
+    if not create and not os.path.exists(path):
+        return False
+    if attached is not None:
+        connection.exec_driver_sql(f"DETACH DATABASE {SCHEMA}")
+    connection.exec_driver_sql(f"ATTACH DATABASE ? AS {SCHEMA}", (path,))
+    connection.info[SCHEMA] = path
+    return True
+
+
+class InvoiceArchive:
+    """
+    Archived invoices for a session. The archive is attached and read
+    only when a date range reaches back into it, or an invoice id is
+    not in cashier.db; everyday queries touch the live tables alone.
+    """
+
+    def __init__(self, db: Session, path: Optional[str] = None):
+        self.db = db
+        self.path = path or archive_path()
+
+    def bounds(self) -> Optional[Tuple[datetime, datetime]]:
+        """Dates of the oldest and newest archived invoice, None while nothing is archived"""
+        row = self.db.execute(
+            select(_state.c.oldest_date, _state.c.newest_date).where(_state.c.id == 1)
+        ).first()
+        if row is None or row.newest_date is None:
+            return None
+        return row.oldest_date, row.newest_date
+
+    def covers(self, start_at: datetime, end_before: datetime) -> bool:
+        bounds = self.bounds()
+        if bounds is None or start_at > bounds[1] or end_before <= bounds[0]:
+            return False
+        return attach(self.db.connection(), self.path)
+
+    def span(self, build: Callable[[Table, Table], object], start_at: datetime, end_before: datetime):
+        """
+        `build(invoices, invoice_items)` over the live tables, UNION ALL the
+        same query over the archive when [start_at, end_before) needs it
+        """
+        statement = build(_invoices, _items)
+        if self.covers(start_at, end_before):
+            statement = union_all(statement, build(archived_invoices, archived_items))
+        return statement
+
+    def get(self, invoice_id: int) -> Optional[Invoice]:
+        if self.bounds() is None or not attach(self.db.connection(), self.path):
+            return None
+        return self.db.scalars(
+            select(Invoice).from_statement(select(archived_invoices).where(archived_invoices.c.id == invoice_id))
+        ).first()
+
+    def items(self, invoice_id: int) -> List[InvoiceItem]:
+        if self.bounds() is None or not attach(self.db.connection(), self.path):
+            return []
+        return self.db.scalars(
+            select(InvoiceItem).from_statement(
+                select(archived_items).where(archived_items.c.invoice_id == invoice_id).order_by(archived_items.c.id)
+            )
+        ).all()
+
+
+class InvoiceArchiver:
+    """
+    Moves paid and cancelled invoices older than `after_days`, with their
+    items, from cashier.db into the archive database, `batch_size`
+    invoices at a time.
+
+    With WAL a transaction spanning two database files is atomic per file
+    only, so each batch is copied and committed first and deleted from
+    cashier.db after. A crash in between leaves the batch in both, and the
+    next run copies nothing and finishes the delete.
+    """
+
+    def __init__(self, engine: Engine, path: Optional[str] = None, after_days: int = 365, batch_size: int = 1000):
+        self.engine = engine
+        self.path = path or archive_path()
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self._stopping = threading.Event()
+
+    @classmethod
+    def from_settings(cls, engine: Engine) -> "InvoiceArchiver":
+        options = get_settings()["archive"]
+        return cls(
+            engine, resolve_path(options["path"]),
+            after_days=options["after_days"], batch_size=options["batch_size"],
+        )
+
+    def stop(self) -> None:
+        """Finish the batch in hand and return from run()"""
+        self._stopping.set()
+
+    def run(self, progress: Optional[Progress] = None) -> int:
+        """Archive everything due; returns how many invoices were moved"""
+        cutoff = datetime.now() - timedelta(days=self.after_days)
+        moved = 0
+        with self.engine.connect() as conn:
+            attach(conn, self.path, create=True)
+            self._create_schema(conn)
+            while not self._stopping.is_set():
+                invoice_ids = self._due(conn, cutoff)
+                if not invoice_ids:
+                    break
+                self._move(conn, invoice_ids)
+                moved += len(invoice_ids)
+                if progress:
+                    progress(moved)
+        if moved:
+            logger.info("Archived %d invoices dated before %s", moved, f"{cutoff:%Y-%m-%d}")
+        return moved
+
+    def _create_schema(self, conn: Connection) -> None:
+        conn.exec_driver_sql(f"PRAGMA {SCHEMA}.journal_mode=WAL")
+        conn.commit()
+        with conn.begin():
+            _archive_metadata.create_all(conn)
+
+    def _due(self, conn: Connection, cutoff: datetime) -> List[int]:
+        # The newest invoice and the owner of the newest item stay, so SQLite
+        # never hands out an id again that the archive already holds
+        newest_item_owner = select(_items.c.invoice_id).order_by(_items.c.id.desc()).limit(1).scalar_subquery()
+        conditions = [
+            _invoices.c.status.in_(CLOSED),
+            _invoices.c.date < cutoff,
+            _invoices.c.id != select(func.max(_invoices.c.id)).scalar_subquery(),
+            _invoices.c.id != func.coalesce(newest_item_owner, 0),
+        ]
+        with conn.begin():
+            unsent = self._unsent_condition(conn)
+            if unsent is not None:
+                conditions.append(unsent)
+            return conn.scalars(
+                select(_invoices.c.id).where(*conditions).order_by(_invoices.c.id).limit(self.batch_size)
+            ).all()
+
+    def _unsent_condition(self, conn: Connection):
+        """With replication on, invoices the store master hasn't received yet stay"""
+        if not self._replicated(conn):
+            return None
+        log, peers = _log, ReplicationPeer.__table__
+        sent = func.coalesce(select(peers.c.sent_seq).where(peers.c.peer == MASTER).scalar_subquery(), 0)
+        unsent_invoices = select(log.c.row_id).where(log.c.table_name == _invoices.name, log.c.seq > sent)
+        unsent_items = (
+            select(_items.c.invoice_id)
+            .join(log, (log.c.row_id == _items.c.id) & (log.c.table_name == _items.name))
+            .where(log.c.seq > sent)
+        )
+        return _invoices.c.id.not_in(unsent_invoices.union(unsent_items))
+
+    def _move(self, conn: Connection, invoice_ids: List[int]) -> None:
+        try:
+            with conn.begin():
+                conn.execute(
+                    insert(archived_invoices).prefix_with("OR IGNORE")
+                    .from_select(list(_invoices.c.keys()), select(_invoices).where(_invoices.c.id.in_(invoice_ids)))
+                )
+                conn.execute(
+                    insert(archived_items).prefix_with("OR IGNORE")
+                    .from_select(list(_items.c.keys()), select(_items).where(_items.c.invoice_id.in_(invoice_ids)))
+                )
+
+            with conn.begin():
+                oldest, newest = conn.execute(
+                    select(func.min(_invoices.c.date), func.max(_invoices.c.date))
+                    .where(_invoices.c.id.in_(invoice_ids))
+                ).one()
+                # The first write takes the database lock, so no one else logs changes from here
+                self._record(conn, oldest, newest, len(invoice_ids))
+                replicated = self._replicated(conn)
+                if replicated:
+                    logged = conn.scalar(select(func.max(_log.c.seq))) or 0
+                    item_ids = conn.scalars(select(_items.c.id).where(_items.c.invoice_id.in_(invoice_ids))).all()
+                conn.execute(delete(_items).where(_items.c.invoice_id.in_(invoice_ids)))
+                conn.execute(delete(_invoices).where(_invoices.c.id.in_(invoice_ids)))
+                if replicated:
+                    # Archiving is local: the store master keeps its copy of these invoices
+                    conn.execute(delete(_log).where(_log.c.seq > logged))
+                    self._forget_versions(conn, _invoices.name, invoice_ids)
+                    self._forget_versions(conn, _items.name, item_ids)
+        except SQLAlchemyError as e:
+            raise ValueError(f"Database error while archiving: {str(e)}")
+
+    def _replicated(self, conn: Connection) -> bool:
+        return conn.dialect.has_table(conn, _log.name)
+
+    def _forget_versions(self, conn: Connection, table: str, row_ids: List[int]) -> None:
+        for start in range(0, len(row_ids), 500):
+            conn.execute(
+                delete(_versions).where(_versions.c.table_name == table, _versions.c.row_id.in_(row_ids[start:start + 500]))
+            )
+
+    def _record(self, conn: Connection, oldest: datetime, newest: datetime, count: int) -> None:
+        state = conn.execute(select(_state).where(_state.c.id == 1)).first()
+        if state is None:
+            conn.execute(insert(_state).values(id=1, oldest_date=oldest, newest_date=newest, invoices=count))
+            return
+        conn.execute(
+            update(_state).where(_state.c.id == 1).values(
+                oldest_date=min(state.oldest_date or oldest, oldest),
+                newest_date=max(state.newest_date or newest, newest),
+                invoices=state.invoices + count,
+            )
+        )
+
+
+_archiver: Optional[InvoiceArchiver] = None
+_archiver_lock = threading.Lock()
+
+
+def archive_from_settings(engine: Engine) -> int:
+    """Archive what is due, if enabled; meant for a background thread"""
+    global _archiver
+    if not get_settings()["archive"]["enabled"]:
+        return 0
+    with _archiver_lock:
+        if _archiver is not None:
+            return 0
+        _archiver = InvoiceArchiver.from_settings(engine)
+    try:
+        return _archiver.run()
+    except ValueError:
+        logger.exception("Invoice archiving failed")
+        return 0
+    finally:
+        with _archiver_lock:
+            _archiver = None
+
+
+def stop_archiving() -> None:
+    with _archiver_lock:
+        if _archiver is not None:
+            _archiver.stop()
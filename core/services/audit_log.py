@@ -0,0 +1,224 @@
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Deque, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from models.audit_event import AuditEvent
+from core.events import (
+    CategoryDeleted, Event, EventBus, InvoiceCancelled, InvoiceCreated, PriceChanged,
+    ProductDeleted, ProductsAdjusted, StockChanged, UserDeleted, UserLoggedIn, get_event_bus,
+)
+from core.logger import get_logger
+from core.settings import get_settings
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class AuditEntry:
+    timestamp: datetime
+    action: str
+    summary: str
+    user_name: Optional[str] = None
+    entity: Optional[str] = None
+    entity_id: Optional[int] = None
+
+
+def _describe(event: Event) -> Optional[Tuple[str, str, Optional[str], Optional[int]]]:
+    """(action, summary, entity, entity id) for an audited event"""
+    if isinstance(event, InvoiceCreated):
+        return "sale", f"Sale #{event.invoice_id} - ${event.total_amount:,}", "invoice", event.invoice_id
+    if isinstance(event, InvoiceCancelled):
+        return "cancel", f"Invoice #{event.invoice_id} cancelled - ${event.total_amount:,}", "invoice", event.invoice_id
+    if isinstance(event, UserLoggedIn):
+        via = " with PIN" if event.method == "pin" else ""
+        return "login", f"User login{via} - {event.user_name}", "user", event.user_id
+    if isinstance(event, PriceChanged):
+        return "price", f"Price of product #{event.product_id}: {event.previous} -> {event.price}", "product", event.product_id
+    if isinstance(event, StockChanged):
+        return "stock", f"Stock of product #{event.product_id}: {event.previous} -> {event.quantity}", "product", event.product_id
+    if isinstance(event, ProductsAdjusted):
+        return "adjust", f"{event.description} ({len(event.product_ids):,} products)", "product", None
+    if isinstance(event, ProductDeleted):
+        return "delete", f"Product #{event.product_id} deleted", "product", event.product_id
+    if isinstance(event, CategoryDeleted):
+        return "delete", f"Category #{event.category_id} deleted", "category", event.category_id
+    if isinstance(event, UserDeleted):
+        return "delete", f"User #{event.user_id} deleted", "user", event.user_id
+    return None
+
+
+AUDITED_EVENTS = (
+    InvoiceCreated, InvoiceCancelled, UserLoggedIn, PriceChanged, StockChanged,
+    ProductsAdjusted, ProductDeleted, CategoryDeleted, UserDeleted,
+)
+
+
+class AuditLog:
+    """
+    Records committed events from the event bus.
+
+    record() only appends to an in-memory ring of recent entries, which the
+    dashboard reads, and to a pending list; a background writer inserts the
+    pending entries into audit_events in batches. Entries not yet written
+    when the process dies are lost, which is the price of keeping commits
+    out of every action.
+    """
+
+    def __init__(
+        self,
+        bind: Engine,
+        ring_size: int = 200,
+        flush_ms: int = 1000,
+        batch_size: int = 500,
+        max_pending: int = 50_000,
+    ):
+        self.session_factory = sessionmaker(bind=bind, autoflush=False)
+        self.flush_interval = flush_ms / 1000
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        # Whoever logged in last is taken to be at the till
+        self.actor: Optional[str] = None
+
+        self._ring: Deque[AuditEntry] = deque(maxlen=ring_size)
+        self._pending: List[AuditEntry] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock() # one writer at a time
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._unsubscribe: List[Callable[[], None]] = []
+
+    @classmethod
+    def from_settings(cls, bind: Engine) -> "AuditLog":
+        options = get_settings()["audit"]
+        return cls(
+            bind,
+            ring_size=options["ring_size"],
+            flush_ms=options["flush_ms"],
+            batch_size=options["batch_size"],
+        )
+
+    def open(self, bus: Optional[EventBus] = None) -> None:
+        """Load the latest entries into the ring, subscribe and start the writer"""
+        with self.session_factory() as db:
+            rows = db.execute(
+                select(
+                    AuditEvent.timestamp, AuditEvent.action, AuditEvent.summary,
+                    AuditEvent.user_name, AuditEvent.entity, AuditEvent.entity_id,
+                )
+                .order_by(AuditEvent.id.desc())
+                .limit(self._ring.maxlen)
+            ).all()
+        self._ring.extend(AuditEntry(*row) for row in reversed(rows))
+
+        bus = bus or get_event_bus()
+        self._unsubscribe = [bus.subscribe(event_type, self._on_event) for event_type in AUDITED_EVENTS]
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="audit-log", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Unsubscribe and write out whatever is pending"""
+        for unsubscribe in self._unsubscribe:
+            unsubscribe()
+        self._unsubscribe = []
+        if self._thread is not None:
+            self._stopping = True
+            self._wake.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+    def record(
+        self,
+        action: str,
+        summary: str,
+        entity: Optional[str] = None,
+        entity_id: Optional[int] = None,
+        user_name: Optional[str] = None,
+    ) -> AuditEntry:
+        entry = AuditEntry(datetime.now(), action, summary, user_name or self.actor, entity, entity_id)
+        with self._lock:
+            self._ring.append(entry)
+            if len(self._pending) < self.max_pending:
+                self._pending.append(entry)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+        return entry
+
+    def recent(self, limit: Optional[int] = None, exclude: Tuple[str, ...] = ()) -> List[AuditEntry]:
+        """Newest first, straight from memory"""
+        with self._lock:
+            entries = list(self._ring)
+        entries.reverse()
+        if exclude:
+            entries = [entry for entry in entries if entry.action not in exclude]
+        return entries[:limit] if limit is not None else entries
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> int:
+        """Write pending entries now; returns how many were written"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = self._pending[:self.batch_size]
+                if not batch:
+                    return written
+                with self.session_factory() as db:
+                    db.execute(insert(AuditEvent), [asdict(entry) for entry in batch])
+                    db.commit()
+                with self._lock:
+                    del self._pending[:len(batch)]
+                written += len(batch)
+
+    def _on_event(self, event: Event) -> None:
+        if isinstance(event, UserLoggedIn):
+            self.actor = event.user_name
+        description = _describe(event)
+        if description is not None:
+            action, summary, entity, entity_id = description
+            self.record(action, summary, entity, entity_id)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # Kept pending and retried on the next round
+                logger.exception("Writing audit entries failed")
+            if self._stopping:
+                return
+
+
+_audit_log: Optional[AuditLog] = None
+
+
+def get_audit_log(bind: Optional[Engine] = None) -> Optional[AuditLog]:
+    """The process-wide audit log, started on first use; None when disabled"""
+    global _audit_log
+    if _audit_log is None and get_settings()["audit"]["enabled"]:
+        if bind is None:
+            from data.database import engine
+            bind = engine
+        audit_log = AuditLog.from_settings(bind)
+        audit_log.open()
+        _audit_log = audit_log
+    return _audit_log
+
+
+def close_audit_log() -> None:
+    global _audit_log
+    if _audit_log is not None:
+        _audit_log.close()
+        _audit_log = None
@@ -0,0 +1,184 @@
+import glob
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from core.logger import get_logger
+from core.settings import get_settings, resolve_path
+
+logger = get_logger(__name__)
+
+STAMP_FORMAT = "%Y%m%d-%H%M%S"
+# Leave the first minutes after startup to logging in and the first sales
+STARTUP_DELAY_S = 120
+
+
+class BackupService:
+    """
+    Online snapshots of the SQLite databases through SQLite's backup API,
+    `pages_per_step` pages at a time with a `pause_ms` sleep between
+    steps, so the till's writers only ever wait for one small step.
+
+    The copy runs inside one read transaction on the source. Under WAL
+    that pins a snapshot: sales keep committing to the WAL and the backup
+    neither sees them nor restarts because of them, as it would without
+    the transaction. Each snapshot is written to a .part file, switched
+    to a rollback journal so it is one self-contained file, checked with
+    PRAGMA integrity_check and only then renamed into place. The newest
+    `keep` snapshots per database are retained.
+    """
+
+    def __init__(
+        self,
+        databases: Sequence[str],
+        directory: str,
+        keep: int = 7,
+        pages_per_step: int = 256,
+        pause_ms: int = 20,
+    ):
+        self.databases = list(databases)
+        self.directory = directory
+        self.keep = keep
+        self.pages_per_step = pages_per_step
+        self.pause = pause_ms / 1000
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_settings(cls, databases: Sequence[str]) -> "BackupService":
+        options = get_settings()["backup"]
+        return cls(
+            databases, resolve_path(options["dir"]), keep=options["keep"],
+            pages_per_step=options["pages_per_step"], pause_ms=options["pause_ms"],
+        )
+
+    def run(self) -> List[str]:
+        """Snapshot every database that exists; returns the snapshot paths"""
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now().strftime(STAMP_FORMAT)
+        snapshots = []
+        for source in self.databases:
+            if not os.path.exists(source):
+                continue
+            started = time.perf_counter()
+            snapshot = self.backup(source, stamp)
+            logger.info(
+                "Backed up %s to %s in %.1f s", os.path.basename(source), snapshot, time.perf_counter() - started
+            )
+            snapshots.append(snapshot)
+            self.rotate(source)
+        return snapshots
+
+    def backup(self, source: str, stamp: str) -> str:
+        target = os.path.join(self.directory, f"{_name(source)}-{stamp}.db")
+        partial = target + ".part"
+        if os.path.exists(partial):
+            os.remove(partial)
+
+        def step(status, remaining, total):
+            if self._stop.is_set():
+                raise ValueError("Backup stopped")
+            # The GIL and every database lock are free while we sleep
+            time.sleep(self.pause)
+
+        src = sqlite3.connect(source, timeout=5, isolation_level=None, check_same_thread=False)
+        dst = sqlite3.connect(partial, isolation_level=None)
+        try:
+            src.execute("BEGIN")
+            # The first read starts the transaction and fixes the snapshot
+            src.execute("SELECT count(*) FROM sqlite_master").fetchone()
+            src.backup(dst, pages=self.pages_per_step, progress=step)
+            src.execute("COMMIT")
+            dst.execute("PRAGMA journal_mode=DELETE")
+            self.verify(dst)
+        except (sqlite3.Error, ValueError):
+            dst.close()
+            os.remove(partial)
+            raise
+        finally:
+            src.close()
+        dst.close()
+        os.replace(partial, target)
+        return target
+
+    def verify(self, connection: sqlite3.Connection) -> None:
+        problems = [row[0] for row in connection.execute("PRAGMA integrity_check")]
+        if problems != ["ok"]:
+            raise ValueError(f"Backup failed its integrity check: {'; '.join(problems[:5])}")
+
+    def snapshots(self, source: str) -> List[str]:
+        """Snapshots of `source`, oldest first"""
+        return sorted(glob.glob(os.path.join(self.directory, f"{_name(source)}-*.db")))
+
+    def rotate(self, source: str) -> None:
+        for snapshot in self.snapshots(source)[:-self.keep]:
+            os.remove(snapshot)
+
+    def age(self) -> Optional[float]:
+        """Seconds since the main database was last backed up, None if never"""
+        snapshots = self.snapshots(self.databases[0])
+        if not snapshots:
+            return None
+        stamp = os.path.basename(snapshots[-1])[len(_name(self.databases[0])) + 1:-len(".db")]
+        return (datetime.now() - datetime.strptime(stamp, STAMP_FORMAT)).total_seconds()
+
+    def start(self, interval_ms: int) -> None:
+        """Back up on a background thread whenever the last backup is `interval_ms` old"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval_ms / 1000,), name="backup", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, interval: float) -> None:
+        delay = STARTUP_DELAY_S
+        while not self._stop.wait(delay):
+            age = self.age()
+            if age is not None and age < interval:
+                delay = interval - age
+                continue
+            try:
+                self.run()
+            except (OSError, sqlite3.Error, ValueError):
+                if self._stop.is_set():
+                    return
+                logger.exception("Backup failed")
+            delay = interval
+
+
+def _name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+_service: Optional[BackupService] = None
+
+
+def start_from_settings() -> Optional[BackupService]:
+    """Scheduled backups of cashier.db and the invoice archive, if enabled"""
+    global _service
+    options = get_settings()["backup"]
+    if not options["enabled"] or _service is not None:
+        return _service
+
+    from data.database import DB_PATH
+    from core.services.archive_service import archive_path
+
+    _service = BackupService.from_settings([DB_PATH, archive_path()])
+    _service.start(options["interval_hours"] * 3600 * 1000)
+    return _service
+
+
+def stop_backups() -> None:
+    global _service
+    if _service is not None:
+        _service.stop()
+        _service = None
@@ -0,0 +1,141 @@
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from models.barcode_sequence import BarcodeSequence
+from models.product import Product
+from core.settings import get_settings
+
+EAN13_LENGTH = 13
+
+
+def ean13_check_digit(digits: str) -> int:
+    """Check digit for the first 12 digits of an EAN-13"""
+    odd = sum(int(digit) for digit in digits[0::2])
+    even = sum(int(digit) for digit in digits[1::2])
+    return (10 - (odd + 3 * even) % 10) % 10
+
+
+def is_valid_ean13(code: str) -> bool:
+    return len(code) == EAN13_LENGTH and code.isdigit() and ean13_check_digit(code[:12]) == int(code[12])
+
+
+class BarcodeAllocator:
+    """
+    Hands out EAN-13 codes under a store prefix (20-29 are GS1's in-store
+    range) from serials reserved `block_size` at a time, so new products
+    need no uniqueness queries. A reservation is one short transaction
+    that advances barcode_sequences; serials left in a block when the
+    process exits are skipped, never reused. Codes under the prefix that
+    come from elsewhere, e.g. a supplier file, are passed to note_used so
+    the open block moves past them.
+
+    Tills that replicate into one store master need different prefixes,
+    since products are matched across databases by barcode.
+    """
+
+    def __init__(self, bind: Engine, prefix: str = "20", block_size: int = 1000):
+        if not prefix.isdigit() or not 1 <= len(prefix) < 12:
+            raise ValueError("Barcode prefix must be 1 to 11 digits")
+        self.session_factory = sessionmaker(bind=bind, autoflush=False)
+        self.prefix = prefix
+        self.block_size = block_size
+        self.serial_digits = 12 - len(prefix)
+        self._next = 0
+        self._end = 0 # exclusive
+        self._highest_noted = -1 # highest serial passed to note_used
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, bind: Engine) -> "BarcodeAllocator":
+        options = get_settings()["barcodes"]
+        return cls(bind, prefix=options["prefix"], block_size=options["block_size"])
+
+    def next(self) -> str:
+        return self.take(1)[0]
+
+    def take(self, count: int) -> List[str]:
+        codes = []
+        with self._lock:
+            while len(codes) < count:
+                if self._next >= self._end:
+                    self._reserve(max(self.block_size, count - len(codes)))
+                stop = min(self._end, self._next + count - len(codes))
+                codes.extend(self._code(serial) for serial in range(self._next, stop))
+                self._next = stop
+        return codes
+
+    def note_used(self, code: str) -> None:
+        """Never hand out `code`, which is saved or about to be saved by another path"""
+        if not is_valid_ean13(code) or not code.startswith(self.prefix):
+            return
+        serial = int(code[len(self.prefix):12])
+        with self._lock:
+            self._highest_noted = max(self._highest_noted, serial)
+            if serial >= self._next:
+                self._next = min(serial + 1, self._end)
+
+    def _code(self, serial: int) -> str:
+        digits = f"{self.prefix}{serial:0{self.serial_digits}d}"
+        return f"{digits}{ean13_check_digit(digits)}"
+
+    def _reserve(self, size: int) -> None:
+        sequence = BarcodeSequence.__table__
+        with self.session_factory() as db:
+            db.execute(insert(sequence).values(prefix=self.prefix, next_serial=0).on_conflict_do_nothing())
+            # Taking the write lock first keeps two tills on one database apart
+            end = db.execute(
+                update(sequence)
+                .where(sequence.c.prefix == self.prefix)
+                .values(next_serial=sequence.c.next_serial + size)
+                .returning(sequence.c.next_serial)
+            ).scalar()
+            start = end - size
+
+            # Codes under the prefix that came from elsewhere, e.g. an import
+            used = self._highest_used_serial(db)
+            if self._highest_noted >= 0 and (used is None or self._highest_noted > used):
+                used = self._highest_noted
+            if used is not None and used >= start:
+                start = used + 1
+                end = start + size
+                db.execute(
+                    update(sequence).where(sequence.c.prefix == self.prefix).values(next_serial=end)
+                )
+            if end > 10 ** self.serial_digits:
+                db.rollback()
+                raise ValueError(f"No barcodes left under prefix {self.prefix}")
+            db.commit()
+        self._next, self._end = start, end
+
+    def _highest_used_serial(self, db) -> Optional[int]:
+        # A range on the barcode index rather than LIKE, which SQLite can't index here
+        upper = self.prefix[:-1] + chr(ord(self.prefix[-1]) + 1)
+        highest = db.execute(
+            select(func.max(Product.barcode)).where(
+                Product.barcode >= self.prefix,
+                Product.barcode < upper,
+                func.length(Product.barcode) == EAN13_LENGTH,
+                Product.barcode.op("NOT GLOB")("*[^0-9]*"),
+            )
+        ).scalar()
+        return int(highest[len(self.prefix):12]) if highest is not None else None
+
+
+_allocators: Dict[Engine, BarcodeAllocator] = {}
+_allocators_lock = threading.Lock()
+
+
+def get_barcode_allocator(bind: Optional[Engine] = None) -> BarcodeAllocator:
+    """The allocator for a database, the app's by default; blocks are reserved on first use"""
+    if bind is None:
+        from data.database import engine
+        bind = engine
+    with _allocators_lock:
+        if bind not in _allocators:
+            _allocators[bind] = BarcodeAllocator.from_settings(bind)
+        return _allocators[bind]
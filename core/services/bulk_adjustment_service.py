@@ -0,0 +1,172 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Integer, and_, bindparam, cast, func, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models.product import Product
+from core.events import ProductsAdjusted, get_event_bus
+
+_products = Product.__table__
+# Keeps IN (...) lists well under SQLite's bound parameter limit
+QUERY_CHUNK = 500
+
+
+@dataclass(frozen=True)
+class Adjustment:
+    product_id: int
+    name: str
+    before: int
+    after: int
+
+
+@dataclass(frozen=True)
+class PriceRule:
+    """
+    Change prices by `percent` (10 = +10%, rounded to whole units) or by
+    `amount`, for one category or all products, optionally narrowed to
+    names or barcodes containing `search`.
+    """
+    percent: Optional[float] = None
+    amount: Optional[int] = None
+    category_id: Optional[int] = None
+    search: str = ""
+
+    def validate(self) -> None:
+        if (self.percent is None) == (self.amount is None):
+            raise ValueError("Give either a percentage or an amount")
+        if self.percent is not None and self.percent <= -100:
+            raise ValueError("A price cannot drop by 100% or more")
+        if not self.percent and not self.amount:
+            raise ValueError("The adjustment changes nothing")
+
+    def new_price(self):
+        """The adjusted price as a SQL expression"""
+        if self.percent is not None:
+            return cast(func.round(_products.c.price * (100 + self.percent) / 100.0), Integer)
+        return _products.c.price + self.amount
+
+    def conditions(self) -> list:
+        conditions = [self.new_price() != _products.c.price]
+        if self.category_id is not None:
+            conditions.append(_products.c.category_id == self.category_id)
+        if self.search:
+            pattern = f"%{self.search}%"
+            conditions.append(or_(_products.c.name.ilike(pattern), _products.c.barcode.like(pattern)))
+        return conditions
+
+    def describe(self) -> str:
+        change = f"{self.percent:+g}%" if self.percent is not None else f"{self.amount:+,}"
+        return f"Prices {change}"
+
+
+class BulkAdjustmentService:
+    """
+    Price and stock changes across many products. Previews only read;
+    applying is one set-based UPDATE in one transaction and publishes a
+    single ProductsAdjusted event instead of one per product.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.events = get_event_bus()
+
+    def preview_prices(self, rule: PriceRule, limit: Optional[int] = 20) -> Tuple[List[Adjustment], int]:
+        """(first `limit` affected products by name, number affected)"""
+        rule.validate()
+        conditions = and_(*rule.conditions())
+        total = self.db.execute(select(func.count()).select_from(_products).where(conditions)).scalar()
+        rows = self.db.execute(
+            select(_products.c.id, _products.c.name, _products.c.price, rule.new_price())
+            .where(conditions)
+            .order_by(_products.c.name)
+            .limit(limit)
+        ).all()
+        return [Adjustment(*row) for row in rows], total
+
+    def adjust_prices(self, rule: PriceRule) -> int:
+        """Apply `rule`; returns how many products changed"""
+        rule.validate()
+        conditions = and_(*rule.conditions())
+        try:
+            lowest = self.db.execute(select(func.min(rule.new_price())).where(conditions)).scalar()
+            if lowest is not None and lowest <= 0:
+                raise ValueError("Price must be greater than 0 for every product")
+
+            product_ids = self.db.scalars(
+                update(_products).where(conditions).values(price=rule.new_price()).returning(_products.c.id)
+            ).all()
+            self.db.commit()
+        except ValueError:
+            self.db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
+        if product_ids:
+            self.events.publish(ProductsAdjusted(tuple(product_ids), "price", rule.describe()))
+        return len(product_ids)
+
+    def preview_stock(self, deltas: Dict[int, int]) -> List[Adjustment]:
+        """What `adjust_stock(deltas)` would change, ordered by name"""
+        product_ids = [product_id for product_id, delta in deltas.items() if delta]
+        missing = set(product_ids)
+        adjustments = []
+        for start in range(0, len(product_ids), QUERY_CHUNK):
+            rows = self.db.execute(
+                select(_products.c.id, _products.c.name, _products.c.quantity)
+                .where(_products.c.id.in_(product_ids[start:start + QUERY_CHUNK]))
+            )
+            for product_id, name, quantity in rows:
+                missing.discard(product_id)
+                adjustments.append(Adjustment(product_id, name, quantity, quantity + deltas[product_id]))
+        if missing:
+            raise ValueError(f"Product {min(missing)} not found")
+        adjustments.sort(key=lambda adjustment: adjustment.name)
+        return adjustments
+
+    def adjust_stock(self, deltas: Dict[int, int], reason: str = "") -> int:
+        """
+        Add `deltas` ({product_id: change}) to the stock; all or nothing.
+        Returns how many products changed.
+        """
+        changes = [{"product_id": product_id, "delta": delta} for product_id, delta in deltas.items() if delta]
+        if not changes:
+            return 0
+
+        statement = (
+            update(_products)
+            .where(
+                _products.c.id == bindparam("product_id"),
+                # Checked by the UPDATE itself, so a sale in between can't drive stock negative
+                _products.c.quantity + bindparam("delta") >= 0,
+            )
+            .values(quantity=_products.c.quantity + bindparam("delta"))
+        )
+        try:
+            # One prepared statement executed for every product
+            result = self.db.execute(statement, changes)
+            if result.rowcount != len(changes):
+                self.db.rollback()
+                short = [
+                    adjustment for adjustment in self.preview_stock(deltas) if adjustment.after < 0
+                ]
+                if short:
+                    raise ValueError(
+                        f"Not enough stock of {short[0].name}. Available: {short[0].before}, "
+                        f"Requested: {short[0].before - short[0].after}"
+                    )
+                raise ValueError("Some products were not found")
+            self.db.commit()
+        except ValueError:
+            self.db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
+        description = "Stock adjusted" + (f": {reason}" if reason else "")
+        self.events.publish(ProductsAdjusted(tuple(change["product_id"] for change in changes), "quantity", description))
+        return len(changes)
@@ -0,0 +1,233 @@
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from models.product import Product
+from enums.invoice_status_enum import InvoiceStatus
+from core.services.sales_journal import SalesJournal, get_sales_journal
+
+REFRESH_CHUNK = 500
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    id: int
+    name: str
+    barcode: str
+    price: int
+    quantity: int
+
+
+@dataclass
+class CartLine:
+    product_id: int
+    name: str
+    barcode: str
+    unit_price: int
+    quantity: int = 1
+
+    @property
+    def total_price(self) -> int:
+        return self.unit_price * self.quantity
+
+
+class ProductCatalog:
+    """
+    In-memory barcode lookup for the till, loaded with one column-only query.
+    `pending` gives the stock of a product that is sold but not yet taken
+    off the products table; it is subtracted from what the database says.
+    """
+
+    def __init__(self, db: Session, pending: Optional[Callable[[int], int]] = None):
+        self.db = db
+        self.pending = pending
+        self._by_barcode: Dict[str, CatalogEntry] = {}
+        self._by_id: Dict[int, CatalogEntry] = {}
+
+    def load(self) -> None:
+        rows = self.db.query(
+            Product.id, Product.name, Product.barcode, Product.price, Product.quantity
+        ).all()
+        self._by_barcode = {}
+        self._by_id = {}
+        for row in rows:
+            self._store(CatalogEntry(*row))
+
+    def lookup(self, barcode: str) -> Optional[CatalogEntry]:
+        entry = self._by_barcode.get(barcode)
+        if entry is None:
+            # Products created after the catalog was loaded
+            row = (
+                self.db.query(Product.id, Product.name, Product.barcode, Product.price, Product.quantity)
+                .filter(Product.barcode == barcode)
+                .first()
+            )
+            if row is not None:
+                entry = self._store(CatalogEntry(*row))
+        return entry
+
+    def get(self, product_id: int) -> Optional[CatalogEntry]:
+        return self._by_id.get(product_id)
+
+    def refresh(self, product_ids: List[int]) -> None:
+        """Re-read the given products, e.g. after a sale changed their stock"""
+        # Chunked: an import can touch more products than SQLite takes parameters
+        for start in range(0, len(product_ids), REFRESH_CHUNK):
+            rows = (
+                self.db.query(Product.id, Product.name, Product.barcode, Product.price, Product.quantity)
+                .filter(Product.id.in_(product_ids[start:start + REFRESH_CHUNK]))
+                .all()
+            )
+            for row in rows:
+                self._store(CatalogEntry(*row))
+
+    def take(self, quantities: Dict[int, int]) -> None:
+        """Take sold stock off the cached entries without asking the database"""
+        for product_id, quantity in quantities.items():
+            entry = self._by_id.get(product_id)
+            if entry is not None:
+                self._store(replace(entry, quantity=entry.quantity - quantity), from_db=False)
+
+    def discard(self, product_ids: List[int]) -> None:
+        """Forget deleted products"""
+        for product_id in product_ids:
+            entry = self._by_id.pop(product_id, None)
+            if entry is not None and entry.barcode:
+                self._by_barcode.pop(entry.barcode, None)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _store(self, entry: CatalogEntry, from_db: bool = True) -> CatalogEntry:
+        if from_db and self.pending is not None:
+            sold = self.pending(entry.id)
+            if sold:
+                entry = replace(entry, quantity=entry.quantity - sold)
+        previous = self._by_id.get(entry.id)
+        if previous is not None and previous.barcode != entry.barcode:
+            self._by_barcode.pop(previous.barcode, None)
+        self._by_id[entry.id] = entry
+        if entry.barcode:
+            self._by_barcode[entry.barcode] = entry
+        return entry
+
+
+class Cart:
+    """
+    Lines in scan order, one per product. Subtotal and item count are kept
+    up to date on every change instead of being summed over the lines.
+    """
+
+    def __init__(self):
+        self._lines: List[CartLine] = []
+        self._rows: Dict[int, int] = {} # product_id -> row
+        self.subtotal = 0
+        self.item_count = 0
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def lines(self) -> List[CartLine]:
+        return list(self._lines)
+
+    def row_of(self, product_id: int) -> Optional[int]:
+        return self._rows.get(product_id)
+
+    def add(self, entry: CatalogEntry, quantity: int = 1) -> Tuple[int, CartLine, bool]:
+        """Add `quantity` of a product; returns (row, line, is_new_line)"""
+        if quantity <= 0:
+            raise ValueError("Quantity must be greater than 0")
+
+        row = self._rows.get(entry.id)
+        in_cart = self._lines[row].quantity if row is not None else 0
+        if in_cart + quantity > entry.quantity:
+            raise ValueError(
+                f"Not enough stock for {entry.name}. "
+                f"Available: {entry.quantity}, Requested: {in_cart + quantity}"
+            )
+
+        if row is None:
+            line = CartLine(entry.id, entry.name, entry.barcode, entry.price, quantity)
+            row = len(self._lines)
+            self._lines.append(line)
+            self._rows[entry.id] = row
+            is_new = True
+        else:
+            line = self._lines[row]
+            line.quantity += quantity
+            is_new = False
+
+        self.subtotal += entry.price * quantity
+        self.item_count += quantity
+        return row, line, is_new
+
+    def set_quantity(self, product_id: int, quantity: int, available: Optional[int] = None) -> Tuple[int, CartLine]:
+        row = self._rows.get(product_id)
+        if row is None:
+            raise ValueError("Product is not in the cart")
+        if quantity <= 0:
+            raise ValueError("Quantity must be greater than 0")
+
+        line = self._lines[row]
+        if available is not None and quantity > available:
+            raise ValueError(
+                f"Not enough stock for {line.name}. "
+                f"Available: {available}, Requested: {quantity}"
+            )
+
+        delta = quantity - line.quantity
+        line.quantity = quantity
+        self.subtotal += line.unit_price * delta
+        self.item_count += delta
+        return row, line
+
+    def remove(self, product_id: int) -> int:
+        row = self._rows.pop(product_id, None)
+        if row is None:
+            raise ValueError("Product is not in the cart")
+
+        line = self._lines.pop(row)
+        for later in self._lines[row:]:
+            self._rows[later.product_id] -= 1
+
+        self.subtotal -= line.total_price
+        self.item_count -= line.quantity
+        return row
+
+    def clear(self) -> None:
+        self._lines.clear()
+        self._rows.clear()
+        self.subtotal = 0
+        self.item_count = 0
+
+    def to_sale_lines(self) -> List[Dict]:
+        return [
+            {
+                "product_id": line.product_id,
+                "name": line.name,
+                "quantity": line.quantity,
+                "unit_price": line.unit_price,
+            }
+            for line in self._lines
+        ]
+
+
+class CartService:
+    def __init__(self, db: Session, journal: Optional[SalesJournal] = None):
+        self.db = db
+        self.journal = journal or get_sales_journal(db.get_bind())
+        self.catalog = ProductCatalog(db, pending=self.journal.pending_quantity)
+
+    def checkout(self, cart: Cart) -> Dict:
+        """
+        Journal the cart as a paid sale and take its stock off the catalog.
+        The sale is committed when this returns; the invoice row follows
+        shortly after from the journal's applier.
+        """
+        if not len(cart):
+            raise ValueError("Cart is empty")
+
+        sale = self.journal.record_sale(cart.to_sale_lines(), status=InvoiceStatus.PAID)
+        self.catalog.take({line.product_id: line.quantity for line in cart.lines()})
+        return sale
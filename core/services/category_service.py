@@ -3,11 +3,13 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from models.category import Category
 from core.repositories.category_repository import CategoryRepository
+from core.events import CategoryCreated, CategoryDeleted, CategoryRenamed, CategoryUpdated, get_event_bus
 
 class CategoryService:
     def __init__(self, db: Session):
         self.db = db
         self.category_repository = CategoryRepository(db)
+        self.events = get_event_bus()
 
     def create_category(self, name: str, description: str = None) -> Optional[Category]:
         try:
@@ -17,6 +19,7 @@ class CategoryService:
             category = Category(name=name.strip(), description=description)
             category = self.category_repository.add(category)
             self.db.commit()
+            self.events.publish(CategoryCreated(category.id))
             return category
         except (SQLAlchemyError, ValueError) as e:
             self.db.rollback()
@@ -43,10 +46,15 @@ class CategoryService:
             if not category:
                 raise ValueError(f"Category {category_id} not found")
             
+            previous_name = category.name
             category.name = name.strip()
             category.description = description
             category = self.category_repository.update(category)
             self.db.commit()
+            if category.name != previous_name:
+                self.events.publish(CategoryRenamed(category.id, category.name))
+            else:
+                self.events.publish(CategoryUpdated(category.id))
             return category
         except (SQLAlchemyError, ValueError) as e:
             self.db.rollback()
@@ -61,6 +69,7 @@ class CategoryService:
             success = self.category_repository.delete(category)
             if success:
                 self.db.commit()
+                self.events.publish(CategoryDeleted(category_id))
                 return True
             return False
         except SQLAlchemyError:
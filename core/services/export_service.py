@@ -0,0 +1,199 @@
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+import xlsxwriter
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models.category import Category
+from models.customer import Customer
+from models.product import Product
+from core.services.archive_service import InvoiceArchive
+from core.theme import color
+
+Progress = Callable[[int, int], None]
+
+BATCH_SIZE = 2000
+# Excel's row limit, minus the header row
+MAX_SHEET_ROWS = 1_048_575
+
+# (header, width, format name) per column
+INVOICE_COLUMNS = [
+    ("Invoice ID", 12, None),
+    ("Date", 18, "datetime"),
+    ("Customer", 24, None),
+    ("Status", 12, None),
+    ("Total Amount", 14, "money"),
+]
+ITEM_COLUMNS = [
+    ("Invoice ID", 12, None),
+    ("Date", 18, "datetime"),
+    ("Barcode", 16, None),
+    ("Product", 30, None),
+    ("Quantity", 10, None),
+    ("Unit Price", 12, "money"),
+    ("Total Price", 14, "money"),
+]
+PRODUCT_COLUMNS = [
+    ("Product ID", 12, None),
+    ("Barcode", 16, None),
+    ("Name", 30, None),
+    ("Category", 20, None),
+    ("Price", 12, "money"),
+    ("Quantity", 10, None),
+]
+
+
+class ExportService:
+    """
+    Excel exports that stream rows from the database in batches into
+    XlsxWriter's constant_memory mode, so memory stays flat however many
+    rows are written.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.archive = InvoiceArchive(db)
+
+    def export_invoices(self, path: str, start: date, end: date, progress: Optional[Progress] = None) -> int:
+        start_at, end_before = _date_bounds(start, end)
+
+        def counted(invoices, items):
+            return select(func.count(invoices.c.id)).where(invoices.c.date >= start_at, invoices.c.date < end_before)
+
+        def listed(invoices, items):
+            return (
+                select(invoices.c.id, invoices.c.date, Customer.name, invoices.c.status, invoices.c.total_amount)
+                .outerjoin(Customer, invoices.c.customer_id == Customer.id)
+                .where(invoices.c.date >= start_at, invoices.c.date < end_before)
+            )
+
+        # Ranges reaching back past the archive horizon read both databases
+        total = sum(self.db.scalars(self.archive.span(counted, start_at, end_before)))
+        listing = self.archive.span(listed, start_at, end_before).subquery()
+        rows = select(listing).order_by(listing.c.id)
+        rows = ((id_, date_, customer or "Walk-in Customer", status.value if status else "", amount)
+                for id_, date_, customer, status, amount in self._stream(rows))
+        return self._write(path, "Invoices", INVOICE_COLUMNS, rows, total, progress)
+
+    def export_invoice_items(self, path: str, start: date, end: date, progress: Optional[Progress] = None) -> int:
+        start_at, end_before = _date_bounds(start, end)
+
+        def counted(invoices, items):
+            return (
+                select(func.count(items.c.id))
+                .join(invoices, items.c.invoice_id == invoices.c.id)
+                .where(invoices.c.date >= start_at, invoices.c.date < end_before)
+            )
+
+        def listed(invoices, items):
+            return (
+                select(
+                    invoices.c.id, invoices.c.date, Product.barcode, Product.name,
+                    items.c.quantity, items.c.unit_price, items.c.total_price, items.c.id.label("item_id"),
+                )
+                .join(invoices, items.c.invoice_id == invoices.c.id)
+                .outerjoin(Product, items.c.product_id == Product.id)
+                .where(invoices.c.date >= start_at, invoices.c.date < end_before)
+            )
+
+        total = sum(self.db.scalars(self.archive.span(counted, start_at, end_before)))
+        listing = self.archive.span(listed, start_at, end_before).subquery()
+        rows = (
+            select(*[column for column in listing.c if column.name != "item_id"])
+            .order_by(listing.c.id, listing.c.item_id)
+        )
+        return self._write(path, "Invoice Items", ITEM_COLUMNS, self._stream(rows), total, progress)
+
+    def export_products(self, path: str, progress: Optional[Progress] = None) -> int:
+        total = self.db.scalar(select(func.count(Product.id)))
+        rows = (
+            select(Product.id, Product.barcode, Product.name, Category.name, Product.price, Product.quantity)
+            .outerjoin(Category, Product.category_id == Category.id)
+            .order_by(Product.id)
+        )
+        rows = ((id_, barcode, name, category or "Uncategorized", price, quantity)
+                for id_, barcode, name, category, price, quantity in self._stream(rows))
+        return self._write(path, "Products", PRODUCT_COLUMNS, rows, total, progress)
+
+    def _stream(self, statement) -> Iterable[Tuple]:
+        """Yield plain column tuples, fetching BATCH_SIZE rows at a time"""
+        result = self.db.execute(statement.execution_options(yield_per=BATCH_SIZE))
+        for partition in result.partitions():
+            yield from partition
+
+    def _write(
+        self,
+        path: str,
+        title: str,
+        columns: Sequence[Tuple[str, int, Optional[str]]],
+        rows: Iterable[Sequence],
+        total: int,
+        progress: Optional[Progress],
+    ) -> int:
+        workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "remove_timezone": True})
+        formats = _formats(workbook)
+        column_formats = [formats.get(name) for _, _, name in columns]
+
+        sheet_number = 0
+        sheet = None
+        row_index = MAX_SHEET_ROWS
+        written = 0
+        try:
+            for row in rows:
+                if row_index >= MAX_SHEET_ROWS:
+                    sheet_number += 1
+                    sheet = _add_sheet(workbook, title, sheet_number, columns, formats)
+                    row_index = 0
+                row_index += 1
+                for col, (value, cell_format) in enumerate(zip(row, column_formats)):
+                    if value is None:
+                        continue
+                    if isinstance(value, datetime):
+                        sheet.write_datetime(row_index, col, value, cell_format)
+                    else:
+                        sheet.write(row_index, col, value, cell_format)
+                written += 1
+                if progress and written % BATCH_SIZE == 0:
+                    progress(written, total)
+
+            if sheet is None:
+                _add_sheet(workbook, title, 1, columns, formats)
+        finally:
+            workbook.close()
+
+        if progress:
+            progress(written, total)
+        return written
+
+
+def _date_bounds(start: date, end: date) -> Tuple[datetime, datetime]:
+    """Both dates are inclusive; invoices carry a time of day"""
+    if end < start:
+        raise ValueError("End date must not be before start date")
+    return datetime.combine(start, time.min), datetime.combine(end + timedelta(days=1), time.min)
+
+
+def _formats(workbook) -> Dict[str, object]:
+    # resources/templates/excel_template.xlsx is empty, so the look comes
+    # from the application theme colors instead
+    return {
+        "header": workbook.add_format({
+            "bold": True,
+            "font_color": color("white"),
+            "bg_color": color("primary"),
+            "border": 1,
+            "border_color": color("border"),
+        }),
+        "money": workbook.add_format({"num_format": '"$"#,##0'}),
+        "datetime": workbook.add_format({"num_format": "yyyy-mm-dd hh:mm"}),
+    }
+
+
+def _add_sheet(workbook, title: str, number: int, columns, formats):
+    sheet = workbook.add_worksheet(title if number == 1 else f"{title} ({number})")
+    for col, (header, width, _) in enumerate(columns):
+        sheet.set_column(col, col, width)
+        sheet.write(0, col, header, formats["header"])
+    sheet.freeze_panes(1, 0)
+    return sheet
@@ -0,0 +1,75 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import Table, func, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from models.id_sequence import IdSequence
+
+
+class IdAllocator:
+    """
+    Hands out primary keys for `table` from ids reserved `block_size` at a
+    time in id_sequences, the way BarcodeAllocator hands out barcodes. Every
+    writer that takes its ids here, in this process or another one on the
+    same database, gets ids no one else has. A reservation also starts past
+    the highest id already in the table, for rows written without the
+    sequence. Ids left in a block when the process exits are skipped,
+    never reused.
+    """
+
+    def __init__(self, bind: Engine, table: Table, block_size: int = 100):
+        self.session_factory = sessionmaker(bind=bind, autoflush=False)
+        self.table = table
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0 # exclusive
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        with self._lock:
+            if self._next >= self._end:
+                self._reserve()
+            value = self._next
+            self._next += 1
+        return value
+
+    def _reserve(self) -> None:
+        sequence = IdSequence.__table__
+        name = self.table.name
+        with self.session_factory() as db:
+            db.execute(insert(sequence).values(name=name, next_id=1).on_conflict_do_nothing())
+            # Taking the write lock first keeps two processes on one database apart
+            end = db.execute(
+                update(sequence)
+                .where(sequence.c.name == name)
+                .values(next_id=sequence.c.next_id + self.block_size)
+                .returning(sequence.c.next_id)
+            ).scalar()
+            start = end - self.block_size
+
+            used = db.execute(select(func.max(self.table.c.id))).scalar()
+            if used is not None and used >= start:
+                start = used + 1
+                end = start + self.block_size
+                db.execute(update(sequence).where(sequence.c.name == name).values(next_id=end))
+            db.commit()
+        self._next, self._end = start, end
+
+
+_allocators: Dict[Tuple[Engine, str], IdAllocator] = {}
+_allocators_lock = threading.Lock()
+
+
+def get_id_allocator(table: Table, bind: Optional[Engine] = None, block_size: int = 100) -> IdAllocator:
+    """The allocator for a table of a database, the app's by default"""
+    if bind is None:
+        from data.database import engine
+        bind = engine
+    with _allocators_lock:
+        key = (bind, table.name)
+        if key not in _allocators:
+            _allocators[key] = IdAllocator(bind, table, block_size)
+        return _allocators[key]
@@ -1,15 +1,18 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Optional, List, Dict
-from datetime import date, datetime
+from datetime import date
 
 from models.invoice import Invoice
-from models.invoice_item import InvoiceItem
 from models.product import Product
+from enums.invoice_status_enum import InvoiceStatus
 
 from core.repositories.invoice_repository import InvoiceRepository
 from core.repositories.invoice_item_repository import InvoiceItemRepository
 from core.repositories.product_repository import ProductRepository
+from core.events import InvoiceCancelled, StockChanged, get_event_bus
+from core.services.archive_service import InvoiceArchive
+from core.services.sales_journal import get_sales_journal
 
 class InvoiceService:
     def __init__(self, db: Session):
@@ -17,77 +20,73 @@ class InvoiceService:
         self.invoice_repo= InvoiceRepository(db)
         self.invoice_item_repo= InvoiceItemRepository(db)
         self.product_repo= ProductRepository(db)
+        self.archive= InvoiceArchive(db)
+        self.events= get_event_bus()
 
     def create_invoice(
             self,
-            products: list[Dict]
-    )->Optional[Invoice]:
+            products: list[Dict],
+            status: InvoiceStatus = InvoiceStatus.PENDING,
+    )->Dict:
+        """
+        Create an invoice for [{'product_id', 'quantity'}, ...] through the
+        sales journal, which takes it to the database and the stock off
+        shortly after, so its id comes from the same sequence as the
+        till's sales. Returns the journal record, with the invoice id.
+        """
         try:
-            validated_products= []
+            # Repeated product ids are merged into one line
+            quantities: Dict[int, int]= {}
             for item in products:
-                product= self.product_repo.get(item['product_id'])
+                quantities[item['product_id']]= quantities.get(item['product_id'], 0) + item['quantity']
+
+            if not quantities:
+                raise ValueError("Invoice must contain at least one product")
+
+            found= {product.id: product for product in self.product_repo.get_many(list(quantities))}
+            journal= get_sales_journal(self.db.get_bind())
+
+            lines= []
+            for product_id, quantity in quantities.items():
+                product= found.get(product_id)
 
                 if not product:
-                    raise ValueError(f"Product with id {item['product_id']} not found")
+                    raise ValueError(f"Product with id {product_id} not found")
                 
-                if product.quantity < item['quantity']:
+                if quantity <= 0:
+                    raise ValueError(f"Quantity for {product.name} must be greater than 0")
+
+                # Sales journaled but not applied yet have sold some already
+                available= product.quantity - journal.pending_quantity(product.id)
+                if available < quantity:
                     raise ValueError(
                         f"Not enough stock for {product.name}. "
-                        f"Available: {product.quantity}, Requested: {item['quantity']}"
+                        f"Available: {available}, Requested: {quantity}"
                     )
-                
-                validated_products.append({
-                    'product': product,
-                    'quantity': item['quantity']
-                })
-
-            invoice= Invoice(
-                customer_id= None,
-                date= datetime.now(),
-                total_amount=0,
-            )
-
-            invoice = self.invoice_repo.add(invoice)
-
-            total= 0
-
-            for item in validated_products:
-                product= item['product']
-                quantity= item['quantity']
-
-                total_price= product.price * quantity
-                total+= total_price
 
-                invoice_item= InvoiceItem(
-                    invoice_id= invoice.id,
-                    product_id= product.id,
-                    quantity= quantity,
-                    unit_price= product.price,
-                    total_price= total_price
-                )
-
-                self.invoice_item_repo.add(invoice_item)
-
-                product.quantity -= quantity
-                self.product_repo.update(product)
+                lines.append({
+                    "product_id": product.id,
+                    "name": product.name,
+                    "quantity": quantity,
+                    "unit_price": product.price,
+                })
 
-            invoice.total_amount= total
-            self.invoice_repo.update(invoice)
+            return journal.record_sale(lines, status=status)
 
-            self.db.commit()
-            return invoice
-        
-        except (SQLAlchemyError, ValueError) as e:
-            self.db.rollback()
-            return None
+        except SQLAlchemyError as e:
+            raise ValueError(f"Database error: {str(e)}")
         
     def get_invoice_with_details(self, invoice_id: int)->Optional[Dict]:
         try:
             invoice= self.invoice_repo.get(invoice_id)
-            if not invoice:
-                return None
-            
-            item= self.invoice_item_repo.list_by_invoice_id(invoice_id)
+            if invoice:
+                item= self.invoice_item_repo.list_by_invoice_id(invoice_id)
+            else:
+                # Old invoices may have moved to the archive database
+                invoice= self.archive.get(invoice_id)
+                if not invoice:
+                    return None
+                item= self.archive.items(invoice_id)
             customer= None
 
             return {
@@ -105,15 +104,23 @@ class InvoiceService:
                 return False
             
             items= self.invoice_item_repo.list_by_invoice_id(invoice_id)
+            cancelled= InvoiceCancelled(invoice.id, invoice.total_amount, invoice.date)
 
+            stock_changes= []
             for item in items:
                 product= self.product_repo.get(item.product_id)
                 if product:
+                    stock_changes.append(StockChanged(product.id, product.quantity + item.quantity, product.quantity))
                     product.quantity += item.quantity
                     self.product_repo.update(product)
             
             result= self.invoice_repo.delete(invoice)
             self.db.commit()
+
+            with self.events.batch():
+                self.events.publish(cancelled)
+                for event in stock_changes:
+                    self.events.publish(event)
             return result
         
         except Exception as e:
@@ -144,7 +151,7 @@ class InvoiceService:
             # Search by ID (as string) or maybe date string if needed
             # For now, simple ID search
             if query.isdigit():
-                invoice = self.invoice_repo.get(int(query))
+                invoice = self.invoice_repo.get(int(query)) or self.archive.get(int(query))
                 return [invoice] if invoice else []
             return []
         except SQLAlchemyError:
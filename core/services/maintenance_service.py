@@ -0,0 +1,296 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from PySide6.QtCore import QEvent, QObject
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+
+from models.maintenance_run import MaintenanceRun
+from core.events import Event, get_event_bus
+from core.logger import get_logger
+from core.settings import get_settings
+
+logger = get_logger(__name__)
+
+INPUT_EVENTS = {QEvent.KeyPress, QEvent.MouseButtonPress, QEvent.Wheel, QEvent.TouchBegin}
+AUTO_VACUUM_INCREMENTAL = 2
+
+_runs = MaintenanceRun.__table__
+
+
+class ActivityTracker(QObject):
+    """
+    When the till was last used: any key, click or touch anywhere in the
+    application, and any change published on the event bus, sales
+    included, wherever they came from.
+    """
+
+    def __init__(self, app=None):
+        super().__init__()
+        self.app = app
+        self._last = time.monotonic()
+        self._unsubscribe = get_event_bus().subscribe(Event, self._on_event)
+        if app is not None:
+            app.installEventFilter(self)
+
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self._last
+
+    def touch(self) -> None:
+        self._last = time.monotonic()
+
+    def close(self) -> None:
+        self._unsubscribe()
+        if self.app is not None:
+            self.app.removeEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        # Runs for every event in the application, so it only stamps the time
+        if event.type() in INPUT_EVENTS:
+            self._last = time.monotonic()
+        return False
+
+    def _on_event(self, event: Event) -> None:
+        self._last = time.monotonic()
+
+
+@dataclass
+class Task:
+    name: str
+    interval: timedelta
+    # A generator; each step is one bounded slice of work
+    slices: Callable[[], Iterator[None]]
+
+
+class MaintenanceService:
+    """
+    Database housekeeping for the idle stretches of a till's day: once
+    nothing has happened for `idle_minutes`, due tasks run one bounded
+    slice at a time, and a task interrupted by a customer resumes from
+    its next slice in the next idle period. Each task logs the database
+    size before and after and how long it took.
+
+    - optimize: PRAGMA optimize, with ANALYZE capped at `analysis_limit` rows per index
+    - analyze: ANALYZE table by table, for plans that follow months of deletes
+    - vacuum: PRAGMA incremental_vacuum, `vacuum_pages` pages per slice
+    - integrity: PRAGMA integrity_check table by table
+    - checkpoint: fold the WAL back into the database and truncate it
+
+    A database created before auto_vacuum was set needs one full VACUUM
+    to switch to incremental mode. That is the one step that is not
+    sliced, so it only runs while the database is under
+    `max_full_vacuum_mb`.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        tracker: ActivityTracker,
+        idle_minutes: float = 10,
+        poll_s: float = 30,
+        analysis_limit: int = 1000,
+        vacuum_pages: int = 500,
+        max_full_vacuum_mb: int = 256,
+        interval_hours: Optional[Dict[str, float]] = None,
+    ):
+        self.engine = engine
+        self.tracker = tracker
+        self.idle_s = idle_minutes * 60
+        self.poll_s = poll_s
+        self.analysis_limit = analysis_limit
+        self.vacuum_pages = vacuum_pages
+        self.max_full_vacuum_bytes = max_full_vacuum_mb * 1024 * 1024
+        hours = {"optimize": 24, "analyze": 168, "vacuum": 24, "integrity": 168, "checkpoint": 24}
+        hours.update(interval_hours or {})
+        self.tasks = [
+            Task("optimize", timedelta(hours=hours["optimize"]), self._optimize),
+            Task("analyze", timedelta(hours=hours["analyze"]), self._analyze),
+            Task("vacuum", timedelta(hours=hours["vacuum"]), self._vacuum),
+            Task("integrity", timedelta(hours=hours["integrity"]), self._integrity),
+            Task("checkpoint", timedelta(hours=hours["checkpoint"]), self._checkpoint),
+        ]
+        # The task in progress: (task, its slices, size before, seconds spent)
+        self._current: Optional[Tuple[Task, Iterator[None], Tuple[int, int], float]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_settings(cls, engine: Engine, tracker: ActivityTracker) -> "MaintenanceService":
+        options = dict(get_settings()["maintenance"])
+        options.pop("enabled", None)
+        return cls(engine, tracker, **options)
+
+    def idle(self) -> bool:
+        return self.tracker.idle_seconds() >= self.idle_s
+
+    def due(self) -> List[Task]:
+        with self.engine.connect() as conn:
+            finished = dict(conn.execute(select(_runs.c.task, _runs.c.finished_at)).all())
+        now = datetime.now()
+        return [task for task in self.tasks if task.name not in finished or now - finished[task.name] >= task.interval]
+
+    def run_idle(self, until: Callable[[], bool] = lambda: False) -> List[str]:
+        """
+        Work through the due tasks while idle and `until()` is false;
+        returns the tasks finished
+        """
+        finished = []
+        while self.idle() and not until():
+            if self._current is None:
+                due = self.due()
+                if not due:
+                    break
+                task = due[0]
+                self._current = (task, task.slices(), self.size(), 0.0)
+
+            task, slices, before, spent = self._current
+            started = time.perf_counter()
+            try:
+                next(slices)
+                done = False
+            except StopIteration:
+                done = True
+            except Exception:
+                logger.exception("Maintenance task %s failed", task.name)
+                self._current = None
+                self._finish(task)
+                continue
+            spent += time.perf_counter() - started
+            self._current = (task, slices, before, spent)
+            if done:
+                self._current = None
+                self._finish(task)
+                self._log(task, before, self.size(), spent)
+                finished.append(task.name)
+        return finished
+
+    def size(self) -> Tuple[int, int]:
+        """(database bytes, bytes on the free list)"""
+        with self.engine.connect() as conn:
+            page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+            pages = conn.exec_driver_sql("PRAGMA page_count").scalar()
+            free = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+        return pages * page_size, free * page_size
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_s):
+            try:
+                self.run_idle(until=self._stop.is_set)
+            except Exception:
+                logger.exception("Database maintenance failed")
+
+    def _finish(self, task: Task) -> None:
+        with self.engine.begin() as conn:
+            statement = insert(_runs).values(task=task.name, finished_at=datetime.now())
+            conn.execute(statement.on_conflict_do_update(
+                index_elements=[_runs.c.task], set_={"finished_at": statement.excluded.finished_at}
+            ))
+
+    def _log(self, task: Task, before: Tuple[int, int], after: Tuple[int, int], spent: float) -> None:
+        logger.info(
+            "Maintenance %s took %.2f s: %.1f MB (%.1f MB free) -> %.1f MB (%.1f MB free)",
+            task.name, spent, before[0] / 1e6, before[1] / 1e6, after[0] / 1e6, after[1] / 1e6,
+        )
+
+    def _execute(self, sql: str) -> List[tuple]:
+        """One statement on a connection of its own; returns its rows"""
+        with self.engine.connect() as conn:
+            # Caps ANALYZE, including the one PRAGMA optimize may run, to a sample per index
+            conn.exec_driver_sql(f"PRAGMA analysis_limit={int(self.analysis_limit)}")
+            result = conn.exec_driver_sql(sql)
+            rows = result.all() if result.returns_rows else []
+            conn.commit()
+        return rows
+
+    def _tables(self) -> List[str]:
+        with self.engine.connect() as conn:
+            return conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            ).scalars().all()
+
+    # Tasks
+
+    def _optimize(self) -> Iterator[None]:
+        self._execute("PRAGMA optimize")
+        yield
+
+    def _analyze(self) -> Iterator[None]:
+        for table in self._tables():
+            self._execute(f'ANALYZE "{table}"')
+            yield
+
+    def _vacuum(self) -> Iterator[None]:
+        with self.engine.connect() as conn:
+            mode = conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+        size, free = self.size()
+        if mode != AUTO_VACUUM_INCREMENTAL:
+            if free and size <= self.max_full_vacuum_bytes:
+                with self.engine.connect() as conn:
+                    # VACUUM can't run in a transaction; pysqlite only opens one for DML
+                    conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+                    conn.exec_driver_sql("VACUUM")
+            return
+
+        while free:
+            self._execute(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)})")
+            _, remaining = self.size()
+            if remaining >= free:
+                return
+            free = remaining
+            yield
+
+    def _integrity(self) -> Iterator[None]:
+        for table in self._tables():
+            problems = [row[0] for row in self._execute(f'PRAGMA integrity_check("{table}")')]
+            if problems != ["ok"]:
+                logger.error("Integrity check of %s failed: %s", table, "; ".join(problems[:10]))
+            yield
+
+    def _checkpoint(self) -> Iterator[None]:
+        busy, _, _ = self._execute("PRAGMA wal_checkpoint(TRUNCATE)")[0]
+        if busy:
+            logger.info("WAL checkpoint skipped: the database was busy")
+        yield
+
+
+_tracker: Optional[ActivityTracker] = None
+_service: Optional[MaintenanceService] = None
+
+
+def start_from_settings(app, engine: Engine) -> Optional[MaintenanceService]:
+    """Idle-time maintenance of the app database, if enabled"""
+    global _tracker, _service
+    if not get_settings()["maintenance"]["enabled"] or _service is not None:
+        return _service
+
+    _tracker = ActivityTracker(app)
+    _service = MaintenanceService.from_settings(engine, _tracker)
+    _service.start()
+    return _service
+
+
+def stop_maintenance() -> None:
+    global _tracker, _service
+    if _service is not None:
+        _service.stop()
+        _service = None
+    if _tracker is not None:
+        _tracker.close()
+        _tracker = None
@@ -0,0 +1,216 @@
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models.category import Category
+from models.product import Product
+from core.events import PriceChanged, ProductCreated, ProductUpdated, StockChanged, get_event_bus
+from core.services.barcode_allocator import get_barcode_allocator
+from core.services.user_import_service import ImportReport
+from core.utils import read_table
+
+Progress = Callable[[int, float], None] # rows read, rows per second
+
+# Rows validated, looked up and upserted together; also keeps the
+# IN (...) lookup under SQLite's bound parameter limit
+CHUNK_ROWS = 500
+
+
+@dataclass
+class ProductImportReport(ImportReport):
+    updated: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.created + self.updated) / self.seconds if self.seconds else 0.0
+
+
+def _whole_number(value: str, label: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"{label} must be a number")
+    if not number.is_integer():
+        raise ValueError(f"{label} must be a whole number")
+    return int(number)
+
+
+class ProductImportService:
+    """
+    Creates or updates products from a CSV or XLSX supplier catalog with the
+    columns name and price and optionally quantity, barcode and category.
+
+    The file is streamed in chunks of CHUNK_ROWS. Rows whose barcode is
+    already in the database update that product; rows without one get an
+    EAN-13 from the barcode allocator. Each chunk is one lookup and one upsert statement
+    and is committed on its own, so the till keeps selling during a long
+    import. Columns missing from the file, and blank quantity and category
+    cells, are left alone on updates.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.events = get_event_bus()
+        self.barcodes = get_barcode_allocator(db.get_bind())
+
+    def import_file(self, path: str, progress: Optional[Progress] = None) -> ProductImportReport:
+        report = ProductImportReport()
+        started = time.perf_counter()
+        categories = {
+            name.casefold(): category_id
+            for name, category_id in self.db.execute(select(Category.name, Category.id))
+        }
+        seen: Set[str] = set()
+        read = 0
+
+        table = read_table(path)
+        while True:
+            chunk = list(islice(table, CHUNK_ROWS))
+            if not chunk:
+                break
+            read += len(chunk)
+            rows, columns = self._validate(chunk, categories, seen, report)
+            if rows:
+                try:
+                    self._upsert(rows, columns, seen, report)
+                except SQLAlchemyError as e:
+                    self.db.rollback()
+                    raise ValueError(
+                        f"Database error after {report.created + report.updated} products were saved: {str(e)}"
+                    )
+            if progress:
+                progress(read, read / max(time.perf_counter() - started, 1e-6))
+
+        report.errors.sort()
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _validate(
+        self,
+        chunk: List[Tuple[int, Dict[str, str]]],
+        categories: Dict[str, int],
+        seen: Set[str],
+        report: ProductImportReport,
+    ) -> Tuple[List[Dict], Set[str]]:
+        rows = []
+        columns: Set[str] = set()
+        for number, values in chunk:
+            columns.update(values)
+            name = values.get("name", "")
+            barcode = values.get("barcode", "")
+            category = values.get("category", "")
+            try:
+                if not name:
+                    raise ValueError("Name is required")
+                if len(name) > Product.name.type.length:
+                    raise ValueError(f"Name must be at most {Product.name.type.length} characters")
+                price = _whole_number(values.get("price", ""), "Price")
+                if price <= 0:
+                    raise ValueError("Price must be greater than 0")
+                # A blank cell leaves the stock of an existing product alone
+                quantity = values.get("quantity")
+                quantity = _whole_number(quantity, "Quantity") if quantity else None
+                if quantity is not None and quantity < 0:
+                    raise ValueError("Stock cannot be negative")
+                if len(barcode) > Product.barcode.type.length:
+                    raise ValueError(f"Barcode must be at most {Product.barcode.type.length} characters")
+                if barcode in seen:
+                    raise ValueError(f"Barcode {barcode} is repeated")
+                if category and category.casefold() not in categories:
+                    raise ValueError(f"Unknown category: {category}")
+            except ValueError as e:
+                report.errors.append((number, str(e)))
+                continue
+
+            if barcode:
+                seen.add(barcode)
+            rows.append({
+                "name": name,
+                "price": price,
+                "quantity": quantity,
+                "barcode": barcode,
+                "category_id": categories[category.casefold()] if category else None,
+            })
+        return rows, columns
+
+    def _upsert(self, rows: List[Dict], columns: Set[str], seen: Set[str], report: ProductImportReport) -> None:
+        supplied = [row for row in rows if row["barcode"]]
+        generated = [row for row in rows if not row["barcode"]]
+        for row in supplied:
+            self.barcodes.note_used(row["barcode"])
+        existing = self._existing([row["barcode"] for row in supplied])
+
+        # Only new products start from 0; a blank keeps what an existing one has
+        for row in rows:
+            if row["quantity"] is None and row["barcode"] not in existing:
+                row["quantity"] = 0
+
+        # The table rather than the mapped class: the ORM would split rows
+        # with and without a category into separate statements
+        ids = {}
+        if supplied:
+            statement = insert(Product.__table__)
+            updates = {"name": statement.excluded.name, "price": statement.excluded.price}
+            if "quantity" in columns:
+                updates["quantity"] = func.coalesce(statement.excluded.quantity, Product.__table__.c.quantity)
+            if "category" in columns:
+                updates["category_id"] = func.coalesce(statement.excluded.category_id, Product.__table__.c.category_id)
+            statement = statement.on_conflict_do_update(index_elements=[Product.barcode], set_=updates)
+            # Sent as one multi-row INSERT ... RETURNING, not row by row
+            ids.update(self._insert(statement, supplied))
+
+        # An allocated code can still be taken, e.g. by a till sharing this
+        # database; such a row gets another code instead of updating that product
+        statement = insert(Product.__table__).on_conflict_do_nothing(index_elements=[Product.barcode])
+        while generated:
+            for row in generated:
+                while not row["barcode"] or row["barcode"] in seen:
+                    row["barcode"] = self.barcodes.next()
+                seen.add(row["barcode"])
+            saved = self._insert(statement, generated)
+            ids.update(saved)
+            generated = [row for row in generated if row["barcode"] not in saved]
+        self.db.commit()
+
+        with self.events.batch():
+            for row in rows:
+                product_id = ids[row["barcode"]]
+                before = existing.get(row["barcode"])
+                if before is None:
+                    report.created += 1
+                    self.events.publish(ProductCreated(product_id))
+                    continue
+                report.updated += 1
+                _, previous_price, previous_quantity = before
+                self.events.publish(ProductUpdated(product_id))
+                if row["price"] != previous_price:
+                    self.events.publish(PriceChanged(product_id, row["price"], previous_price))
+                if row["quantity"] is not None and row["quantity"] != previous_quantity:
+                    self.events.publish(StockChanged(product_id, row["quantity"], previous_quantity))
+
+    def _insert(self, statement, rows: List[Dict]) -> Dict[str, int]:
+        """{barcode: id} of the rows the statement saved"""
+        return {barcode: product_id for product_id, barcode in self.db.execute(
+            statement.returning(Product.id, Product.barcode), rows
+        )}
+
+    def _existing(self, barcodes: List[str]) -> Dict[str, Tuple[int, int, int]]:
+        """{barcode: (id, price, quantity)} of products already saved"""
+        if not barcodes:
+            return {}
+        rows = self.db.execute(
+            select(Product.barcode, Product.id, Product.price, Product.quantity)
+            .where(Product.barcode.in_(barcodes))
+        )
+        return {barcode: (product_id, price, quantity) for barcode, product_id, price, quantity in rows}
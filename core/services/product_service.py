@@ -1,14 +1,21 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from typing import Optional, List
-import uuid
 from models.product import Product
 from core.repositories.product_repository import ProductRepository
+from core.services.barcode_allocator import get_barcode_allocator
+from core.events import (
+    PriceChanged, ProductCreated, ProductDeleted, ProductUpdated, StockChanged, get_event_bus,
+)
+
+# Tries at a free barcode before create_product gives up
+BARCODE_ATTEMPTS = 3
 
 class ProductService:
     def __init__(self, db:Session):
         self.db = db
         self.product_repo = ProductRepository(db)
+        self.events = get_event_bus()
 
     def create_product(
             self,
@@ -17,7 +24,7 @@ class ProductService:
             quantity: int,
             category_id: Optional[int] = None
     )->Optional[Product]:
-        """Create a new product with auto-generated barcode"""
+        """Create a new product with an EAN-13 barcode from the allocator"""
         try:
             if price <= 0:
                 raise ValueError("Price must be greater than 0")
@@ -25,23 +32,28 @@ class ProductService:
             if quantity < 0:
                 raise ValueError("Stock cannot be negative")
             
-            # Auto-generate unique barcode using UUID
-            barcode = str(uuid.uuid4())[:12].replace('-', '').upper()
-            
-            # Ensure uniqueness (very unlikely to collision with UUID, but safe)
-            while self.product_repo.get_by_barcode(barcode):
-                barcode = str(uuid.uuid4())[:12].replace('-', '').upper()
-            
-            product= Product(
-                name= name,
-                barcode= barcode,
-                price= price,
-                quantity= quantity,
-                category_id= category_id
-            )
-
-            product = self.product_repo.add(product)
-            self.db.commit()
+            # Unique by construction, so no lookup is needed; a code that was
+            # taken behind the allocator's back is passed over and retried
+            barcodes = get_barcode_allocator(self.db.get_bind())
+            for attempt in range(BARCODE_ATTEMPTS):
+                product= Product(
+                    name= name,
+                    barcode= barcodes.next(),
+                    price= price,
+                    quantity= quantity,
+                    category_id= category_id
+                )
+                # Added directly: the repository swallows the flush error this retries on
+                self.db.add(product)
+                try:
+                    self.db.commit()
+                    break
+                except IntegrityError:
+                    self.db.rollback()
+                    if attempt + 1 == BARCODE_ATTEMPTS or self.product_repo.get_by_barcode(product.barcode) is None:
+                        raise
+
+            self.events.publish(ProductCreated(product.id))
             return product
         
         except ValueError:
@@ -64,7 +76,8 @@ class ProductService:
             product= self.product_repo.get(product_id)
             if not product:
                 raise ValueError(f"Product {product_id} not found")
-            
+
+            previous = product.quantity
             if operation == "add":
                 product.quantity += quantity
 
@@ -81,6 +94,7 @@ class ProductService:
             
             product = self.product_repo.update(product)
             self.db.commit()
+            self.events.publish(StockChanged(product.id, product.quantity, previous))
             return product
         
         except (SQLAlchemyError, ValueError) as e:
@@ -124,6 +138,9 @@ class ProductService:
             if not product:
                 raise ValueError(f"Product {product_id} not found")
 
+            previous_price = product.price
+            previous_quantity = product.quantity
+
             # Barcode is immutable - ignore the barcode parameter
             # (kept in signature for compatibility but not used)
             product.name = name
@@ -133,6 +150,13 @@ class ProductService:
 
             product = self.product_repo.update(product)
             self.db.commit()
+
+            with self.events.batch():
+                self.events.publish(ProductUpdated(product.id))
+                if product.price != previous_price:
+                    self.events.publish(PriceChanged(product.id, product.price, previous_price))
+                if product.quantity != previous_quantity:
+                    self.events.publish(StockChanged(product.id, product.quantity, previous_quantity))
             return product
         except ValueError:
             self.db.rollback()
@@ -153,6 +177,7 @@ class ProductService:
             success = self.product_repo.delete(product)
             if success:
                 self.db.commit()
+                self.events.publish(ProductDeleted(product_id))
                 return True
             return False
         except ValueError:
@@ -181,9 +206,11 @@ class ProductService:
             if not product:
                 raise ValueError(f"Product {product_id} not found")
             
+            previous = product.price
             product.price= new_price
             product = self.product_repo.update(product)
             self.db.commit()
+            self.events.publish(PriceChanged(product.id, product.price, previous))
 
             return product
         
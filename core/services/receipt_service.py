@@ -0,0 +1,303 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+from sqlalchemy.orm import Session, selectinload
+
+from models.invoice import Invoice
+from models.invoice_item import InvoiceItem
+from core.settings import get_settings, resolve_path
+
+FONT = "Helvetica"
+FONT_BOLD = "Helvetica-Bold"
+
+
+class ReceiptLayout:
+    """
+    Everything about a receipt that doesn't depend on the sale: page width,
+    margins, column positions, fonts and the static header/footer text with
+    their measured widths. Built once per worker process; rendering a
+    receipt then only places the variable fields.
+    """
+
+    def __init__(self, store_name: str, footer: str, page_width_mm: float = 80):
+        self.width = page_width_mm * mm
+        self.margin = 4 * mm
+        self.line_height = 4.2 * mm
+        self.font_size = 8
+        self.title_size = 12
+
+        self.store_name = store_name
+        self.footer = footer
+        self.header_height = 24 * mm
+        self.totals_height = 14 * mm
+        self.footer_height = 12 * mm
+
+        content = self.width - 2 * self.margin
+        # Name | qty | unit | total, right edges for the numeric columns
+        self.qty_right = self.margin + content * 0.62
+        self.unit_right = self.margin + content * 0.80
+        self.total_right = self.width - self.margin
+        self.name_width = self.qty_right - self.margin - 8 * mm
+
+        self.store_x = (self.width - stringWidth(store_name, FONT_BOLD, self.title_size)) / 2
+        self.footer_x = (self.width - stringWidth(footer, FONT, self.font_size)) / 2
+
+    def page_height(self, line_count: int) -> float:
+        return self.header_height + line_count * self.line_height + self.totals_height + self.footer_height
+
+    def fit_name(self, name: str) -> str:
+        return _fit(name, self.name_width, self.font_size)
+
+    def draw_static(self, c: canvas.Canvas, height: float) -> float:
+        """Draw the fixed header; returns the y of the first item line"""
+        top = height - self.margin
+        c.setFont(FONT_BOLD, self.title_size)
+        c.drawString(self.store_x, top - self.title_size, self.store_name)
+
+        y = top - self.header_height + self.line_height
+        c.setFont(FONT_BOLD, self.font_size)
+        c.drawString(self.margin, y, "Item")
+        c.drawRightString(self.qty_right, y, "Qty")
+        c.drawRightString(self.unit_right, y, "Price")
+        c.drawRightString(self.total_right, y, "Total")
+        c.line(self.margin, y - 1.5 * mm, self.width - self.margin, y - 1.5 * mm)
+        return y - self.line_height
+
+    def draw_footer(self, c: canvas.Canvas) -> None:
+        c.setFont(FONT, self.font_size)
+        c.drawString(self.footer_x, self.margin + 2 * mm, self.footer)
+
+
+@lru_cache(maxsize=4096)
+def _fit(text: str, width: float, size: int) -> str:
+    if stringWidth(text, FONT, size) <= width:
+        return text
+    while text and stringWidth(text + "…", FONT, size) > width:
+        text = text[:-1]
+    return text + "…"
+
+
+_layout: Optional[ReceiptLayout] = None
+
+
+def _init_worker(store_name: str, footer: str, page_width_mm: float) -> None:
+    global _layout
+    _layout = ReceiptLayout(store_name, footer, page_width_mm)
+
+
+def _ready() -> bool:
+    return True
+
+
+def _receipt_options() -> Dict:
+    return get_settings()["receipt"]
+
+
+def render_receipt(payload: Dict, output_dir: str, print_after: bool = False) -> str:
+    """Render one receipt payload to <output_dir>/invoice_<id>.pdf"""
+    global _layout
+    if _layout is None:
+        options = _receipt_options()
+        _layout = ReceiptLayout(options["store_name"], options["footer"], options["page_width_mm"])
+    layout = _layout
+
+    items = payload["items"]
+    height = layout.page_height(len(items))
+    path = os.path.join(output_dir, f"invoice_{payload['id']}.pdf")
+
+    c = canvas.Canvas(path, pagesize=(layout.width, height))
+    c.setTitle(f"Invoice #{payload['id']}")
+
+    y = layout.draw_static(c, height)
+    c.setFont(FONT, layout.font_size)
+    c.drawString(layout.margin, height - layout.margin - 17, f"Invoice #{payload['id']}")
+    c.drawRightString(layout.total_right, height - layout.margin - 17, payload["date"])
+
+    for item in items:
+        c.drawString(layout.margin, y, layout.fit_name(item["name"]))
+        c.drawRightString(layout.qty_right, y, str(item["quantity"]))
+        c.drawRightString(layout.unit_right, y, f"${item['unit_price']}")
+        c.drawRightString(layout.total_right, y, f"${item['total_price']}")
+        y -= layout.line_height
+
+    c.line(layout.margin, y + 2 * mm, layout.width - layout.margin, y + 2 * mm)
+    c.setFont(FONT_BOLD, layout.font_size + 2)
+    y -= 2 * mm
+    c.drawString(layout.margin, y, "TOTAL")
+    c.drawRightString(layout.total_right, y, f"${payload['total_amount']}")
+    c.setFont(FONT, layout.font_size)
+    c.drawString(layout.margin, y - layout.line_height, f"Status: {payload['status']}")
+
+    layout.draw_footer(c)
+    c.showPage()
+    c.save()
+
+    if print_after:
+        print_file(path)
+    return path
+
+
+def print_file(path: str) -> None:
+    """Send a PDF to the default printer"""
+    if sys.platform.startswith("win"):
+        os.startfile(path, "print")
+    else:
+        subprocess.run(["lp", path], check=True, capture_output=True)
+
+
+def receipt_payload(invoice: Invoice) -> Dict:
+    """Plain, picklable copy of what a receipt shows"""
+    return {
+        "id": invoice.id,
+        "date": invoice.date.strftime("%Y-%m-%d %H:%M") if invoice.date else "",
+        "status": invoice.status.value if invoice.status else "",
+        "total_amount": invoice.total_amount,
+        "items": [
+            {
+                "name": item.product.name if item.product else f"Product {item.product_id}",
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "total_price": item.total_price,
+            }
+            for item in invoice.items
+        ],
+    }
+
+
+def sale_payload(sale: Dict) -> Dict:
+    """Receipt payload straight from a sales journal record"""
+    return {
+        "id": sale["id"],
+        "date": datetime.fromisoformat(sale["date"]).strftime("%Y-%m-%d %H:%M"),
+        "status": sale["status"],
+        "total_amount": sale["total_amount"],
+        "items": [
+            {
+                "name": item["name"],
+                "quantity": item["quantity"],
+                "unit_price": item["unit_price"],
+                "total_price": item["total_price"],
+            }
+            for item in sale["items"]
+        ],
+    }
+
+
+def _pool(workers: Optional[int]) -> ProcessPoolExecutor:
+    options = _receipt_options()
+    # spawn, not fork: the parent runs Qt and SQLAlchemy threads
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(options["store_name"], options["footer"], options["page_width_mm"]),
+    )
+
+
+class ReceiptSpooler:
+    """
+    Queue of receipts rendered (and optionally printed) by a background
+    process pool, so the till never waits on reportlab. A pool broken by
+    a crashed worker is replaced on the next submit.
+    """
+
+    def __init__(self, output_dir: Optional[str] = None, workers: Optional[int] = None):
+        options = _receipt_options()
+        self.output_dir = output_dir or resolve_path(options["output_dir"])
+        self.workers = workers or options["workers"]
+        self.auto_print = options["auto_print"]
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def submit(
+        self,
+        payload: Dict,
+        print_after: Optional[bool] = None,
+        on_done: Optional[Callable[[Future], None]] = None,
+    ) -> Future:
+        print_after = self.auto_print if print_after is None else print_after
+        self.start()
+        try:
+            future = self._executor.submit(render_receipt, payload, self.output_dir, print_after)
+        except BrokenProcessPool:
+            self.shutdown(wait=False)
+            self.start()
+            future = self._executor.submit(render_receipt, payload, self.output_dir, print_after)
+        if on_done is not None:
+            future.add_done_callback(on_done)
+        return future
+
+    def start(self) -> None:
+        """Create the pool ahead of the first sale; submit() does it otherwise"""
+        if self._executor is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self._executor = _pool(self.workers)
+            # Workers are only spawned for submitted work
+            self._executor.submit(_ready)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+class ReceiptService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_invoice(self, invoice_id: int) -> Optional[Invoice]:
+        return (
+            self.db.query(Invoice)
+            .options(selectinload(Invoice.items).selectinload(InvoiceItem.product))
+            .filter(Invoice.id == invoice_id)
+            .first()
+        )
+
+    def list_month_invoices(self, year: int, month: int) -> List[Invoice]:
+        start = datetime(year, month, 1)
+        end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+        return (
+            self.db.query(Invoice)
+            .options(selectinload(Invoice.items).selectinload(InvoiceItem.product))
+            .filter(Invoice.date >= start, Invoice.date < end)
+            .order_by(Invoice.id)
+            .all()
+        )
+
+    def render_month(
+        self,
+        year: int,
+        month: int,
+        output_dir: Optional[str] = None,
+        workers: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List[str]:
+        """Regenerate every receipt of a month using all cores"""
+        output_dir = output_dir or resolve_path(_receipt_options()["output_dir"])
+        os.makedirs(output_dir, exist_ok=True)
+
+        payloads = [receipt_payload(invoice) for invoice in self.list_month_invoices(year, month)]
+        if not payloads:
+            return []
+
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(payloads) // (workers * 4))
+        paths = []
+        with _pool(workers) as executor:
+            results = executor.map(
+                render_receipt, payloads, [output_dir] * len(payloads), chunksize=chunksize
+            )
+            for done, path in enumerate(results, start=1):
+                paths.append(path)
+                if progress:
+                    progress(done, len(payloads))
+        return paths
@@ -0,0 +1,659 @@
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import DateTime, and_, delete, func, insert, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from models.base import Base
+from models.category import Category
+from models.customer import Customer
+from models.invoice import Invoice
+from models.invoice_item import InvoiceItem
+from models.product import Product
+from models.replication import ChangeLog, ReplicationControl, ReplicationIdMap, ReplicationPeer, RowVersion
+from core.events import CategoryDeleted, CategoryUpdated, ProductDeleted, ProductUpdated, get_event_bus
+from core.logger import get_logger
+from core.settings import get_settings, resolve_path
+
+logger = get_logger(__name__)
+
+MASTER = "master"
+
+# Replicated tables, parents before children, with the tables their
+# foreign keys point to
+TABLES: Dict[str, Dict[str, str]] = OrderedDict([
+    (Category.__tablename__, {}),
+    (Customer.__tablename__, {}),
+    (Product.__tablename__, {"category_id": "categories"}),
+    (Invoice.__tablename__, {"customer_id": "customers"}),
+    (InvoiceItem.__tablename__, {"invoice_id": "invoices", "product_id": "products"}),
+])
+# Tills push everything but only pull the catalog: invoice ids are
+# allocated locally by each till's sales journal
+PULL_TABLES = ("categories", "customers", "products")
+# Columns that identify the same row created independently on two nodes
+NATURAL_KEYS = {"categories": "name", "products": "barcode"}
+# What pulled changes are announced as on the event bus, by (table, deleted)
+PULL_EVENTS = {
+    ("categories", False): CategoryUpdated,
+    ("categories", True): CategoryDeleted,
+    ("products", False): ProductUpdated,
+    ("products", True): ProductDeleted,
+}
+# Stock is exchanged as deltas, which add up whatever order they arrive in
+STOCK_TABLE, STOCK_COLUMN = "products", "quantity"
+
+_log = ChangeLog.__table__
+_control = ReplicationControl.__table__
+_peers = ReplicationPeer.__table__
+_versions = RowVersion.__table__
+_id_map = ReplicationIdMap.__table__
+
+
+def encode_batch(message: Dict) -> bytes:
+    return zlib.compress(json.dumps(message, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_batch(data: bytes) -> Dict:
+    return json.loads(zlib.decompress(data))
+
+
+def _columns(table: str) -> List[str]:
+    return [
+        column.name for column in Base.metadata.tables[table].columns
+        if column.name != "id" and (table, column.name) != (STOCK_TABLE, STOCK_COLUMN)
+    ]
+
+
+def _trigger_sql() -> Iterator[str]:
+    origin = "(SELECT origin FROM replication_control WHERE id = 1)"
+
+    def log(table, row, op):
+        return (
+            f"INSERT INTO change_log (table_name, row_id, op, origin) VALUES ('{table}', {row}.id, '{op}', {origin}); "
+            f"INSERT OR REPLACE INTO row_versions (table_name, row_id, version, origin) "
+            f"VALUES ('{table}', {row}.id, julianday('now'), {origin});"
+        )
+
+    # A new product's stock is logged as a delta from zero, right after its insert
+    stock_from_zero = (
+        f"INSERT INTO change_log (table_name, row_id, op, delta, origin) "
+        f"SELECT '{STOCK_TABLE}', NEW.id, 'S', NEW.{STOCK_COLUMN}, {origin} "
+        f"WHERE COALESCE(NEW.{STOCK_COLUMN}, 0) != 0;"
+    )
+
+    for table in TABLES:
+        changed = " OR ".join(f"NEW.{column} IS NOT OLD.{column}" for column in _columns(table))
+        on_insert = log(table, "NEW", "I") + (stock_from_zero if table == STOCK_TABLE else "")
+        yield f"CREATE TRIGGER IF NOT EXISTS repl_{table}_insert AFTER INSERT ON {table} BEGIN {on_insert} END"
+        yield (
+            f"CREATE TRIGGER IF NOT EXISTS repl_{table}_update AFTER UPDATE ON {table} "
+            f"WHEN {changed} BEGIN {log(table, 'NEW', 'U')} END"
+        )
+        yield f"CREATE TRIGGER IF NOT EXISTS repl_{table}_delete AFTER DELETE ON {table} BEGIN {log(table, 'OLD', 'D')} END"
+
+    yield (
+        f"CREATE TRIGGER IF NOT EXISTS repl_{STOCK_TABLE}_stock AFTER UPDATE OF {STOCK_COLUMN} ON {STOCK_TABLE} "
+        f"WHEN NEW.{STOCK_COLUMN} IS NOT OLD.{STOCK_COLUMN} BEGIN "
+        f"INSERT INTO change_log (table_name, row_id, op, delta, origin) "
+        f"VALUES ('{STOCK_TABLE}', NEW.id, 'S', COALESCE(NEW.{STOCK_COLUMN}, 0) - COALESCE(OLD.{STOCK_COLUMN}, 0), {origin}); "
+        f"END"
+    )
+
+
+def install(engine: Engine, node_id: str, seed: bool = False) -> None:
+    """
+    Add the change log tables and triggers to a database. With `seed`,
+    rows that already exist, and their stock, are logged as changes from
+    this node so peers receive them. Only the first node to join an empty
+    master seeds; a till set up from a copy of the same database would
+    send the same products again and have their stock counted twice.
+    """
+    tables = [_log, _control, _peers, _versions, _id_map]
+    Base.metadata.create_all(engine, tables=tables)
+
+    with engine.begin() as conn:
+        control = conn.execute(select(_control.c.node_id)).first()
+        if control is not None and control.node_id != node_id:
+            raise ValueError(f"Database belongs to replication node {control.node_id}")
+
+        for statement in _trigger_sql():
+            conn.exec_driver_sql(statement)
+        if control is not None:
+            return
+
+        conn.execute(insert(_control).values(id=1, node_id=node_id, origin=node_id))
+        if seed:
+            for table in TABLES:
+                conn.exec_driver_sql(
+                    f"INSERT INTO change_log (table_name, row_id, op, origin) "
+                    f"SELECT '{table}', id, 'I', ? FROM {table} ORDER BY id", (node_id,)
+                )
+                if table == STOCK_TABLE:
+                    conn.exec_driver_sql(
+                        f"INSERT INTO change_log (table_name, row_id, op, delta, origin) "
+                        f"SELECT '{table}', id, 'S', {STOCK_COLUMN}, ? FROM {table} "
+                        f"WHERE COALESCE({STOCK_COLUMN}, 0) != 0 ORDER BY id", (node_id,)
+                    )
+                # Version 0: any real change made since wins over the seeded row
+                conn.exec_driver_sql(
+                    f"INSERT OR REPLACE INTO row_versions (table_name, row_id, version, origin) "
+                    f"SELECT '{table}', id, 0, ? FROM {table}", (node_id,)
+                )
+
+
+def has_rows(engine: Engine) -> bool:
+    """Whether any replicated table of a database holds a row"""
+    with engine.connect() as conn:
+        return any(conn.exec_driver_sql(f"SELECT 1 FROM {table} LIMIT 1").first() for table in TABLES)
+
+
+class ReplicationNode:
+    """
+    One database taking part in replication. Reads its change log into
+    batches of changes and applies batches received from a peer.
+
+    Conflicts: row fields are last-writer-wins on (version, origin), where
+    the version is the time of the write on the node that made it. Stock
+    is never overwritten; every change to products.quantity travels as a
+    delta and is added on the other side, so concurrent sales on several
+    tills all count.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        with engine.connect() as conn:
+            control = conn.execute(select(_control.c.node_id)).first()
+        if control is None:
+            raise ValueError("Replication is not installed on this database")
+        self.node_id = control.node_id
+        # (peer, table, remote id) -> local id, while a batch is applied
+        self._ids: Optional[Dict[Tuple[str, str, int], Optional[int]]] = None
+
+    # Reading the change log
+
+    def collect(
+        self,
+        conn: Connection,
+        after: int,
+        limit: int,
+        only_origin: Optional[str] = None,
+        exclude_origin: Optional[str] = None,
+        tables: Optional[Tuple[str, ...]] = None,
+    ) -> Tuple[List[Dict], int, bool]:
+        """
+        Changes logged after `after`, coalesced per row. Returns the
+        changes, the seq they cover up to and whether more remain.
+        """
+        # Read first: entries committed while we read the batch belong to the next one
+        ceiling = conn.scalar(select(func.max(_log.c.seq))) or 0
+        conditions = [_log.c.seq > after, _log.c.seq <= ceiling]
+        if only_origin is not None:
+            conditions.append(_log.c.origin == only_origin)
+        if exclude_origin is not None:
+            conditions.append(_log.c.origin != exclude_origin)
+        if tables is not None:
+            conditions.append(_log.c.table_name.in_(tables))
+
+        entries = conn.execute(
+            select(_log).where(and_(*conditions)).order_by(_log.c.seq).limit(limit)
+        ).all()
+        more = len(entries) == limit
+        # Entries filtered out for this peer are covered as well
+        last = entries[-1].seq if more else max(after, ceiling)
+
+        groups: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        for entry in entries:
+            if entry.op == "S":
+                # Summed per origin, so each part is still credited to its node
+                key = ("S", entry.row_id, entry.origin)
+                group = groups.setdefault(key, {"delta": 0, "origin": entry.origin})
+                group["delta"] += entry.delta or 0
+                continue
+            key = (entry.table_name, entry.row_id)
+            group = groups.setdefault(key, {"ops": set()})
+            group["ops"].add(entry.op)
+            group["origin"] = entry.origin
+
+        row_keys = [key for key in groups if key[0] != "S"]
+        rows = self._current_rows(conn, row_keys)
+        versions = self._versions_of(conn, row_keys)
+        changes = []
+        for key, group in groups.items():
+            if key[0] == "S":
+                if group["delta"]:
+                    changes.append({
+                        "table": STOCK_TABLE, "id": key[1], "op": "S",
+                        "delta": group["delta"], "origin": group["origin"],
+                    })
+                continue
+
+            table, row_id = key
+            row = rows.get(key)
+            if row is None:
+                if "I" in group["ops"]:
+                    # Created and deleted again within the batch
+                    continue
+                op = "D"
+            else:
+                op = "I" if "I" in group["ops"] else "U"
+
+            change = {
+                "table": table, "id": row_id, "op": op, "origin": group["origin"],
+                "version": versions.get(key, [0, group["origin"]]),
+            }
+            if row is not None:
+                change["row"] = row
+            changes.append(change)
+        return changes, last, more
+
+    def _versions_of(self, conn: Connection, keys: List[Tuple[str, int]]) -> Dict[Tuple[str, int], List]:
+        by_table: Dict[str, List[int]] = {}
+        for table, row_id in keys:
+            by_table.setdefault(table, []).append(row_id)
+
+        versions = {}
+        for table, ids in by_table.items():
+            for start in range(0, len(ids), 500):
+                rows = conn.execute(
+                    select(_versions.c.row_id, _versions.c.version, _versions.c.origin).where(
+                        _versions.c.table_name == table, _versions.c.row_id.in_(ids[start:start + 500])
+                    )
+                )
+                for row_id, version, origin in rows:
+                    versions[(table, row_id)] = [version, origin]
+        return versions
+
+    def _current_rows(self, conn: Connection, keys: List[Tuple[str, int]]) -> Dict[Tuple[str, int], Dict]:
+        by_table: Dict[str, List[int]] = {}
+        for table, row_id in keys:
+            by_table.setdefault(table, []).append(row_id)
+
+        rows = {}
+        for table, ids in by_table.items():
+            source = Base.metadata.tables[table]
+            for start in range(0, len(ids), 500):
+                for row in conn.execute(select(source).where(source.c.id.in_(ids[start:start + 500]))):
+                    # Stock only travels as deltas
+                    rows[(table, row.id)] = {
+                        name: _to_json(value) for name, value in row._mapping.items()
+                        if name != "id" and (table, name) != (STOCK_TABLE, STOCK_COLUMN)
+                    }
+        return rows
+
+    # Applying a peer's changes
+
+    def apply(self, conn: Connection, peer: str, changes: List[Dict]) -> List[List]:
+        """
+        Apply a batch from `peer`. Returns [table, peer id, local id] for
+        every row the batch created or matched here.
+        """
+        created = []
+        origin = self.node_id
+        self._ids = {}
+        by_table: Dict[str, List[int]] = {}
+        for change in changes:
+            by_table.setdefault(change["table"], []).append(change["id"])
+        for table, remote_ids in by_table.items():
+            self._preload_ids(conn, peer, table, remote_ids)
+
+        for change in changes:
+            if change["origin"] != origin:
+                origin = change["origin"]
+                # Triggers log the applied change as made on its origin node
+                conn.execute(update(_control).values(origin=origin))
+
+            table = change["table"]
+            if change["op"] == "S":
+                self._apply_stock(conn, peer, change)
+            elif change["op"] == "D":
+                self._apply_delete(conn, peer, change)
+            else:
+                local_id = self._apply_row(conn, peer, change)
+                created.append([table, change["id"], local_id])
+
+        if origin != self.node_id:
+            conn.execute(update(_control).values(origin=self.node_id))
+        self._ids = None
+        return created
+
+    def _apply_row(self, conn: Connection, peer: str, change: Dict) -> int:
+        table = change["table"]
+        source = Base.metadata.tables[table]
+        values = {name: _from_json(source.c[name], value) for name, value in change["row"].items()}
+        for column, parent in TABLES[table].items():
+            if values.get(column) is not None:
+                values[column] = self.local_id(conn, peer, parent, values[column])
+
+        local_id = self._mapped_id(conn, peer, table, change["id"])
+        if local_id is None and table in NATURAL_KEYS and values.get(NATURAL_KEYS[table]) is not None:
+            key = NATURAL_KEYS[table]
+            local_id = conn.scalar(select(source.c.id).where(source.c[key] == values[key]))
+            if local_id is not None:
+                self._map(conn, peer, table, change["id"], local_id)
+
+        version = tuple(change["version"])
+        if local_id is None:
+            # Keep the peer's id when it is free here
+            if conn.scalar(select(source.c.id).where(source.c.id == change["id"])) is None:
+                values["id"] = change["id"]
+            local_id = conn.execute(insert(source).values(**values)).inserted_primary_key[0]
+            self._map(conn, peer, table, change["id"], local_id)
+        elif self._wins(conn, table, local_id, version):
+            conn.execute(update(source).where(source.c.id == local_id).values(**values))
+        else:
+            return local_id
+
+        self._set_version(conn, table, local_id, version)
+        return local_id
+
+    def _apply_delete(self, conn: Connection, peer: str, change: Dict) -> None:
+        table = change["table"]
+        local_id = self._mapped_id(conn, peer, table, change["id"])
+        version = tuple(change["version"])
+        if local_id is None or not self._wins(conn, table, local_id, version):
+            return
+        source = Base.metadata.tables[table]
+        conn.execute(delete(source).where(source.c.id == local_id))
+        self._set_version(conn, table, local_id, version)
+
+    def _apply_stock(self, conn: Connection, peer: str, change: Dict) -> None:
+        source = Base.metadata.tables[STOCK_TABLE]
+        local_id = self.local_id(conn, peer, STOCK_TABLE, change["id"])
+        column = source.c[STOCK_COLUMN]
+        conn.execute(
+            update(source).where(source.c.id == local_id)
+            .values({STOCK_COLUMN: func.coalesce(column, 0) + change["delta"]})
+        )
+
+    def _wins(self, conn: Connection, table: str, local_id: int, version: Tuple) -> bool:
+        current = conn.execute(
+            select(_versions.c.version, _versions.c.origin)
+            .where(_versions.c.table_name == table, _versions.c.row_id == local_id)
+        ).first()
+        return current is None or version > (current.version, current.origin)
+
+    def _set_version(self, conn: Connection, table: str, local_id: int, version: Tuple) -> None:
+        conn.execute(
+            _versions.insert().prefix_with("OR REPLACE").values(
+                table_name=table, row_id=local_id, version=version[0], origin=version[1]
+            )
+        )
+
+    # Id map
+
+    def local_id(self, conn: Connection, peer: str, table: str, remote_id: int) -> int:
+        """The peer's id translated to ours; unmapped ids are taken as the same row"""
+        local_id = self._mapped_id(conn, peer, table, remote_id)
+        return remote_id if local_id is None else local_id
+
+    def _mapped_id(self, conn: Connection, peer: str, table: str, remote_id: int) -> Optional[int]:
+        key = (peer, table, remote_id)
+        if self._ids is not None and key in self._ids:
+            return self._ids[key]
+        local_id = conn.scalar(
+            select(_id_map.c.local_id).where(
+                _id_map.c.peer == peer, _id_map.c.table_name == table, _id_map.c.remote_id == remote_id
+            )
+        )
+        if self._ids is not None:
+            self._ids[key] = local_id
+        return local_id
+
+    def _preload_ids(self, conn: Connection, peer: str, table: str, remote_ids: List[int]) -> None:
+        """Fill the id cache for a whole batch with one query per 500 ids"""
+        for remote_id in remote_ids:
+            self._ids[(peer, table, remote_id)] = None
+        for start in range(0, len(remote_ids), 500):
+            rows = conn.execute(
+                select(_id_map.c.remote_id, _id_map.c.local_id).where(
+                    _id_map.c.peer == peer, _id_map.c.table_name == table,
+                    _id_map.c.remote_id.in_(remote_ids[start:start + 500]),
+                )
+            )
+            for remote_id, local_id in rows:
+                self._ids[(peer, table, remote_id)] = local_id
+
+    def _map(self, conn: Connection, peer: str, table: str, remote_id: int, local_id: int) -> None:
+        conn.execute(
+            _id_map.insert().prefix_with("OR REPLACE").values(
+                peer=peer, table_name=table, remote_id=remote_id, local_id=local_id
+            )
+        )
+        if self._ids is not None:
+            self._ids[(peer, table, remote_id)] = local_id
+
+    # Watermarks
+
+    def watermarks(self, conn: Connection, peer: str) -> Tuple[int, int]:
+        row = conn.execute(select(_peers).where(_peers.c.peer == peer)).first()
+        if row is None:
+            conn.execute(insert(_peers).values(peer=peer, sent_seq=0, received_seq=0))
+            return 0, 0
+        return row.sent_seq, row.received_seq
+
+    def set_watermark(self, conn: Connection, peer: str, **values) -> None:
+        self.watermarks(conn, peer)
+        conn.execute(update(_peers).where(_peers.c.peer == peer).values(**values))
+
+    # Master side
+
+    def handle_bytes(self, data: bytes) -> bytes:
+        return encode_batch(self.handle(decode_batch(data)))
+
+    def handle(self, message: Dict) -> Dict:
+        peer = message["node"]
+        with self.engine.begin() as conn:
+            if message["type"] == "push":
+                return self._receive_push(conn, peer, message)
+            if message["type"] == "pull":
+                # The peer asks for what follows what it has applied
+                self.set_watermark(conn, peer, sent_seq=message["after"])
+                changes, last, more = self.collect(
+                    conn, message["after"], message["limit"], exclude_origin=peer, tables=PULL_TABLES
+                )
+                if not more:
+                    # The last pull of a till's sync; what every till has is no longer needed
+                    self.prune_served(conn)
+                return {"changes": changes, "last": last, "more": more}
+        raise ValueError(f"Unknown replication message: {message['type']}")
+
+    def _receive_push(self, conn: Connection, peer: str, message: Dict) -> Dict:
+        _, received = self.watermarks(conn, peer)
+        if message["last"] <= received:
+            # A retry of a batch whose ack was lost
+            ids = [
+                [change["table"], change["id"], self._mapped_id(conn, peer, change["table"], change["id"])]
+                for change in message["changes"] if change["op"] in ("I", "U")
+            ]
+            return {"acked": received, "ids": [entry for entry in ids if entry[2] is not None]}
+        if message["after"] != received:
+            raise ValueError(f"Batch from {peer} starts at {message['after']}, expected {received}")
+
+        ids = self.apply(conn, peer, message["changes"])
+        self.set_watermark(conn, peer, received_seq=message["last"])
+        return {"acked": message["last"], "ids": ids}
+
+    def prune_served(self, conn: Connection) -> int:
+        """Drop log entries every known peer has pulled"""
+        low = conn.scalar(select(func.min(_peers.c.sent_seq)))
+        if not low:
+            return 0
+        return conn.execute(delete(_log).where(_log.c.seq <= low)).rowcount
+
+
+class LocalTransport:
+    """Stand-in for the network: hands encoded batches to a master node in this process"""
+
+    def __init__(self, master: ReplicationNode):
+        self.master = master
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def send(self, data: bytes) -> bytes:
+        self.bytes_sent += len(data)
+        response = self.master.handle_bytes(data)
+        self.bytes_received += len(response)
+        return response
+
+
+class ReplicationService:
+    """
+    Till side of replication: pushes the till's own changes to the store
+    master and pulls catalog and stock changes made elsewhere. Each batch
+    moves a watermark in the same transaction that applies it, so an
+    interrupted sync resumes where it stopped.
+    """
+
+    def __init__(self, node: ReplicationNode, transport, batch_size: int = 500):
+        self.node = node
+        self.transport = transport
+        self.batch_size = batch_size
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def sync(self) -> Dict[str, int]:
+        pushed = pulled = 0
+        more = True
+        while more:
+            count, more = self.push()
+            pushed += count
+        more = True
+        while more:
+            count, more = self.pull()
+            pulled += count
+        self.prune()
+        return {"pushed": pushed, "pulled": pulled}
+
+    def push(self) -> Tuple[int, bool]:
+        with self.node.engine.begin() as conn:
+            sent, _ = self.node.watermarks(conn, MASTER)
+            changes, last, more = self.node.collect(
+                conn, sent, self.batch_size, only_origin=self.node.node_id
+            )
+        if last == sent:
+            return 0, False
+
+        response = decode_batch(self.transport.send(encode_batch({
+            "type": "push", "node": self.node.node_id, "after": sent, "last": last, "changes": changes,
+        })))
+        with self.node.engine.begin() as conn:
+            for table, local_id, master_id in response["ids"]:
+                self.node._map(conn, MASTER, table, master_id, local_id)
+            self.node.set_watermark(conn, MASTER, sent_seq=response["acked"])
+        return len(changes), more
+
+    def pull(self) -> Tuple[int, bool]:
+        with self.node.engine.connect() as conn:
+            _, received = self.node.watermarks(conn, MASTER)
+            conn.commit()
+        response = decode_batch(self.transport.send(encode_batch({
+            "type": "pull", "node": self.node.node_id, "after": received, "limit": self.batch_size,
+        })))
+        with self.node.engine.begin() as conn:
+            applied = self.node.apply(conn, MASTER, response["changes"])
+            self.node.set_watermark(conn, MASTER, received_seq=response["last"])
+            local_ids = {(table, remote_id): local_id for table, remote_id, local_id in applied}
+            events = []
+            for change in response["changes"]:
+                event_type = PULL_EVENTS.get((change["table"], change["op"] == "D"))
+                if event_type is None:
+                    continue
+                key = (change["table"], change["id"])
+                if key not in local_ids:
+                    # Stock deltas and deletes
+                    local_ids[key] = self.node.local_id(conn, MASTER, *key)
+                events.append(event_type(local_ids[key]))
+
+        bus = get_event_bus()
+        with bus.batch():
+            for event in events:
+                bus.publish(event)
+        return len(response["changes"]), response["more"]
+
+    def prune(self) -> int:
+        """Drop pushed entries and entries that came from elsewhere; a till serves no one"""
+        with self.node.engine.begin() as conn:
+            sent, _ = self.node.watermarks(conn, MASTER)
+            return conn.execute(
+                delete(_log).where((_log.c.seq <= sent) | (_log.c.origin != self.node.node_id))
+            ).rowcount
+
+    def start(self, interval_ms: int) -> None:
+        """Sync on a background thread every `interval_ms`"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval_ms / 1000,), name="replication", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.is_set():
+            try:
+                stats = self.sync()
+                if stats["pushed"] or stats["pulled"]:
+                    logger.info("Replication: pushed %(pushed)d, pulled %(pulled)d changes", stats)
+            except Exception:
+                logger.exception("Replication sync failed")
+            self._stop.wait(interval)
+
+
+def _to_json(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.name
+    return value
+
+
+def _from_json(column, value):
+    if value is not None and isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    return value
+
+
+_service: Optional[ReplicationService] = None
+
+
+def start_from_settings(engine: Engine) -> Optional[ReplicationService]:
+    """Replicate with the master database named in settings, if enabled"""
+    global _service
+    options = get_settings()["replication"]
+    if not options["enabled"] or _service is not None:
+        return _service
+
+    from data.database import create_db_engine
+
+    # Both the till and the sync thread write to the master: WAL and busy_timeout as the app's own
+    master_engine = create_db_engine(resolve_path(options["master_path"]))
+    Base.metadata.create_all(master_engine)
+    install(master_engine, MASTER)
+    seed = options["seed"]
+    if seed and has_rows(master_engine):
+        logger.warning("Not seeding from %s: the master already has data", options["node_id"])
+        seed = False
+    install(engine, options["node_id"], seed=seed)
+
+    _service = ReplicationService(
+        ReplicationNode(engine), LocalTransport(ReplicationNode(master_engine)), options["batch_size"]
+    )
+    _service.start(options["interval_ms"])
+    return _service
+
+
+def stop_replication() -> None:
+    global _service
+    if _service is not None:
+        _service.stop()
+        _service = None
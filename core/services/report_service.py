@@ -1,11 +1,14 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Dict, List, Optional
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 
+from models.invoice import Invoice
 from core.repositories.invoice_repository import InvoiceRepository
 from core.repositories.invoice_item_repository import InvoiceItemRepository
 from core.repositories.product_repository import ProductRepository
+from core.services.archive_service import InvoiceArchive
 
 class ReportService:
     def __init__(self, db: Session):
@@ -13,13 +16,25 @@ class ReportService:
         self.invoice_repo= InvoiceRepository(db)
         self.invoice_item_repo= InvoiceItemRepository(db)
         self.product_repo= ProductRepository(db)
+        self.archive= InvoiceArchive(db)
+
+    def _invoices_between(self, start: date, end: date)->List[Invoice]:
+        """Invoices dated from `start` to `end` inclusive, from the archive too if the range reaches it"""
+        start_at= datetime.combine(start, time.min)
+        end_before= datetime.combine(end + timedelta(days=1), time.min)
+        statement= self.archive.span(
+            lambda invoices, items: select(invoices).where(invoices.c.date >= start_at, invoices.c.date < end_before),
+            start_at,
+            end_before,
+        )
+        return self.db.scalars(select(Invoice).from_statement(statement)).all()
 
     def get_daily_sales_report(self, target_date: Optional[date]= None)->Dict:
         if target_date is None:
             target_date= date.today()
         
         try:
-            invoices= self.invoice_repo.list_by_date_range(target_date, target_date)
+            invoices= self._invoices_between(target_date, target_date)
 
             total_sales= sum(getattr(inv, "total", 0) for inv in invoices)
             total_invoices= len(invoices)
@@ -51,7 +66,7 @@ class ReportService:
                 else date(year, month + 1, 1) - timedelta(days=1)
             )
 
-            invoices= self.invoice_repo.list_by_date_range(start_date, end_date)
+            invoices= self._invoices_between(start_date, end_date)
 
             total_sales= sum(getattr(inv, "total", 0) for inv in invoices)
             total_invoices= len(invoices)
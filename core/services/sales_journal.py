@@ -0,0 +1,388 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, insert, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from data.journal import Journal
+from enums.invoice_status_enum import InvoiceStatus
+from models.invoice import Invoice
+from models.invoice_item import InvoiceItem
+from models.journal_checkpoint import JournalCheckpoint
+from models.product import Product
+from core.events import InvoiceCreated, StockChanged, get_event_bus
+from core.logger import get_logger
+from core.services.id_allocator import IdAllocator
+from core.settings import get_settings, resolve_path
+
+logger = get_logger(__name__)
+
+CHECKPOINT_NAME = "sales"
+# Failures of one sale, other than the database being unavailable, before
+# it is moved aside so the sales after it can go in
+MAX_ATTEMPTS = 5
+
+
+class SalesJournal:
+    """
+    Durable sales journal in front of the invoices table.
+
+    record_sale() appends the sale to the journal file and returns once it
+    is fsynced; from then on the sale is committed. A background applier
+    writes journaled sales into SQLite in batches, and moves the
+    checkpoint in the same transaction, so every sale is applied exactly
+    once. open() replays whatever a previous run journaled but did not
+    apply.
+
+    Invoice ids come from the invoices id sequence, so sales journaled by
+    another till on the same database, or written without the journal,
+    never take an id a journaled sale was given. A sale the database
+    refuses anyway is moved aside to `<path>.rejected` with a logged
+    error rather than holding up every sale after it.
+    """
+
+    def __init__(
+        self,
+        bind: Engine,
+        path: str,
+        fsync: bool = True,
+        batch_size: int = 200,
+        apply_delay_ms: int = 50,
+        retry_ms: int = 1000,
+        compact_bytes: int = 1 << 20,
+        id_block_size: int = 100,
+    ):
+        self.session_factory = sessionmaker(bind=bind, autoflush=False)
+        self.invoice_ids = IdAllocator(bind, Invoice.__table__, id_block_size)
+        self.path = path
+        self.fsync = fsync
+        self.batch_size = batch_size
+        self.apply_delay = apply_delay_ms / 1000
+        self.retry = retry_ms / 1000
+        self.compact_bytes = compact_bytes
+
+        self.journal: Optional[Journal] = None
+        self.applied_seq = 0
+        self._failures = (0, 0) # seq of the first unapplied sale, attempts at it
+        self._pending: Dict[int, Dict] = {} # seq -> journaled, not yet applied
+        self._pending_stock: Dict[int, int] = {} # product_id -> quantity
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_settings(cls, bind: Engine) -> "SalesJournal":
+        options = get_settings()["journal"]
+        return cls(
+            bind,
+            resolve_path(options["path"]),
+            fsync=options["fsync"],
+            batch_size=options["batch_size"],
+            apply_delay_ms=options["apply_delay_ms"],
+            retry_ms=options["retry_ms"],
+            compact_bytes=options["compact_bytes"],
+            id_block_size=options["id_block_size"],
+        )
+
+    def open(self) -> int:
+        """Recover unapplied sales and start the applier; returns how many were replayed"""
+        with self.session_factory() as db:
+            checkpoint = db.get(JournalCheckpoint, CHECKPOINT_NAME)
+            self.applied_seq = checkpoint.applied_seq if checkpoint else 0
+
+        self.journal = Journal(self.path, fsync=self.fsync, start_seq=self.applied_seq)
+        unapplied = [record for record in self.journal.recovered if record["seq"] > self.applied_seq]
+        self.journal.recovered = []
+        if unapplied:
+            logger.warning("Replaying %d journaled sales", len(unapplied))
+            for record in unapplied:
+                self._add_pending(record)
+            try:
+                while self._apply_next_batch():
+                    pass
+            except Exception:
+                # The till can still sell; the applier keeps retrying
+                logger.exception("Replaying journaled sales failed; retrying in the background")
+                self._wake.set()
+        self._compact()
+
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="sales-journal", daemon=True)
+        self._thread.start()
+        return len(unapplied)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Apply what is pending, then stop; anything left is replayed by the next open()"""
+        if self._thread is not None:
+            self._stopping = True
+            self._wake.set()
+            self._thread.join(timeout)
+            self._thread = None
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def record_sale(self, lines: List[Dict], status: InvoiceStatus = InvoiceStatus.PAID) -> Dict:
+        """
+        Journal a sale of [{'product_id', 'name', 'quantity', 'unit_price'}, ...].
+        Returns the journal record, which carries the invoice id the sale
+        will have in the database.
+        """
+        if not lines:
+            raise ValueError("Invoice must contain at least one product")
+        if self.journal is None:
+            raise ValueError("Sales journal is not open")
+
+        items = []
+        for line in lines:
+            if line["quantity"] <= 0:
+                raise ValueError(f"Quantity for {line['name']} must be greater than 0")
+            items.append({
+                "product_id": line["product_id"],
+                "name": line["name"],
+                "quantity": line["quantity"],
+                "unit_price": line["unit_price"],
+                "total_price": line["unit_price"] * line["quantity"],
+            })
+
+        record = {
+            "id": self.invoice_ids.next(),
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "status": status.value,
+            "total_amount": sum(item["total_price"] for item in items),
+            "items": items,
+        }
+        try:
+            self.journal.append(record)
+        except OSError as e:
+            raise ValueError(f"Could not record sale: {str(e)}")
+
+        self._add_pending(record)
+        self._wake.set()
+        return record
+
+    def pending_quantity(self, product_id: int) -> int:
+        """Stock sold but not yet taken off the products table"""
+        return self._pending_stock.get(product_id, 0)
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _add_pending(self, record: Dict) -> None:
+        with self._lock:
+            self._pending[record["seq"]] = record
+            for item in record["items"]:
+                product_id = item["product_id"]
+                self._pending_stock[product_id] = self._pending_stock.get(product_id, 0) + item["quantity"]
+
+    def _next_batch(self) -> List[Dict]:
+        # Only consecutive seqs: a concurrent sale may still be in fsync
+        with self._lock:
+            batch = []
+            seq = self.applied_seq + 1
+            while seq in self._pending and len(batch) < self.batch_size:
+                batch.append(self._pending[seq])
+                seq += 1
+            return batch
+
+    def _apply_next_batch(self) -> bool:
+        batch = self._next_batch()
+        if not batch:
+            return False
+
+        try:
+            self._commit(batch)
+        except OperationalError:
+            # The database is locked or unavailable; no fault of the sales
+            raise
+        except Exception:
+            # One bad sale fails its whole batch: apply them one by one to find it
+            for record in batch:
+                self._commit_alone(record)
+        return True
+
+    def _commit_alone(self, record: Dict) -> None:
+        try:
+            self._commit([record])
+        except OperationalError:
+            raise
+        except Exception as e:
+            # A conflict fails the same way every time; anything else gets a few tries
+            if isinstance(e, IntegrityError) or self._count_failure(record) >= MAX_ATTEMPTS:
+                self._reject(record, e)
+            else:
+                raise
+
+    def _count_failure(self, record: Dict) -> int:
+        seq, attempts = self._failures
+        attempts = attempts + 1 if seq == record["seq"] else 1
+        self._failures = (record["seq"], attempts)
+        return attempts
+
+    def _commit(self, batch: List[Dict]) -> None:
+        with self.session_factory() as db:
+            try:
+                sold = self._apply(db, batch)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            stock = dict(db.execute(select(Product.id, Product.quantity).where(Product.id.in_(sold))).all())
+        self._forget(batch)
+
+        events = get_event_bus()
+        with events.batch():
+            for record in batch:
+                events.publish(InvoiceCreated(record["id"], record["total_amount"], datetime.fromisoformat(record["date"])))
+            for product_id, quantity in stock.items():
+                events.publish(StockChanged(product_id, quantity, quantity + sold[product_id]))
+
+    def _reject(self, record: Dict, error: Exception) -> None:
+        """Move a sale the database refuses out of the way of the ones after it"""
+        with open(self.path + ".rejected", "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "rejected_at": datetime.now().isoformat(timespec="seconds"),
+                "error": str(error),
+                "record": record,
+            }) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        with self.session_factory() as db:
+            self._set_checkpoint(db, record["seq"])
+            db.commit()
+        self._forget([record])
+        logger.error(
+            "Journaled sale %d (invoice #%d) could not be applied and was moved to %s.rejected: %s",
+            record["seq"], record["id"], self.path, error,
+        )
+
+    def _forget(self, batch: List[Dict]) -> None:
+        """Drop applied or rejected sales from the pending ones"""
+        with self._lock:
+            for record in batch:
+                del self._pending[record["seq"]]
+                for item in record["items"]:
+                    product_id = item["product_id"]
+                    left = self._pending_stock[product_id] - item["quantity"]
+                    if left:
+                        self._pending_stock[product_id] = left
+                    else:
+                        del self._pending_stock[product_id]
+            self.applied_seq = batch[-1]["seq"]
+
+    def _apply(self, db: Session, batch: List[Dict]) -> Dict[int, int]:
+        """Write a batch; returns the quantity sold per product"""
+        invoices = []
+        items = []
+        sold: Dict[int, int] = {}
+        for record in batch:
+            invoices.append({
+                "id": record["id"],
+                "customer_id": None,
+                "date": datetime.fromisoformat(record["date"]),
+                "status": InvoiceStatus(record["status"]),
+                "total_amount": record["total_amount"],
+            })
+            for item in record["items"]:
+                items.append({
+                    "invoice_id": record["id"],
+                    "product_id": item["product_id"],
+                    "quantity": item["quantity"],
+                    "unit_price": item["unit_price"],
+                    "total_price": item["total_price"],
+                })
+                sold[item["product_id"]] = sold.get(item["product_id"], 0) + item["quantity"]
+
+        db.execute(insert(Invoice), invoices)
+        db.execute(insert(InvoiceItem), items)
+
+        # The sale already happened at the till, so stock is taken off even
+        # if someone edited it down in the meantime
+        products = Product.__table__
+        db.execute(
+            update(products)
+            .where(products.c.id == bindparam("product_id"))
+            .values(quantity=products.c.quantity - bindparam("sold")),
+            [{"product_id": product_id, "sold": quantity} for product_id, quantity in sold.items()],
+        )
+
+        self._set_checkpoint(db, batch[-1]["seq"])
+        return sold
+
+    def _set_checkpoint(self, db: Session, seq: int) -> None:
+        checkpoint = db.get(JournalCheckpoint, CHECKPOINT_NAME)
+        if checkpoint is None:
+            db.add(JournalCheckpoint(name=CHECKPOINT_NAME, applied_seq=seq))
+        else:
+            checkpoint.applied_seq = seq
+
+    def _compact(self) -> None:
+        """Empty the journal file once the sales applied so far are on disk"""
+        seq = self.applied_seq
+        # With synchronous=NORMAL the last commits may only be in the WAL,
+        # which is not synced until a checkpoint copies it into the database
+        try:
+            with self.session_factory() as db:
+                busy, _, _ = db.execute(text("PRAGMA wal_checkpoint(FULL)")).one()
+        except OperationalError:
+            logger.warning("Checkpointing the database failed; keeping the journal", exc_info=True)
+            return
+        if busy:
+            # A reader held the WAL; the next compaction tries again
+            return
+        self.journal.compact(seq)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if not self._stopping:
+                # Let a burst of sales pile up into one transaction
+                time.sleep(self.apply_delay)
+
+            try:
+                while self._apply_next_batch():
+                    pass
+            except Exception:
+                logger.exception("Applying journaled sales failed; retrying in %.1fs", self.retry)
+                if self._stopping:
+                    return
+                self._wake.wait(self.retry)
+                self._wake.set()
+                continue
+
+            if self.journal is not None and self.journal.size() >= self.compact_bytes:
+                self._compact()
+
+            if self._stopping:
+                return
+
+
+_journal: Optional[SalesJournal] = None
+
+
+def get_sales_journal(bind: Optional[Engine] = None) -> SalesJournal:
+    """The process-wide journal, recovered and started on first use"""
+    global _journal
+    if _journal is None:
+        if bind is None:
+            from data.database import engine
+            bind = engine
+        journal = SalesJournal.from_settings(bind)
+        journal.open()
+        _journal = journal
+    return _journal
+
+
+def close_sales_journal() -> None:
+    global _journal
+    if _journal is not None:
+        _journal.close()
+        _journal = None
@@ -0,0 +1,277 @@
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from enums.stocktake_status_enum import StocktakeStatus
+from models.product import Product
+from models.stocktake import Stocktake, StocktakeCount
+from core.events import ProductsAdjusted, get_event_bus
+from core.services.user_import_service import ImportReport
+from core.utils import read_table
+
+Progress = Callable[[int, int], None] # products staged, total
+
+_products = Product.__table__
+_counts = StocktakeCount.__table__
+# Keeps IN (...) lists well under SQLite's bound parameter limit, and each
+# staging transaction short enough not to hold up the sales journal
+CHUNK = 500
+
+
+@dataclass(frozen=True)
+class Variance:
+    product_id: int
+    name: str
+    barcode: str
+    expected: int
+    counted: int
+    approved: bool
+
+    @property
+    def difference(self) -> int:
+        return self.counted - self.expected
+
+
+@dataclass(frozen=True)
+class StocktakeSummary:
+    counted: int = 0 # products counted
+    variances: int = 0 # of which differ from the system
+    units: int = 0 # net units over (+) or short (-)
+    value: int = 0 # net units at today's prices
+    uncounted: int = 0 # products not counted at all
+
+
+class StocktakeService:
+    """
+    A stock count that runs alongside sales. Scans and imported counts are
+    staged in stocktake_counts with the system stock at the moment each
+    product was first counted. Variances are computed in SQL, and applying
+    the approved ones is one UPDATE ... FROM in one transaction that adds
+    each variance to the current stock, so sales made during the count
+    are kept.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.events = get_event_bus()
+
+    def current(self) -> Optional[Stocktake]:
+        return self.db.scalars(
+            select(Stocktake).where(Stocktake.status == StocktakeStatus.OPEN).order_by(Stocktake.id.desc())
+        ).first()
+
+    def start(self, note: str = "") -> Stocktake:
+        try:
+            if self.current() is not None:
+                raise ValueError("A stocktake is already in progress")
+            stocktake = Stocktake(note=note or None)
+            self.db.add(stocktake)
+            self.db.commit()
+            return stocktake
+        except ValueError:
+            self.db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
+    def cancel(self, stocktake_id: int) -> None:
+        """Close without touching stock; the counts are dropped"""
+        try:
+            stocktake = self._open(stocktake_id)
+            self.db.execute(_counts.delete().where(_counts.c.stocktake_id == stocktake_id))
+            stocktake.status = StocktakeStatus.CANCELLED
+            stocktake.closed_at = datetime.now()
+            self.db.commit()
+        except ValueError:
+            self.db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
+    def record_scans(self, stocktake_id: int, barcodes: Iterable[str]) -> List[str]:
+        """Count one unit per scan; returns the barcodes no product has"""
+        scans = Counter(barcode for barcode in barcodes if barcode)
+        unknown = self._stage(stocktake_id, scans, add=True)
+        return sorted(unknown)
+
+    def import_counts(self, stocktake_id: int, path: str, progress: Optional[Progress] = None) -> ImportReport:
+        """
+        Set counts from a CSV/XLSX file with the columns barcode and count
+        (or quantity). Lines for the same barcode, e.g. from two shelves,
+        are added up; the total replaces what was counted before and is
+        compared with the stock at the time of the import.
+        """
+        self._open(stocktake_id)
+        report = ImportReport()
+        counts: Dict[str, int] = {}
+        rows: Dict[str, int] = {}
+        for number, values in read_table(path):
+            barcode = values.get("barcode", "")
+            count = values.get("count") or values.get("quantity") or ""
+            try:
+                if not barcode:
+                    raise ValueError("Barcode is required")
+                if not count.lstrip("-").isdigit():
+                    raise ValueError("Count must be a whole number")
+                if int(count) < 0:
+                    raise ValueError("Count cannot be negative")
+            except ValueError as e:
+                report.errors.append((number, str(e)))
+                continue
+            counts[barcode] = counts.get(barcode, 0) + int(count)
+            rows.setdefault(barcode, number)
+
+        unknown = self._stage(stocktake_id, counts, add=False, progress=progress)
+        report.errors.extend((rows[barcode], f"No product with barcode {barcode}") for barcode in unknown)
+        report.errors.sort()
+        report.created = len(counts) - len(unknown)
+        return report
+
+    def _stage(
+        self,
+        stocktake_id: int,
+        counts: Dict[str, int],
+        add: bool,
+        progress: Optional[Progress] = None,
+    ) -> List[str]:
+        """Write counts by barcode to the staging table, a chunk per transaction"""
+        self._open(stocktake_id)
+        statement = insert(_counts)
+        if add:
+            # Added scans keep `expected` from the first count they add to
+            updates = {"counted": _counts.c.counted + statement.excluded.counted}
+        else:
+            # A replaced count is a new count: compare it with the stock as it is now,
+            # or sales since the first count would show up as a shortage
+            updates = {"counted": statement.excluded.counted, "expected": statement.excluded.expected}
+        statement = statement.on_conflict_do_update(
+            index_elements=[_counts.c.stocktake_id, _counts.c.product_id], set_=updates
+        )
+
+        barcodes = list(counts)
+        unknown = []
+        for start in range(0, len(barcodes), CHUNK):
+            chunk = barcodes[start:start + CHUNK]
+            found = {
+                barcode: (product_id, quantity)
+                for barcode, product_id, quantity in self.db.execute(
+                    select(_products.c.barcode, _products.c.id, _products.c.quantity)
+                    .where(_products.c.barcode.in_(chunk))
+                )
+            }
+            unknown.extend(barcode for barcode in chunk if barcode not in found)
+            if found:
+                try:
+                    self.db.execute(statement, [
+                        {
+                            "stocktake_id": stocktake_id,
+                            "product_id": product_id,
+                            "counted": counts[barcode],
+                            "expected": quantity,
+                            "approved": True,
+                        }
+                        for barcode, (product_id, quantity) in found.items()
+                    ])
+                    self.db.commit()
+                except SQLAlchemyError as e:
+                    self.db.rollback()
+                    raise ValueError(f"Database error: {str(e)}")
+            if progress:
+                progress(min(start + CHUNK, len(barcodes)), len(barcodes))
+        return unknown
+
+    def summary(self, stocktake_id: int) -> StocktakeSummary:
+        difference = _counts.c.counted - _counts.c.expected
+        counted, variances, units, value = self.db.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(case((difference != 0, 1), else_=0)), 0),
+                func.coalesce(func.sum(difference), 0),
+                func.coalesce(func.sum(difference * _products.c.price), 0),
+            )
+            .select_from(_counts.join(_products, _products.c.id == _counts.c.product_id))
+            .where(_counts.c.stocktake_id == stocktake_id)
+        ).one()
+        total = self.db.execute(select(func.count()).select_from(_products)).scalar()
+        return StocktakeSummary(counted, variances, units, value, total - counted)
+
+    def variances(self, stocktake_id: int, limit: Optional[int] = 200) -> List[Variance]:
+        """Counted products that differ from the system, biggest differences first"""
+        difference = _counts.c.counted - _counts.c.expected
+        rows = self.db.execute(
+            select(
+                _counts.c.product_id, _products.c.name, _products.c.barcode,
+                _counts.c.expected, _counts.c.counted, _counts.c.approved,
+            )
+            .select_from(_counts.join(_products, _products.c.id == _counts.c.product_id))
+            .where(_counts.c.stocktake_id == stocktake_id, difference != 0)
+            .order_by(func.abs(difference).desc(), _products.c.name)
+            .limit(limit)
+        ).all()
+        return [Variance(*row) for row in rows]
+
+    def set_approved(self, stocktake_id: int, product_ids: Iterable[int], approved: bool) -> None:
+        product_ids = list(product_ids)
+        try:
+            self._open(stocktake_id)
+            for start in range(0, len(product_ids), CHUNK):
+                self.db.execute(
+                    update(_counts)
+                    .where(
+                        _counts.c.stocktake_id == stocktake_id,
+                        _counts.c.product_id.in_(product_ids[start:start + CHUNK]),
+                    )
+                    .values(approved=approved)
+                )
+            self.db.commit()
+        except ValueError:
+            self.db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
+    def apply(self, stocktake_id: int) -> int:
+        """Add the approved variances to the stock and close; returns how many products changed"""
+        try:
+            stocktake = self._open(stocktake_id)
+            product_ids = self.db.scalars(
+                update(_products)
+                .where(
+                    _counts.c.product_id == _products.c.id,
+                    _counts.c.stocktake_id == stocktake_id,
+                    _counts.c.approved.is_(True),
+                    _counts.c.counted != _counts.c.expected,
+                )
+                .values(quantity=func.max(0, _products.c.quantity + _counts.c.counted - _counts.c.expected))
+                .returning(_products.c.id)
+            ).all()
+            stocktake.status = StocktakeStatus.APPLIED
+            stocktake.closed_at = datetime.now()
+            self.db.commit()
+        except ValueError:
+            self.db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
+        if product_ids:
+            self.events.publish(ProductsAdjusted(tuple(product_ids), "quantity", f"Stocktake #{stocktake_id} applied"))
+        return len(product_ids)
+
+    def _open(self, stocktake_id: int) -> Stocktake:
+        stocktake = self.db.get(Stocktake, stocktake_id)
+        if stocktake is None:
+            raise ValueError(f"Stocktake {stocktake_id} not found")
+        if stocktake.status != StocktakeStatus.OPEN:
+            raise ValueError(f"Stocktake {stocktake_id} is already {stocktake.status.value}")
+        return stocktake
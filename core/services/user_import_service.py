@@ -0,0 +1,172 @@
+import csv
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from enums.user_role_enum import UserRole
+from models.user import User
+from models.user_pin import UserPin
+from core.events import UserCreated, get_event_bus
+from core.security import bcrypt_rounds, hash_password, hash_pin, validate_pin
+from core.settings import get_settings
+from core.utils import read_table
+
+Progress = Callable[[int, int], None]
+
+# Below this many rows, starting worker processes costs more than it saves
+POOL_MIN_ROWS = 16
+# Keeps IN (...) lists well under SQLite's bound parameter limit
+QUERY_CHUNK = 500
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list) # (row number, message)
+
+    def write_errors(self, path: str) -> None:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["row", "error"])
+            writer.writerows(self.errors)
+
+
+def _hash_credentials(item: Tuple[str, str, int, int]) -> Tuple[str, Optional[str]]:
+    # Runs in a worker process: rounds are passed in, so no settings are read
+    password, pin, rounds, pin_rounds = item
+    return hash_password(password, rounds), hash_pin(pin, pin_rounds) if pin else None
+
+
+class UserImportService:
+    """
+    Creates users in bulk from a CSV or XLSX file with the columns
+    username, password and optionally role and pin.
+
+    Every row is validated first and usernames are checked with one query
+    per chunk. Valid rows are hashed across a process pool and inserted in
+    a single transaction; invalid rows are skipped and reported.
+    """
+
+    def __init__(self, db: Session, workers: Optional[int] = None):
+        self.db = db
+        self.workers = workers or os.cpu_count() or 1
+
+    def import_file(self, path: str, progress: Optional[Progress] = None) -> ImportReport:
+        report = ImportReport()
+        rows = self._validate(read_table(path), report)
+        if not rows:
+            return report
+
+        hashes = self._hash(rows, progress)
+        user_ids = self._insert(rows, hashes)
+        report.created = len(user_ids)
+
+        events = get_event_bus()
+        with events.batch():
+            for user_id in user_ids:
+                events.publish(UserCreated(user_id))
+        return report
+
+    def _validate(self, table, report: ImportReport) -> List[Dict]:
+        rows = []
+        seen: Dict[str, int] = {}
+        for number, values in table:
+            user_name = values.get("username", "")
+            password = values.get("password", "")
+            role_value = (values.get("role") or UserRole.EMPLOYEE.value).lower()
+            pin = values.get("pin", "")
+            try:
+                if len(user_name) < 3:
+                    raise ValueError("Username must be at least 3 characters")
+                if len(user_name) > User.user_name.type.length:
+                    raise ValueError(f"Username must be at most {User.user_name.type.length} characters")
+                if len(password) < 6:
+                    raise ValueError("Password must be at least 6 characters")
+                try:
+                    role = UserRole(role_value)
+                except ValueError:
+                    raise ValueError(f"Unknown role: {role_value}")
+                if pin:
+                    validate_pin(pin)
+                if user_name in seen:
+                    raise ValueError(f"Username {user_name} is repeated from row {seen[user_name]}")
+            except ValueError as e:
+                report.errors.append((number, str(e)))
+                continue
+
+            seen[user_name] = number
+            rows.append({"number": number, "user_name": user_name, "password": password, "role": role, "pin": pin})
+
+        existing = self._existing_usernames([row["user_name"] for row in rows])
+        valid = []
+        for row in rows:
+            if row["user_name"] in existing:
+                report.errors.append((row["number"], f"Username {row['user_name']} already exists"))
+            else:
+                valid.append(row)
+        report.errors.sort()
+        return valid
+
+    def _existing_usernames(self, user_names: List[str]) -> set:
+        existing = set()
+        for start in range(0, len(user_names), QUERY_CHUNK):
+            chunk = user_names[start:start + QUERY_CHUNK]
+            existing.update(self.db.scalars(select(User.user_name).where(User.user_name.in_(chunk))))
+        return existing
+
+    def _hash(self, rows: List[Dict], progress: Optional[Progress]) -> List[Tuple[str, Optional[str]]]:
+        rounds = bcrypt_rounds()
+        pin_rounds = get_settings()["security"]["pin_rounds"]
+        items = [(row["password"], row["pin"], rounds, pin_rounds) for row in rows]
+        total = len(items)
+
+        if self.workers <= 1 or total < POOL_MIN_ROWS:
+            hashes = []
+            for item in items:
+                hashes.append(_hash_credentials(item))
+                if progress:
+                    progress(len(hashes), total)
+            return hashes
+
+        hashes = []
+        chunksize = max(1, total // (self.workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            for result in executor.map(_hash_credentials, items, chunksize=chunksize):
+                hashes.append(result)
+                if progress:
+                    progress(len(hashes), total)
+        return hashes
+
+    def _insert(self, rows: List[Dict], hashes: List[Tuple[str, Optional[str]]]) -> List[int]:
+        try:
+            self.db.execute(insert(User), [
+                {"user_name": row["user_name"], "password_hash": password_hash, "role": row["role"]}
+                for row, (password_hash, _) in zip(rows, hashes)
+            ])
+
+            ids: Dict[str, int] = {}
+            user_names = [row["user_name"] for row in rows]
+            for start in range(0, len(user_names), QUERY_CHUNK):
+                chunk = user_names[start:start + QUERY_CHUNK]
+                ids.update(self.db.execute(select(User.user_name, User.id).where(User.user_name.in_(chunk))).all())
+
+            pins = [
+                {"user_id": ids[row["user_name"]], "pin_hash": pin_hash}
+                for row, (_, pin_hash) in zip(rows, hashes) if pin_hash
+            ]
+            if pins:
+                self.db.execute(insert(UserPin), pins)
+            self.db.commit()
+            return [ids[user_name] for user_name in user_names]
+        except SQLAlchemyError as e:
+            # All or nothing, e.g. when a username was taken meanwhile
+            self.db.rollback()
+            raise ValueError(f"Database error: {str(e)}")
@@ -2,8 +2,14 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Optional, List
 from models.user import User
+from models.user_pin import UserPin
+from core.security import hash_pin, validate_pin, verify_pin
 from enums.user_role_enum import UserRole
 from core.repositories.user_repository import UserRepository
+from core.events import UserCreated, UserDeleted, UserLoggedIn, UserUpdated, publish
+from core.logger import get_logger
+
+logger = get_logger(__name__)
 
 class UserService:
     def __init__(self, db:Session):
@@ -31,7 +37,10 @@ class UserService:
                 role= role
             )
             user._password= password
-            return self.user_repo.add(user= user)
+            user= self.user_repo.add(user= user)
+            if user:
+                publish(UserCreated(user.id))
+            return user
         
         except (SQLAlchemyError, ValueError) as e:
             self.db.rollback()
@@ -39,7 +48,18 @@ class UserService:
             return None
         
     def login(self, user_name:str, password: str)->Optional[User]:
-        return self.user_repo.authenticate(user_name, password)
+        user= self.user_repo.authenticate(user_name, password)
+        if user and user.password_needs_rehash():
+            # The password is only ever in hand here, so upgrade the cost now
+            try:
+                user.set_password(password)
+                self.db.commit()
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                logger.warning("Could not rehash password for %s: %s", user_name, e)
+        if user:
+            publish(UserLoggedIn(user.id, user.user_name, "password"))
+        return user
     
     def change_password(
             self,
@@ -72,7 +92,10 @@ class UserService:
                 raise ValueError("User not found")
             
             user.role= new_role
-            return self.user_repo.update(user)
+            user= self.user_repo.update(user)
+            if user:
+                publish(UserUpdated(user.id))
+            return user
         
         except (SQLAlchemyError, ValueError) as e:
             self.db.rollback()
@@ -116,7 +139,10 @@ class UserService:
                     raise ValueError("Password must be at least 6 characters")
                 user.set_password(password)
             
-            return self.user_repo.update(user)
+            user= self.user_repo.update(user)
+            if user:
+                publish(UserUpdated(user.id))
+            return user
         except (SQLAlchemyError, ValueError) as e:
             self.db.rollback()
             return None
@@ -126,7 +152,52 @@ class UserService:
             user = self.user_repo.get(user_id)
             if not user:
                 return False
-            return self.user_repo.delete(user)
+            # SQLite does not enforce the cascade unless foreign keys are on
+            self.db.query(UserPin).filter(UserPin.user_id == user_id).delete()
+            deleted= self.user_repo.delete(user)
+            if deleted:
+                publish(UserDeleted(user_id))
+            return deleted
         except SQLAlchemyError:
             self.db.rollback()
-            return False
\ No newline at end of file
+            return False
+
+    def set_pin(self, user_id: int, pin: str) -> None:
+        try:
+            validate_pin(pin)
+            if not self.user_repo.get(user_id):
+                raise ValueError("User not found")
+
+            user_pin= self.db.get(UserPin, user_id)
+            if user_pin:
+                user_pin.pin_hash= hash_pin(pin)
+            else:
+                self.db.add(UserPin(user_id= user_id, pin_hash= hash_pin(pin)))
+            self.db.commit()
+        except ValueError:
+            self.db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
+    def get_users_with_pin(self) -> List[User]:
+        """Users who can unlock a locked till"""
+        try:
+            return (
+                self.db.query(User)
+                .join(UserPin, UserPin.user_id == User.id)
+                .order_by(User.user_name)
+                .all()
+            )
+        except SQLAlchemyError:
+            return []
+
+    def unlock(self, user_id: int, pin: str) -> Optional[User]:
+        user_pin= self.db.get(UserPin, user_id)
+        if not user_pin or not verify_pin(pin, user_pin.pin_hash):
+            return None
+        user= self.user_repo.get(user_id)
+        if user:
+            publish(UserLoggedIn(user.id, user.user_name, "pin"))
+        return user
@@ -0,0 +1,151 @@
+import copy
+import json
+import os
+from typing import Any, Dict, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+SETTINGS_PATH = os.path.join(DATA_DIR, "settings.json")
+
+DEFAULTS: Dict[str, Any] = {
+    "perf_monitor": {
+        "enabled": False,
+        "heartbeat_ms": 50,
+        "stall_threshold_ms": 100,
+        "sample_stacks": False,
+        "buffer_size": 2048,
+        "report_path": os.path.join("data", "reports", "perf_report.json"),
+    },
+    "query_monitor": {
+        "enabled": False,
+        "slow_ms": 20,
+        "keep_slowest": 10,
+        # One statement shape run this often in one command is flagged as N+1
+        "n_plus_one_threshold": 5,
+        "overlay": True,
+        "report_path": os.path.join("data", "reports", "query_report.json"),
+    },
+    "scanner": {
+        "enabled": True,
+        "max_gap_ms": 30,
+        "min_length": 4,
+        "terminators": ["Return", "Enter"],
+        "require_terminator": True,
+    },
+    "receipt": {
+        "store_name": "POSFlow",
+        "footer": "Thank you for shopping with us!",
+        "page_width_mm": 80,
+        "output_dir": os.path.join("data", "reports"),
+        "workers": 1,
+        "auto_print": False,
+    },
+    "journal": {
+        "path": os.path.join("data", "journal", "sales.journal"),
+        "fsync": True,
+        "batch_size": 200,
+        "apply_delay_ms": 50,
+        "retry_ms": 1000,
+        "compact_bytes": 1048576,
+        # Invoice ids reserved at a time; a restart skips what is left of a block
+        "id_block_size": 100,
+    },
+    "replication": {
+        "enabled": False,
+        "node_id": "till-1",
+        "master_path": os.path.join("data", "store_master.db"),
+        # Send this database's existing rows to an empty master; only the
+        # first till to join should, and never when the master has data
+        "seed": False,
+        "batch_size": 500,
+        "interval_ms": 60000,
+    },
+    "security": {
+        # 0: calibrate the bcrypt cost to target_ms on this machine
+        "rounds": 0,
+        "target_ms": 250,
+        "min_rounds": 10,
+        "max_rounds": 15,
+        "pin_rounds": 20000,
+        "pin_max_attempts": 5,
+        "pin_lockout_s": 60,
+    },
+    "audit": {
+        "enabled": True,
+        "ring_size": 200,
+        "flush_ms": 1000,
+        "batch_size": 500,
+    },
+    "barcodes": {
+        # EAN-13 prefix for products created here; 20-29 are for in-store
+        # use. Give each till replicating to one store master its own.
+        "prefix": "20",
+        "block_size": 1000,
+    },
+    "archive": {
+        "enabled": True,
+        "path": os.path.join("data", "archive.db"),
+        # Paid and cancelled invoices older than this leave cashier.db
+        "after_days": 365,
+        "batch_size": 1000,
+    },
+    "backup": {
+        "enabled": True,
+        "dir": os.path.join("data", "backups"),
+        "interval_hours": 24,
+        "keep": 7,
+        # Smaller steps and longer pauses: slower backups, shorter waits for the till
+        "pages_per_step": 256,
+        "pause_ms": 20,
+    },
+    "maintenance": {
+        "enabled": True,
+        # No key, click or sale for this long counts as idle
+        "idle_minutes": 10,
+        "poll_s": 30,
+        "analysis_limit": 1000,
+        "vacuum_pages": 500,
+        "max_full_vacuum_mb": 256,
+        "interval_hours": {"optimize": 24, "analyze": 168, "vacuum": 24, "integrity": 168, "checkpoint": 24},
+    },
+}
+
+_settings: Optional[Dict[str, Any]] = None
+
+
+def _merge(defaults: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    merged = copy.deepcopy(defaults)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_settings(path: str = SETTINGS_PATH) -> Dict[str, Any]:
+    """Read settings.json on top of DEFAULTS; a missing or empty file gives the defaults"""
+    overrides = {}
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, encoding="utf-8") as f:
+            overrides = json.load(f)
+    return _merge(DEFAULTS, overrides)
+
+
+def get_settings() -> Dict[str, Any]:
+    global _settings
+    if _settings is None:
+        _settings = load_settings()
+    return _settings
+
+
+def save_settings(settings: Dict[str, Any], path: str = SETTINGS_PATH) -> None:
+    global _settings
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=4)
+    _settings = settings
+
+
+def resolve_path(path: str) -> str:
+    """Paths in settings are relative to the project root"""
+    return path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
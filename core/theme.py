@@ -0,0 +1,69 @@
+import json
+import os
+import re
+from typing import Dict, Optional
+
+from PySide6.QtWidgets import QApplication, QWidget
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STYLES_DIR = os.path.join(BASE_DIR, "resources", "styles")
+THEME_PATH = os.path.join(STYLES_DIR, "theme.qss")
+COLORS_PATH = os.path.join(STYLES_DIR, "colors.json")
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_VARIABLE = re.compile(r"@([A-Za-z_][A-Za-z0-9_]*)")
+
+_colors: Optional[Dict[str, str]] = None
+_stylesheet: Optional[str] = None
+
+
+def load_colors(path: str = COLORS_PATH) -> Dict[str, str]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compile_theme(theme_path: str = THEME_PATH, colors: Optional[Dict[str, str]] = None) -> str:
+    """Replace every @variable in the QSS file with its value from colors.json"""
+    if colors is None:
+        colors = load_colors()
+
+    with open(theme_path, encoding="utf-8") as f:
+        source = _COMMENT.sub("", f.read())
+
+    def substitute(match):
+        name = match.group(1)
+        if name not in colors:
+            raise ValueError(f"Unknown theme variable @{name}")
+        return colors[name]
+
+    return _VARIABLE.sub(substitute, source)
+
+
+def color(name: str) -> str:
+    """Theme color for code that paints directly (QPainter, QTableWidgetItem foregrounds)"""
+    global _colors
+    if _colors is None:
+        _colors = load_colors()
+    return _colors[name]
+
+
+def apply_theme(app: Optional[QApplication] = None) -> str:
+    """Compile the theme once and install it application-wide"""
+    global _stylesheet
+    if _stylesheet is None:
+        _stylesheet = compile_theme()
+
+    app = app or QApplication.instance()
+    if app is not None:
+        app.setStyleSheet(_stylesheet)
+    return _stylesheet
+
+
+def set_style_property(widget: QWidget, name: str, value) -> None:
+    """Change a variant property after the widget was polished and refresh its style"""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
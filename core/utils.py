@@ -0,0 +1,122 @@
+import csv
+import os
+import posixpath
+import re
+import zipfile
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse, parse
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_CELL_REF = re.compile(r"([A-Z]+)")
+
+TABLE_EXTENSIONS = (".csv", ".xlsx")
+
+
+def read_table(path: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Yield (row number, {header: value}) for every data row of a CSV file
+    or the first sheet of an XLSX workbook. Headers are lower-cased with
+    spaces turned into underscores; values are stripped strings. Row
+    numbers count the header as row 1, as a spreadsheet shows them.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        rows = _csv_rows(path)
+    elif extension == ".xlsx":
+        rows = _xlsx_rows(path)
+    else:
+        raise ValueError(f"Unsupported file type: {extension or path}")
+
+    headers: Optional[List[str]] = None
+    for number, values in rows:
+        if headers is None:
+            headers = [value.strip().lower().replace(" ", "_") for value in values]
+            continue
+        if not any(value.strip() for value in values):
+            continue
+        values = values + [""] * (len(headers) - len(values))
+        yield number, {header: value.strip() for header, value in zip(headers, values) if header}
+
+
+def _csv_rows(path: str) -> Iterator[Tuple[int, List[str]]]:
+    # utf-8-sig drops the BOM Excel writes when saving as CSV
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for number, values in enumerate(csv.reader(f), start=1):
+            yield number, values
+
+
+def _xlsx_rows(path: str) -> Iterator[Tuple[int, List[str]]]:
+    """Stream the first worksheet with the standard library; no cell styles or formulas"""
+    try:
+        archive = zipfile.ZipFile(path)
+    except zipfile.BadZipFile:
+        raise ValueError(f"{os.path.basename(path)} is not a valid .xlsx file")
+
+    with archive:
+        shared = _shared_strings(archive)
+        with archive.open(_first_sheet(archive)) as sheet:
+            for _, element in iterparse(sheet):
+                if element.tag != _MAIN_NS + "row":
+                    continue
+                values: List[str] = []
+                for cell in element.iter(_MAIN_NS + "c"):
+                    column = _column_index(cell.get("r"), len(values))
+                    values.extend([""] * (column - len(values)))
+                    values.append(_cell_value(cell, shared))
+                yield int(element.get("r")), values
+                element.clear()
+
+
+def _shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as f:
+        for _, element in iterparse(f):
+            if element.tag == _MAIN_NS + "si":
+                # Rich text is split into runs
+                strings.append("".join(text.text or "" for text in element.iter(_MAIN_NS + "t")))
+                element.clear()
+    return strings
+
+
+def _first_sheet(archive: zipfile.ZipFile) -> str:
+    workbook = parse(archive.open("xl/workbook.xml")).getroot()
+    sheet = workbook.find(f"{_MAIN_NS}sheets/{_MAIN_NS}sheet")
+    if sheet is None:
+        raise ValueError("The workbook has no sheets")
+    relationship_id = sheet.get(_REL_NS + "id")
+
+    relationships = parse(archive.open("xl/_rels/workbook.xml.rels")).getroot()
+    for relationship in relationships.iter(_PACKAGE_REL_NS + "Relationship"):
+        if relationship.get("Id") == relationship_id:
+            target = relationship.get("Target")
+            return target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+    raise ValueError("The workbook's first sheet is missing")
+
+
+def _column_index(reference: Optional[str], default: int) -> int:
+    if not reference:
+        return default
+    index = 0
+    for letter in _CELL_REF.match(reference).group(1):
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+def _cell_value(cell, shared: List[str]) -> str:
+    kind = cell.get("t")
+    if kind == "inlineStr":
+        return "".join(text.text or "" for text in cell.iter(_MAIN_NS + "t"))
+    value = cell.findtext(_MAIN_NS + "v") or ""
+    if kind == "s":
+        return shared[int(value)] if value else ""
+    if kind == "b":
+        return "TRUE" if value == "1" else "FALSE"
+    if kind is None or kind == "n":
+        # Whole numbers are stored as floats
+        if value.endswith(".0"):
+            return value[:-2]
+    return value
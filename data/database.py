@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from models.base import Base
 import os
@@ -8,11 +8,30 @@ DB_PATH= os.path.join(BASE_DIR, "cashier.db")
 
 DATABASE_URL= f"sqlite:///{DB_PATH}"
 
-engine= create_engine(
-    DATABASE_URL,
-    echo= False,
-    connect_args= {"check_same_thread": False}
-)
+def create_db_engine(path: str):
+    """An engine on the SQLite file at `path`, set up like the app's own"""
+    db_engine= create_engine(
+        f"sqlite:///{path}",
+        echo= False,
+        connect_args= {"check_same_thread": False}
+    )
+    event.listen(db_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets reports read while the sales journal applier writes.
+    # synchronous=NORMAL may lose the last commits on power loss, which the
+    # journal replays; busy_timeout waits out a writer instead of failing.
+    # auto_vacuum only takes on a new file, and only ahead of WAL; idle
+    # maintenance converts older databases.
+    cursor= dbapi_connection.cursor()
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+engine= create_db_engine(DB_PATH)
 
 SessionLocal= sessionmaker(
     autocommit= False,
@@ -28,13 +47,24 @@ def get_session():
     finally:
         session.close()
 
-def init_db():
+def import_models():
+    """Register every table on Base.metadata"""
     from models.user import User
     from models.product import Product
     from models.category import Category
     from models.invoice import Invoice
     from models.invoice_item import InvoiceItem
     from models.customer import Customer
+    from models.journal_checkpoint import JournalCheckpoint
+    from models.user_pin import UserPin
+    from models.audit_event import AuditEvent
+    from models.barcode_sequence import BarcodeSequence
+    from models.id_sequence import IdSequence
+    from models.stocktake import Stocktake, StocktakeCount
+    from models.archive_state import ArchiveState
+    from models.maintenance_run import MaintenanceRun
 
+def init_db():
+    import_models()
     Base.metadata.create_all(bind= engine)
     print("✔ Database tables created successfully!")
\ No newline at end of file
@@ -0,0 +1,123 @@
+import json
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, List, Tuple
+
+# Every record: payload length, crc32 of the payload, then the JSON payload
+_HEADER = struct.Struct(">II")
+
+
+def encode_record(record: Dict) -> bytes:
+    payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def scan(path: str) -> Tuple[List[Dict], int]:
+    """
+    Read every intact record of a journal file. Returns the records and the
+    offset where the intact part ends; anything after it is a torn or
+    corrupted tail from a write that never completed.
+    """
+    records = []
+    valid_end = 0
+    if not os.path.exists(path):
+        return records, valid_end
+
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                break
+            length, checksum = _HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            try:
+                records.append(json.loads(payload))
+            except ValueError:
+                break
+            valid_end = f.tell()
+    return records, valid_end
+
+
+class Journal:
+    """
+    Append-only file of checksummed JSON records.
+
+    append() returns once the record is on disk. Appends that arrive while
+    another caller is in fsync are covered by the next fsync together, so
+    concurrent writers share the cost of a sync (group commit).
+    """
+
+    def __init__(self, path: str, fsync: bool = True, start_seq: int = 0):
+        """`start_seq` is where numbering continues when the file is empty"""
+        self.path = path
+        self.fsync = fsync
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        records, valid_end = scan(path)
+        self._file = open(path, "ab")
+        if self._file.tell() != valid_end:
+            # Never acknowledged to anyone: drop the torn tail
+            self._file.truncate(valid_end)
+            self._sync()
+
+        self.recovered = records
+        self.last_seq = max(records[-1]["seq"] if records else 0, start_seq)
+
+        self._lock = threading.Lock() # file writes and seq
+        self._sync_lock = threading.Lock() # one fsync at a time
+        self._written = self.last_seq
+        self._synced = self.last_seq
+
+    def append(self, record: Dict) -> int:
+        """Write one record and wait until it is durable; returns its seq"""
+        with self._lock:
+            seq = self.last_seq + 1
+            record["seq"] = seq
+            self._file.write(encode_record(record))
+            self.last_seq = self._written = seq
+        self._sync_through(seq)
+        return seq
+
+    def compact(self, applied_seq: int) -> bool:
+        """Empty the file once every record in it has been applied"""
+        with self._sync_lock, self._lock:
+            if self._written != applied_seq:
+                return False
+            self._file.truncate(0)
+            self._file.seek(0)
+            self._sync()
+            return True
+
+    def size(self) -> int:
+        with self._lock:
+            return self._file.tell()
+
+    def close(self) -> None:
+        with self._sync_lock, self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    def _sync_through(self, seq: int) -> None:
+        with self._sync_lock:
+            if self._synced >= seq:
+                # Someone else's fsync already covered this record
+                return
+            with self._lock:
+                target = self._written
+                self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._synced = target
+
+    def _sync(self) -> None:
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
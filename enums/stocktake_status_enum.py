@@ -0,0 +1,6 @@
+from enum import Enum
+
+class StocktakeStatus(Enum):
+    OPEN= "open"
+    APPLIED= "applied"
+    CANCELLED= "cancelled"
@@ -1,17 +1,55 @@
 from PySide6.QtWidgets import QApplication
 import sys
+import threading
 
 from viewmodels.auth.create_account_viewmodel import CreateAccountViewModel
 from views.auth.create_account_view import CreateAccountView
 
-from data.database import SessionLocal, init_db
+from data.database import SessionLocal, engine, init_db
+from core.theme import apply_theme
+from core.perf_monitor import install_from_settings
+from core.query_monitor import install_from_settings as install_query_monitor
+from core.security import bcrypt_rounds
+from core.services.sales_journal import get_sales_journal, close_sales_journal
+from core.services.audit_log import get_audit_log, close_audit_log
+from core.services.replication_service import start_from_settings as start_replication, stop_replication
+from core.services.archive_service import archive_from_settings, stop_archiving
+from core.services.backup_service import start_from_settings as start_backups, stop_backups
+from core.services.maintenance_service import start_from_settings as start_maintenance, stop_maintenance
 
 from views.auth.login_view import LoginView
+from views.windows import show_window
 from viewmodels.auth.login_viewmodel import LoginViewModel
 
 if __name__ == "__main__":
     init_db()
+    # Calibrate the password hash cost while the login window comes up
+    threading.Thread(target=bcrypt_rounds, name="bcrypt-calibration", daemon=True).start()
+    # Before the journal, so replayed sales are audited too
+    get_audit_log()
+    # Replays sales a crashed run journaled but never wrote to the database
+    get_sales_journal()
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(close_sales_journal)
+    # After the journal has applied its last sales
+    app.aboutToQuit.connect(close_audit_log)
+    # Opt-in exchange of changes with the store master database
+    start_replication(engine)
+    app.aboutToQuit.connect(stop_replication)
+    # Moves old closed invoices to the archive database in small batches
+    threading.Thread(target=archive_from_settings, args=(engine,), name="invoice-archive", daemon=True).start()
+    app.aboutToQuit.connect(stop_archiving)
+    # Online snapshots of the databases while the till keeps selling
+    start_backups()
+    app.aboutToQuit.connect(stop_backups)
+    # ANALYZE, vacuum and integrity checks while nobody is using the till
+    start_maintenance(app, engine)
+    app.aboutToQuit.connect(stop_maintenance)
+    apply_theme(app)
+    # Opt-in UI latency monitor; must run before any view is constructed
+    install_from_settings(app)
+    # Opt-in per-command SQL counts and N+1 detection
+    install_query_monitor(app, engine)
 
     db_session = SessionLocal()    
 
@@ -22,6 +60,6 @@ if __name__ == "__main__":
     vm = LoginViewModel(db_session)
     win = LoginView(vm)
 
-    win.show()
+    show_window(win)
 
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, DateTime
+from models.base import Base
+
+class ArchiveState(Base):
+    """Single row: the date range of the invoices moved to the archive database"""
+    __tablename__= "archive_state"
+
+    id= Column(Integer, primary_key= True)
+    oldest_date= Column(DateTime, nullable= True)
+    newest_date= Column(DateTime, nullable= True)
+    invoices= Column(Integer, nullable= False, default= 0)
+
+    def __repr__(self):
+        return f"<ArchiveState(invoices={self.invoices}, newest={self.newest_date})>"
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, Index, Integer, String
+from models.base import Base
+
+class AuditEvent(Base):
+    """Append-only record of what happened on the till, written in batches"""
+    __tablename__= "audit_events"
+
+    id= Column(Integer, primary_key= True)
+    timestamp= Column(DateTime, nullable= False)
+    # e.g. "sale", "login", "price", "stock", "delete"
+    action= Column(String(20), nullable= False)
+    user_name= Column(String(50), nullable= True)
+    entity= Column(String(20), nullable= True)
+    entity_id= Column(Integer, nullable= True)
+    summary= Column(String(255), nullable= False)
+
+    __table_args__= (
+        Index("ix_audit_events_timestamp", "timestamp"),
+        Index("ix_audit_events_action_timestamp", "action", "timestamp"),
+        Index("ix_audit_events_entity", "entity", "entity_id"),
+    )
+
+    def __repr__(self):
+        return f"<AuditEvent({self.timestamp:%Y-%m-%d %H:%M:%S} {self.action}: {self.summary})>"
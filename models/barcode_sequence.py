@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+from models.base import Base
+
+class BarcodeSequence(Base):
+    __tablename__= "barcode_sequences"
+
+    # One row per barcode prefix, e.g. "20"
+    prefix= Column(String(12), primary_key= True)
+    # First serial not yet handed to any allocator
+    next_serial= Column(Integer, nullable= False, default= 0)
+
+    def __repr__(self):
+        return f"<BarcodeSequence(prefix={self.prefix}, next_serial={self.next_serial})>"
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+from models.base import Base
+
+class IdSequence(Base):
+    __tablename__= "id_sequences"
+
+    # One row per table whose ids are handed out in blocks, e.g. "invoices"
+    name= Column(String(64), primary_key= True)
+    # First id not yet handed to any allocator
+    next_id= Column(Integer, nullable= False, default= 1)
+
+    def __repr__(self):
+        return f"<IdSequence(name={self.name}, next_id={self.next_id})>"
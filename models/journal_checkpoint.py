@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+from models.base import Base
+
+class JournalCheckpoint(Base):
+    __tablename__= "journal_checkpoints"
+
+    # One row per journal file, e.g. "sales"
+    name= Column(String, primary_key= True)
+    applied_seq= Column(Integer, nullable= False, default= 0)
+
+    def __repr__(self):
+        return f"<JournalCheckpoint(name={self.name}, applied_seq={self.applied_seq})>"
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, DateTime, String
+from models.base import Base
+
+class MaintenanceRun(Base):
+    __tablename__= "maintenance_runs"
+
+    # One row per maintenance task, e.g. "analyze"
+    task= Column(String, primary_key= True)
+    finished_at= Column(DateTime, nullable= False)
+
+    def __repr__(self):
+        return f"<MaintenanceRun(task={self.task}, finished_at={self.finished_at})>"
@@ -0,0 +1,66 @@
+from sqlalchemy import Column, Integer, Float, String, Index
+from models.base import Base
+
+class ChangeLog(Base):
+    """One row per write to a replicated table, filled by triggers"""
+    __tablename__= "change_log"
+
+    seq= Column(Integer, primary_key= True, autoincrement= True)
+    table_name= Column(String(50), nullable= False)
+    row_id= Column(Integer, nullable= False)
+    # I(nsert), U(pdate), D(elete) or S(tock delta)
+    op= Column(String(1), nullable= False)
+    delta= Column(Integer, nullable= True)
+    # Node the change was first made on
+    origin= Column(String(50), nullable= False)
+
+    # AUTOINCREMENT: seqs must never be reused once pruned entries are gone
+    __table_args__= (
+        Index("ix_change_log_origin_seq", "origin", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+    def __repr__(self):
+        return f"<ChangeLog(seq={self.seq}, {self.op} {self.table_name}#{self.row_id})>"
+
+
+class ReplicationControl(Base):
+    """Single row: this node's id and the origin the triggers write"""
+    __tablename__= "replication_control"
+
+    id= Column(Integer, primary_key= True)
+    node_id= Column(String(50), nullable= False)
+    origin= Column(String(50), nullable= False)
+
+
+class ReplicationPeer(Base):
+    """Watermarks per peer: how far each side's change log has been exchanged"""
+    __tablename__= "replication_peers"
+
+    peer= Column(String(50), primary_key= True)
+    # Our change_log seq the peer has received
+    sent_seq= Column(Integer, nullable= False, default= 0)
+    # The peer's change_log seq we have applied
+    received_seq= Column(Integer, nullable= False, default= 0)
+
+
+class RowVersion(Base):
+    """Last-writer-wins version of every replicated row"""
+    __tablename__= "row_versions"
+
+    table_name= Column(String(50), primary_key= True)
+    row_id= Column(Integer, primary_key= True)
+    version= Column(Float, nullable= False)
+    origin= Column(String(50), nullable= False)
+
+
+class ReplicationIdMap(Base):
+    """A peer's id for a row, mapped to the local id of the same row"""
+    __tablename__= "replication_id_map"
+
+    peer= Column(String(50), primary_key= True)
+    table_name= Column(String(50), primary_key= True)
+    remote_id= Column(Integer, primary_key= True)
+    local_id= Column(Integer, nullable= False)
+
+    __table_args__= (Index("ix_replication_id_map_local", "peer", "table_name", "local_id"),)
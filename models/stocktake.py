@@ -0,0 +1,33 @@
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.types import Enum as SQLEnum
+from datetime import datetime
+from models.base import Base
+from enums.stocktake_status_enum import StocktakeStatus
+
+class Stocktake(Base):
+    __tablename__= "stocktakes"
+
+    id= Column(Integer, primary_key= True)
+    started_at= Column(DateTime, default= datetime.now)
+    closed_at= Column(DateTime, nullable= True)
+    status= Column(SQLEnum(StocktakeStatus), default= StocktakeStatus.OPEN, nullable= False)
+    note= Column(String(255), nullable= True)
+
+    def __repr__(self):
+        return f"<Stocktake(id={self.id}, status={self.status})>"
+
+
+class StocktakeCount(Base):
+    """Staging row: what was counted of one product in a stocktake"""
+    __tablename__= "stocktake_counts"
+
+    stocktake_id= Column(Integer, ForeignKey("stocktakes.id", ondelete="CASCADE"), primary_key= True)
+    product_id= Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key= True)
+    counted= Column(Integer, nullable= False, default= 0)
+    # System stock when the product was first counted; the variance is
+    # measured against it, so sales during the count don't show as losses
+    expected= Column(Integer, nullable= False)
+    approved= Column(Boolean, nullable= False, default= True)
+
+    def __repr__(self):
+        return f"<StocktakeCount(product_id={self.product_id}, counted={self.counted}, expected={self.expected})>"
@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String
 from models.base import Base
-from passlib.hash import bcrypt # type: ignore
+from core.security import hash_password, needs_rehash, verify_password
 from sqlalchemy.types import Enum as SQLEnum
 from enums.user_role_enum import UserRole
 
@@ -24,13 +24,16 @@ class User(Base):
 
     def set_password(self, password: str):
         """تشفير كلمة المرور وحفظها"""
-        self.password_hash = bcrypt.hash(password)
+        self.password_hash = hash_password(password)
         self._password = None  # تنظيف بعد التشفير
 
 
 
     def check_password(self, password):
-        return bcrypt.verify(password, self.password_hash)
+        return verify_password(password, self.password_hash)
+
+    def password_needs_rehash(self):
+        return needs_rehash(self.password_hash)
     
     def __repr__(self):
         return f"<User(user_name={self.user_name}, role={self.role})"
\ No newline at end of file
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+from models.base import Base
+
+class UserPin(Base):
+    """Quick-unlock PIN for switching cashiers on a locked till"""
+    __tablename__= "user_pins"
+
+    user_id= Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key= True)
+    pin_hash= Column(String(255), nullable= False)
+
+    def __repr__(self):
+        return f"<UserPin(user_id={self.user_id})>"
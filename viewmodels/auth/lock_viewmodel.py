@@ -0,0 +1,70 @@
+import time
+from PySide6.QtCore import QObject, Signal, Slot, Property
+from sqlalchemy.orm import Session
+
+from core.services.user_service import UserService
+from core.settings import get_settings
+
+class LockViewModel(QObject):
+    """Unlocks a locked dashboard with a cashier's PIN"""
+
+    usersChanged= Signal()
+    errorChanged= Signal(str)
+    unlocked= Signal(object) # User
+
+    def __init__(self, db_session: Session):
+        super().__init__()
+        self.db_session = db_session
+        self.user_service = UserService(db_session)
+        options = get_settings()["security"]
+        self.max_attempts = options["pin_max_attempts"]
+        self.lockout = options["pin_lockout_s"]
+
+        self._users = []
+        self._error = ""
+        self._failures = {} # user_id -> (failed attempts, locked until)
+
+    def get_error(self):
+        return self._error
+
+    def set_error(self, value):
+        if self._error != value:
+            self._error = value
+            self.errorChanged.emit(value)
+
+    error = Property(str, get_error, set_error, notify=errorChanged)
+
+    def get_users(self):
+        return self._users
+
+    @Slot()
+    def load_users(self):
+        self._users = self.user_service.get_users_with_pin()
+        self.usersChanged.emit()
+
+    @Slot(int, str)
+    def unlockCommand(self, user_id: int, pin: str):
+        if not pin:
+            self.set_error("Enter your PIN")
+            return
+
+        failures, locked_until = self._failures.get(user_id, (0, 0.0))
+        wait = locked_until - time.monotonic()
+        if wait > 0:
+            self.set_error(f"Too many attempts. Try again in {int(wait) + 1}s")
+            return
+
+        user = self.user_service.unlock(user_id, pin)
+        if user is None:
+            failures += 1
+            if failures >= self.max_attempts:
+                self._failures[user_id] = (0, time.monotonic() + self.lockout)
+                self.set_error(f"Too many attempts. Try again in {self.lockout}s")
+            else:
+                self._failures[user_id] = (failures, 0.0)
+                self.set_error("Wrong PIN")
+            return
+
+        self._failures.pop(user_id, None)
+        self.set_error("")
+        self.unlocked.emit(user)
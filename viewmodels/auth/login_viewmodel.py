@@ -1,8 +1,10 @@
-from PySide6.QtCore import QObject, Signal, Slot, Property, QSettings
+from PySide6.QtCore import QObject, Signal, Slot, Property, QSettings, QThreadPool
 from sqlalchemy.orm import Session
 
 from core.services.user_service import UserService
 from enums.user_role_enum import UserRole
+from models.user import User
+from viewmodels.base_vm import Worker
 
 class LoginViewModel(QObject):
 
@@ -15,6 +17,8 @@ class LoginViewModel(QObject):
     goToRegisterRequest= Signal()
 
     rememberMeChanged = Signal(bool)
+    isBusyChanged = Signal(bool)
+
     def __init__(self, db_session: Session):
         super().__init__()
 
@@ -25,6 +29,8 @@ class LoginViewModel(QObject):
         self.db_session = db_session
         self.user_serivce= UserService(db_session)
         self.logged_user = None  # Store logged-in user
+        self._is_busy = False
+        self._login_worker = None
         
         self._load_credentials()
 
@@ -68,12 +74,46 @@ class LoginViewModel(QObject):
 
     error= Property(str, get_error, set_error, notify= errorChanged)
 
+    def get_is_busy(self):
+        return self._is_busy
+
+    def set_is_busy(self, value):
+        if self._is_busy != value:
+            self._is_busy= value
+            self.isBusyChanged.emit(value)
+
+    isBusy= Property(bool, get_is_busy, set_is_busy, notify= isBusyChanged)
+
     @Slot()
     def loginCommand(self):
+        if self._is_busy:
+            return
         if not self._username or not self._password:
             self.set_error("Username and password cannot be empty")
             return
-        user= self.user_serivce.login(self._username, self._password)
+
+        # bcrypt takes hundreds of ms by design; keep it off the GUI thread
+        self.set_error("")
+        self.set_is_busy(True)
+        self._login_worker = Worker(self._authenticate, self._username, self._password)
+        self._login_worker.signals.result.connect(self._on_login_result)
+        self._login_worker.signals.error.connect(self._on_login_failed)
+        QThreadPool.globalInstance().start(self._login_worker)
+
+    def _authenticate(self, user_name, password):
+        # Sessions are not thread-safe, so the worker gets its own
+        db = Session(bind=self.db_session.get_bind())
+        try:
+            user = UserService(db).login(user_name, password)
+            return user.id if user else None
+        finally:
+            db.close()
+
+    @Slot(object)
+    def _on_login_result(self, user_id):
+        self.set_is_busy(False)
+        self._login_worker = None
+        user = self.db_session.get(User, user_id) if user_id is not None else None
         if user:
             self.set_error("")
             self.logged_user = user  # Store the logged-in user
@@ -88,6 +128,12 @@ class LoginViewModel(QObject):
         else:
             self.set_error("Invalid username or password")
 
+    @Slot(str)
+    def _on_login_failed(self, message):
+        self.set_is_busy(False)
+        self._login_worker = None
+        self.set_error(f"Login failed: {message}")
+
     @Slot()
     def goToRegisterCommand(self):
         self.goToRegisterRequest.emit()
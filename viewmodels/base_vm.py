@@ -0,0 +1,249 @@
+from collections import OrderedDict
+from typing import Any, Callable, Collection, Hashable, Iterable, List, Optional, Sequence, Tuple, Type
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal, SignalInstance, Slot
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from core.events import Event, EventBus, coalesce, get_event_bus
+
+
+class WorkerSignals(QObject):
+    result = Signal(object)
+    error = Signal(str)
+
+
+class Worker(QRunnable):
+    """Run a callable on the global thread pool and report back through signals"""
+
+    def __init__(self, fn: Callable, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.result.emit(result)
+
+
+class PageCache:
+    """Least-recently-used cache of loaded pages"""
+
+    def __init__(self, capacity: int = 8):
+        self.capacity = capacity
+        self._pages: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._pages
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if key not in self._pages:
+            return None
+        self._pages.move_to_end(key)
+        return self._pages[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._pages[key] = value
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.capacity:
+            self._pages.popitem(last=False)
+
+    def clear(self) -> None:
+        self._pages.clear()
+
+
+PageFetcher = Callable[[Session, str, int, int], Tuple[list, int]]
+
+
+class PageLoader(QObject):
+    """
+    Serves pages for a paginated viewmodel from a PageCache and prefetches
+    the following page on the thread pool.
+
+    `fetch(session, query, page, per_page)` must return `(items, total)`.
+    Prefetches run in their own short-lived session, so fetchers should
+    eager-load every relationship the table displays.
+    """
+
+    def __init__(self, db_session: Session, fetch: PageFetcher, capacity: int = 8):
+        super().__init__()
+        self.db_session = db_session
+        self.fetch = fetch
+        self.cache = PageCache(capacity)
+        self._generation = 0
+        self._pending = {}
+
+    def load(self, query: str, page: int, per_page: int) -> Tuple[list, int]:
+        key = (query, page, per_page)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self.fetch(self.db_session, query, page, per_page)
+        self.cache.put(key, result)
+        return result
+
+    def prefetch(self, query: str, page: int, per_page: int) -> None:
+        key = (query, page, per_page)
+        token = (self._generation, key)
+        if page < 1 or key in self.cache or token in self._pending:
+            return
+
+        worker = Worker(self._fetch_detached, *token)
+        worker.signals.result.connect(self._on_prefetched)
+        worker.signals.error.connect(lambda _msg, token=token: self._pending.pop(token, None))
+        self._pending[token] = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def invalidate(self) -> None:
+        """Drop every cached page; prefetches already in flight are discarded"""
+        self._generation += 1
+        self.cache.clear()
+
+    def _fetch_detached(self, generation: int, key: tuple):
+        session = Session(bind=self.db_session.get_bind())
+        try:
+            query, page, per_page = key
+            return generation, key, self.fetch(session, query, page, per_page)
+        finally:
+            session.close()
+
+    @Slot(object)
+    def _on_prefetched(self, payload):
+        generation, key, result = payload
+        self._pending.pop((generation, key), None)
+        if generation == self._generation:
+            self.cache.put(key, result)
+
+
+RowOp = Tuple[str, int, Any]
+
+
+def entity_id(entity: Any) -> Hashable:
+    """Primary key of a mapped object, read without refreshing expired attributes"""
+    identity = inspect(entity).identity
+    return identity[0] if identity else entity.id
+
+
+def diff_rows(
+    old: Sequence[Any],
+    new: Sequence[Any],
+    changed: Collection[Hashable] = (),
+) -> Optional[List[RowOp]]:
+    """
+    Work out the ("removed" | "inserted" | "changed", row, entity) operations
+    that turn the rows in `old` into `new` when applied in order.
+
+    Rows are matched by primary key; a kept row is only reported as changed
+    when its id is in `changed`. Returns None when kept rows were reordered,
+    in which case the caller should reset the whole table instead.
+    """
+    old_ids = [entity_id(entity) for entity in old]
+    new_ids = [entity_id(entity) for entity in new]
+    new_set = set(new_ids)
+
+    ops: List[RowOp] = [
+        ("removed", row, old[row])
+        for row in range(len(old) - 1, -1, -1)
+        if old_ids[row] not in new_set
+    ]
+
+    kept = [id_ for id_ in old_ids if id_ in new_set]
+    kept_set = set(kept)
+    if kept != [id_ for id_ in new_ids if id_ in kept_set]:
+        return None
+
+    for row, (id_, entity) in enumerate(zip(new_ids, new)):
+        if id_ not in kept_set:
+            ops.append(("inserted", row, entity))
+        elif id_ in changed:
+            ops.append(("changed", row, entity))
+    return ops
+
+
+def emit_row_ops(
+    ops: List[RowOp],
+    inserted: SignalInstance,
+    changed: SignalInstance,
+    removed: SignalInstance,
+) -> None:
+    for op, row, entity in ops:
+        if op == "removed":
+            removed.emit(row)
+        elif op == "inserted":
+            inserted.emit(row, entity)
+        else:
+            changed.emit(row, entity)
+
+
+class EventSubscriber(QObject):
+    """
+    Brings bus events to the thread this object lives on (the UI thread
+    for viewmodels) and hands them over as one coalesced list per burst:
+    everything published until the event loop gets back to us, or within
+    `delay_ms`, arrives in a single call.
+    """
+
+    _received = Signal(object)
+
+    def __init__(
+        self,
+        handler: Callable[[List[Event]], None],
+        event_types: Iterable[Type[Event]],
+        delay_ms: int = 0,
+        bus: Optional[EventBus] = None,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self.handler = handler
+        self._events: List[Event] = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._flush)
+
+        # Queued when published from another thread
+        self._received.connect(self._on_received)
+        bus = bus or get_event_bus()
+        self._unsubscribe = [bus.subscribe(event_type, self._received.emit) for event_type in event_types]
+
+    def close(self) -> None:
+        for unsubscribe in self._unsubscribe:
+            unsubscribe()
+        self._unsubscribe = []
+        self._timer.stop()
+        self._events = []
+
+    @Slot(object)
+    def _on_received(self, event: Event) -> None:
+        self._events.append(event)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    @Slot()
+    def _flush(self) -> None:
+        events, self._events = coalesce(self._events), []
+        if events:
+            self.handler(events)
+
+
+def expire_entities(db_session: Session, model: type, ids: Iterable[Hashable]) -> None:
+    """
+    Mark loaded objects stale so the next query reloads them. Needed for
+    changes committed through another session, which this session's
+    identity map would otherwise keep serving.
+    """
+    for id_ in ids:
+        entity = db_session.identity_map.get(identity_key(model, id_))
+        if entity is not None:
+            db_session.expire(entity)
@@ -1,14 +1,21 @@
 from PySide6.QtCore import QObject, Signal
 from core.services.category_service import CategoryService
+from viewmodels.base_vm import EventSubscriber, diff_rows, emit_row_ops, expire_entities
+from models.category import Category
+from core.events import CategoryEvent
 
 class CategoryViewModel(QObject):
     categoriesChanged = Signal()
+    categoryRowInserted = Signal(int, object) # row, Category
+    categoryRowChanged = Signal(int, object) # row, Category
+    categoryRowRemoved = Signal(int) # row
     errorOccurred = Signal(str)
 
     def __init__(self, category_service: CategoryService):
         super().__init__()
         self.category_service = category_service
         self.categories = []
+        self.subscriber = EventSubscriber(self._on_events, [CategoryEvent], parent=self)
 
     def load_categories(self):
         try:
@@ -17,13 +24,31 @@ class CategoryViewModel(QObject):
         except Exception as e:
             self.errorOccurred.emit(str(e))
 
+    def _refresh_rows(self, changed=()):
+        """Reload categories and emit row signals for what differs from the shown rows"""
+        previous = self.categories
+        self.categories = self.category_service.get_all_categories()
+        ops = diff_rows(previous, self.categories, changed)
+        if ops is None:
+            self.categoriesChanged.emit()
+        else:
+            emit_row_ops(ops, self.categoryRowInserted, self.categoryRowChanged, self.categoryRowRemoved)
+
+    def _on_events(self, events):
+        category_ids = {event.category_id for event in events}
+        expire_entities(self.category_service.db, Category, category_ids)
+        try:
+            self._refresh_rows(changed=category_ids)
+        except Exception as e:
+            self.errorOccurred.emit(str(e))
+
     def add_category(self, name, description=None):
         try:
             if not name:
                 raise ValueError("Category name is required")
             
-            self.category_service.create_category(name, description)
-            self.load_categories()
+            category = self.category_service.create_category(name, description)
+            return category
         except Exception as e:
             self.errorOccurred.emit(str(e))
 
@@ -32,14 +57,13 @@ class CategoryViewModel(QObject):
             if not name:
                 raise ValueError("Category name is required")
             
-            self.category_service.update_category(category_id, name, description)
-            self.load_categories()
+            category = self.category_service.update_category(category_id, name, description)
+            return category
         except Exception as e:
             self.errorOccurred.emit(str(e))
 
     def delete_category(self, category_id):
         try:
             self.category_service.delete_category(category_id)
-            self.load_categories()
         except Exception as e:
             self.errorOccurred.emit(str(e))
@@ -1,33 +1,125 @@
+from datetime import date, datetime, time, timedelta
 from PySide6.QtCore import QObject, Signal, Slot, Property
+from sqlalchemy import func
+from models.invoice import Invoice
+from models.product import Product
+from core.events import InvoiceCancelled, InvoiceCreated, ProductCreated, ProductDeleted, ProductsAdjusted, StockChanged
+from core.services.audit_log import AUDITED_EVENTS, get_audit_log
+from viewmodels.base_vm import EventSubscriber
+
+LOW_STOCK_THRESHOLD = 10
+ACTIVITY_LIMIT = 8
 
 class DashboardViewModel(QObject):
+    statsChanged = Signal()
+    currentUserChanged = Signal(object) # User
+    lockedChanged = Signal(bool)
+    activityChanged = Signal()
+
     def __init__(self, db_session, current_user=None):
         super().__init__()
         # Store current user information
         self.current_user = current_user
         self.db_session = db_session
-        
-        # Mock Data for now
-        self._daily_sales = "$1,500"
-        self._receipts_count = "125"
-        self._avg_receipt_value = "$12.00"
-        self._low_stock_count = "15"
-
-    @Property(str, constant=True)
+
+        self._locked = False
+        self._day = None
+        self._sales_total = 0
+        self._receipts = 0
+        self._low_stock = 0
+
+        self.load_stats()
+        self.subscriber = EventSubscriber(
+            self._on_events,
+            [InvoiceCreated, InvoiceCancelled, StockChanged, ProductCreated, ProductDeleted, ProductsAdjusted],
+            parent=self,
+        )
+        # The audit log subscribed first, so the entries are there by delivery
+        self.activity_subscriber = EventSubscriber(self._on_activity, AUDITED_EVENTS, parent=self)
+
+    @Property(str, notify=statsChanged)
     def dailySales(self):
-        return self._daily_sales
+        return f"${self._sales_total:,}"
 
-    @Property(str, constant=True)
+    @Property(str, notify=statsChanged)
     def receiptsCount(self):
-        return self._receipts_count
+        return str(self._receipts)
 
-    @Property(str, constant=True)
+    @Property(str, notify=statsChanged)
     def avgReceiptValue(self):
-        return self._avg_receipt_value
+        average = self._sales_total / self._receipts if self._receipts else 0
+        return f"${average:,.2f}"
 
-    @Property(str, constant=True)
+    @Property(str, notify=statsChanged)
     def lowStockCount(self):
-        return self._low_stock_count
+        return str(self._low_stock)
+
+    def _on_activity(self, events):
+        self.activityChanged.emit()
+
+    def get_activity(self):
+        """Latest audit entries from memory; stock moves are left to the audit table"""
+        audit_log = get_audit_log()
+        return audit_log.recent(ACTIVITY_LIMIT, exclude=("stock",)) if audit_log else []
+
+    @Slot()
+    def load_stats(self):
+        """Compute today's figures from the database"""
+        self._day = date.today()
+        start = datetime.combine(self._day, time.min)
+        self._receipts, self._sales_total = self.db_session.query(
+            func.count(Invoice.id), func.coalesce(func.sum(Invoice.total_amount), 0)
+        ).filter(Invoice.date >= start, Invoice.date < start + timedelta(days=1)).one()
+        self._low_stock = self._count_low_stock()
+        self.statsChanged.emit()
+
+    def _count_low_stock(self):
+        return self.db_session.query(func.count(Product.id)).filter(Product.quantity <= LOW_STOCK_THRESHOLD).scalar()
+
+    def _on_events(self, events):
+        """Apply committed sales and stock changes to the figures without re-querying"""
+        if date.today() != self._day:
+            self.load_stats()
+            return
+
+        for event in events:
+            if isinstance(event, (InvoiceCreated, InvoiceCancelled)) and event.date.date() == self._day:
+                sign = 1 if isinstance(event, InvoiceCreated) else -1
+                self._receipts += sign
+                self._sales_total += sign * event.total_amount
+            elif isinstance(event, StockChanged):
+                is_low = event.quantity <= LOW_STOCK_THRESHOLD
+                was_low = event.previous <= LOW_STOCK_THRESHOLD
+                self._low_stock += is_low - was_low
+
+        if any(
+            isinstance(event, (ProductCreated, ProductDeleted))
+            or isinstance(event, ProductsAdjusted) and event.field == "quantity"
+            for event in events
+        ):
+            # Their stock is not in the event
+            self._low_stock = self._count_low_stock()
+        self.statsChanged.emit()
+
+    @Property(bool, notify=lockedChanged)
+    def locked(self):
+        return self._locked
+
+    @Slot()
+    def lock(self):
+        """Hand the till over without tearing down the dashboard"""
+        if not self._locked:
+            self._locked = True
+            self.lockedChanged.emit(True)
+
+    def switch_user(self, user):
+        """Continue with `user` on the unlocked dashboard"""
+        if user is not self.current_user:
+            self.current_user = user
+            self.currentUserChanged.emit(user)
+        if self._locked:
+            self._locked = False
+            self.lockedChanged.emit(False)
 
     logoutRequested = Signal()
 
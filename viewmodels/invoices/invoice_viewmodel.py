@@ -1,8 +1,12 @@
-from PySide6.QtCore import QObject, Signal, Slot, Property
+from PySide6.QtCore import QObject, Signal, Slot, Property, QThreadPool
 from typing import List, Optional, Dict
 from core.services.invoice_service import InvoiceService
+from core.services.export_service import ExportService
+from viewmodels.base_vm import EventSubscriber, PageLoader, Worker
+from core.events import InvoiceCancelled, InvoiceCreated
 from models.invoice import Invoice
 from sqlalchemy.orm import Session
+from datetime import date
 import math
 
 class InvoiceViewModel(QObject):
@@ -15,6 +19,10 @@ class InvoiceViewModel(QObject):
     # Signal to notify when details are loaded
     invoiceDetailsLoaded = Signal(dict) 
 
+    exportingChanged = Signal(bool)
+    exportProgress = Signal(int, int) # rows written, total rows
+    exportFinished = Signal(str, int) # path, rows written
+
     def __init__(self, db_session: Session):
         super().__init__()
         self.db_session = db_session
@@ -29,6 +37,10 @@ class InvoiceViewModel(QObject):
         self._is_loading = False
         self._error = ""
         self._success = ""
+        self.page_loader = PageLoader(db_session, self._fetch_page)
+        self._exporting = False
+        self._export_worker = None
+        self.subscriber = EventSubscriber(self._on_events, [InvoiceCreated, InvoiceCancelled], parent=self)
 
         # Initial load
         self.load_invoices()
@@ -63,6 +75,16 @@ class InvoiceViewModel(QObject):
             self._success = value
             self.successChanged.emit(value)
 
+    @Property(bool, notify=exportingChanged)
+    def exporting(self):
+        return self._exporting
+
+    @exporting.setter
+    def exporting(self, value):
+        if self._exporting != value:
+            self._exporting = value
+            self.exportingChanged.emit(value)
+
     @Property(int, notify=paginationChanged)
     def currentPage(self):
         return self._current_page
@@ -83,26 +105,49 @@ class InvoiceViewModel(QObject):
         self.isLoading = True
         self.error = ""
         try:
+            self._invoices, self._total_items = self.page_loader.load(
+                self._search_query, self._current_page, self._per_page
+            )
             if self._search_query:
                 # Search mode (no pagination for now in search as per service implementation)
-                self._invoices = self.invoice_service.search_invoices(self._search_query)
-                self._total_items = len(self._invoices)
                 self._total_pages = 1
             else:
-                # Pagination mode
-                self._invoices, self._total_items = self.invoice_service.get_invoices_paginated(
-                    self._current_page, self._per_page
-                )
                 self._total_pages = math.ceil(self._total_items / self._per_page) if self._total_items > 0 else 1
             
             self.invoicesChanged.emit()
             self.paginationChanged.emit()
+
+            if self._current_page < self._total_pages:
+                self.page_loader.prefetch(self._search_query, self._current_page + 1, self._per_page)
             
         except Exception as e:
             self.error = f"Failed to load invoices: {str(e)}"
         finally:
             self.isLoading = False
 
+    def _on_events(self, events):
+        """
+        Invoices are listed oldest first, so new ones only land on the last
+        page; a cancellation shifts every page after it.
+        """
+        self.page_loader.invalidate()
+        cancelled = any(isinstance(event, InvoiceCancelled) for event in events)
+        if cancelled or self._search_query or self._current_page >= self._total_pages:
+            self.load_invoices()
+            return
+
+        self._total_items += sum(isinstance(event, InvoiceCreated) for event in events)
+        self._total_pages = math.ceil(self._total_items / self._per_page) if self._total_items > 0 else 1
+        self.paginationChanged.emit()
+
+    @staticmethod
+    def _fetch_page(db: Session, query: str, page: int, per_page: int):
+        service = InvoiceService(db)
+        if query:
+            results = service.search_invoices(query)
+            return results, len(results)
+        return service.get_invoices_paginated(page, per_page)
+
     @Slot(str)
     def search(self, query: str):
         self._search_query = query.strip()
@@ -134,3 +179,53 @@ class InvoiceViewModel(QObject):
             self.error = f"Failed to load details: {str(e)}"
         finally:
             self.isLoading = False
+
+    EXPORT_KINDS = ("invoices", "items", "products")
+
+    def startExport(self, kind: str, path: str, start: date, end: date):
+        """Write the export on the thread pool; progress arrives through exportProgress"""
+        if self._exporting:
+            self.error = "An export is already running"
+            return
+        if kind not in self.EXPORT_KINDS:
+            self.error = f"Unknown export: {kind}"
+            return
+        if end < start:
+            self.error = "End date must not be before start date"
+            return
+
+        self.error = ""
+        self.exporting = True
+        self._export_worker = Worker(self._run_export, kind, path, start, end)
+        self._export_worker.signals.result.connect(self._on_export_done)
+        self._export_worker.signals.error.connect(self._on_export_failed)
+        QThreadPool.globalInstance().start(self._export_worker)
+
+    def _run_export(self, kind: str, path: str, start: date, end: date) -> int:
+        # The UI keeps using self.db_session, so the export gets its own
+        db = Session(bind=self.db_session.get_bind())
+        try:
+            service = ExportService(db)
+            # Emitted from the pool thread; Qt queues it to the UI thread
+            progress = self.exportProgress.emit
+            if kind == "invoices":
+                return service.export_invoices(path, start, end, progress)
+            if kind == "items":
+                return service.export_invoice_items(path, start, end, progress)
+            return service.export_products(path, progress)
+        finally:
+            db.close()
+
+    @Slot(object)
+    def _on_export_done(self, written):
+        path = self._export_worker.args[1]
+        self._export_worker = None
+        self.exporting = False
+        self.exportFinished.emit(path, written)
+        self.success = f"Exported {written} rows to {path}"
+
+    @Slot(str)
+    def _on_export_failed(self, message):
+        self._export_worker = None
+        self.exporting = False
+        self.error = f"Export failed: {message}"
@@ -0,0 +1,156 @@
+from PySide6.QtCore import QObject, Signal, Slot, Property
+from sqlalchemy.orm import Session
+from core.services.cart_service import Cart, CartService
+from core.services.receipt_service import ReceiptSpooler, sale_payload
+from core.events import ProductDeleted, ProductEvent, ProductsAdjusted
+from viewmodels.base_vm import EventSubscriber
+
+class PosViewModel(QObject):
+    lineInserted = Signal(int, object) # row, CartLine
+    lineChanged = Signal(int, object) # row, CartLine
+    lineRemoved = Signal(int) # row
+    cartCleared = Signal()
+    totalsChanged = Signal()
+    errorChanged = Signal(str)
+    successChanged = Signal(str)
+    checkoutCompleted = Signal(object) # sale record, see SalesJournal.record_sale
+    receiptReady = Signal(str) # pdf path
+    receiptFailed = Signal(str)
+
+    def __init__(self, db_session: Session):
+        super().__init__()
+        self.db_session = db_session
+        self.cart_service = CartService(db_session)
+        self.catalog = self.cart_service.catalog
+        self.cart = Cart()
+        self.receipts = ReceiptSpooler()
+        self.subscriber = EventSubscriber(self._on_product_events, [ProductEvent, ProductsAdjusted], parent=self)
+
+        self._error = ""
+        self._success = ""
+
+        # Initial load
+        self.catalog.load()
+
+    @Property(int, notify=totalsChanged)
+    def subtotal(self):
+        return self.cart.subtotal
+
+    @Property(int, notify=totalsChanged)
+    def itemCount(self):
+        return self.cart.item_count
+
+    @Property(int, notify=totalsChanged)
+    def lineCount(self):
+        return len(self.cart)
+
+    @Property(str, notify=errorChanged)
+    def error(self):
+        return self._error
+
+    @error.setter
+    def error(self, value):
+        self._error = value
+        self.errorChanged.emit(value)
+
+    @Property(str, notify=successChanged)
+    def success(self):
+        return self._success
+
+    @success.setter
+    def success(self, value):
+        self._success = value
+        self.successChanged.emit(value)
+
+    def _on_product_events(self, events):
+        """Keep the catalog in step with product edits made elsewhere"""
+        deleted = {event.product_id for event in events if isinstance(event, ProductDeleted)}
+        changed = {event.product_id for event in events if isinstance(event, ProductEvent)}
+        for event in events:
+            if isinstance(event, ProductsAdjusted):
+                changed.update(event.product_ids)
+        self.catalog.discard(list(deleted))
+        self.catalog.refresh(list(changed - deleted))
+
+    def get_lines(self):
+        return self.cart.lines()
+
+    @Slot(str)
+    def scanBarcode(self, barcode: str):
+        barcode = barcode.strip()
+        if not barcode:
+            return
+        entry = self.catalog.lookup(barcode)
+        if entry is None:
+            self.error = f"No product with barcode {barcode}"
+            return
+        try:
+            row, line, is_new = self.cart.add(entry)
+        except ValueError as e:
+            self.error = str(e)
+            return
+
+        if is_new:
+            self.lineInserted.emit(row, line)
+        else:
+            self.lineChanged.emit(row, line)
+        self.totalsChanged.emit()
+
+    @Slot(int, int)
+    def setQuantity(self, product_id: int, quantity: int):
+        entry = self.catalog.get(product_id)
+        try:
+            row, line = self.cart.set_quantity(
+                product_id, quantity, entry.quantity if entry else None
+            )
+        except ValueError as e:
+            self.error = str(e)
+            return
+        self.lineChanged.emit(row, line)
+        self.totalsChanged.emit()
+
+    @Slot(int)
+    def removeLine(self, product_id: int):
+        try:
+            row = self.cart.remove(product_id)
+        except ValueError as e:
+            self.error = str(e)
+            return
+        self.lineRemoved.emit(row)
+        self.totalsChanged.emit()
+
+    @Slot()
+    def clearCart(self):
+        self.cart.clear()
+        self.cartCleared.emit()
+        self.totalsChanged.emit()
+
+    @Slot()
+    def checkout(self):
+        try:
+            sale = self.cart_service.checkout(self.cart)
+        except ValueError as e:
+            self.error = str(e)
+            return
+
+        # The sale is committed: clear the cart and announce it whatever
+        # happens to the receipt, or a second Checkout would sell it again
+        self.checkoutCompleted.emit(sale)
+        self.clearCart()
+        self.success = f"Invoice #{sale['id']} paid: ${sale['total_amount']}"
+
+        # Rendering happens in the spooler's worker process
+        try:
+            self.receipts.submit(sale_payload(sale), on_done=self._on_receipt_done)
+        except Exception as e:
+            self.receiptFailed.emit(f"Receipt failed: {str(e)}")
+
+    def _on_receipt_done(self, future):
+        # Runs on the executor's thread; the signals are queued to the UI thread
+        try:
+            self.receiptReady.emit(future.result())
+        except Exception as e:
+            self.receiptFailed.emit(f"Receipt failed: {str(e)}")
+
+    def shutdown(self):
+        self.receipts.shutdown(wait=False)
@@ -0,0 +1,206 @@
+from PySide6.QtCore import QObject, Signal, Slot, Property, QThreadPool, QTimer
+from sqlalchemy.orm import Session
+from core.services.stocktake_service import StocktakeService, StocktakeSummary
+from viewmodels.base_vm import Worker
+import os
+
+class StocktakeViewModel(QObject):
+    stocktakeChanged = Signal()
+    countsChanged = Signal()
+    errorChanged = Signal(str)
+    successChanged = Signal(str)
+    importingChanged = Signal(bool)
+    importProgress = Signal(int, int) # products staged, total
+
+    # Scans within this window are written in one transaction
+    SCAN_FLUSH_MS = 300
+    VARIANCE_LIMIT = 200
+
+    def __init__(self, db_session: Session):
+        super().__init__()
+        self.db_session = db_session
+        self.stocktake_service = StocktakeService(db_session)
+
+        self._stocktake = None
+        self._summary = StocktakeSummary()
+        self._variances = []
+        self._error = ""
+        self._success = ""
+        self._importing = False
+        self._import_worker = None
+
+        self._scans = []
+        self._scan_timer = QTimer(self)
+        self._scan_timer.setSingleShot(True)
+        self._scan_timer.setInterval(self.SCAN_FLUSH_MS)
+        self._scan_timer.timeout.connect(self._flush_scans)
+
+        self.load()
+
+    @Property(bool, notify=stocktakeChanged)
+    def active(self):
+        return self._stocktake is not None
+
+    @Property(str, notify=stocktakeChanged)
+    def title(self):
+        if self._stocktake is None:
+            return "No stocktake in progress"
+        return f"Stocktake #{self._stocktake.id}, started {self._stocktake.started_at:%Y-%m-%d %H:%M}"
+
+    @Property(bool, notify=importingChanged)
+    def importing(self):
+        return self._importing
+
+    @importing.setter
+    def importing(self, value):
+        if self._importing != value:
+            self._importing = value
+            self.importingChanged.emit(value)
+
+    @Property(str, notify=errorChanged)
+    def error(self):
+        return self._error
+
+    @error.setter
+    def error(self, value):
+        self._error = value
+        self.errorChanged.emit(value)
+
+    @Property(str, notify=successChanged)
+    def success(self):
+        return self._success
+
+    @success.setter
+    def success(self, value):
+        self._success = value
+        self.successChanged.emit(value)
+
+    def get_summary(self):
+        return self._summary
+
+    def get_variances(self):
+        return self._variances
+
+    @Slot()
+    def load(self):
+        self._stocktake = self.stocktake_service.current()
+        self.stocktakeChanged.emit()
+        self._load_counts()
+
+    def _load_counts(self):
+        if self._stocktake is None:
+            self._summary, self._variances = StocktakeSummary(), []
+        else:
+            self._summary = self.stocktake_service.summary(self._stocktake.id)
+            self._variances = self.stocktake_service.variances(self._stocktake.id, self.VARIANCE_LIMIT)
+        self.countsChanged.emit()
+
+    @Slot()
+    def start(self):
+        try:
+            self._stocktake = self.stocktake_service.start()
+            self.stocktakeChanged.emit()
+            self._load_counts()
+        except ValueError as e:
+            self.error = str(e)
+
+    @Slot()
+    def cancel(self):
+        if self._stocktake is None:
+            return
+        self._scan_timer.stop()
+        self._scans = []
+        try:
+            self.stocktake_service.cancel(self._stocktake.id)
+            self.load()
+        except ValueError as e:
+            self.error = str(e)
+
+    @Slot(str)
+    def scan(self, barcode: str):
+        """Count one unit; scans are batched so a fast scanner costs one commit per burst"""
+        if self._stocktake is None:
+            self.error = "Start a stocktake before counting"
+            return
+        self._scans.append(barcode.strip())
+        if not self._scan_timer.isActive():
+            self._scan_timer.start()
+
+    def _flush_scans(self):
+        scans, self._scans = self._scans, []
+        if not scans or self._stocktake is None:
+            return
+        try:
+            unknown = self.stocktake_service.record_scans(self._stocktake.id, scans)
+            if unknown:
+                self.error = f"No product with barcode {', '.join(unknown)}"
+        except ValueError as e:
+            self.error = str(e)
+        self._load_counts()
+
+    @Slot(int, bool)
+    def setApproved(self, product_id: int, approved: bool):
+        try:
+            self.stocktake_service.set_approved(self._stocktake.id, [product_id], approved)
+        except ValueError as e:
+            self.error = str(e)
+            self._load_counts()
+
+    @Slot()
+    def apply(self):
+        if self._stocktake is None:
+            return
+        self._flush_scans()
+        try:
+            changed = self.stocktake_service.apply(self._stocktake.id)
+            self.load()
+            self.success = f"Stock corrected on {changed:,} products"
+        except ValueError as e:
+            self.error = str(e)
+
+    @Slot(str)
+    def importCounts(self, path: str):
+        """Read a CSV/XLSX count sheet on the thread pool"""
+        if self._stocktake is None:
+            self.error = "Start a stocktake before importing counts"
+            return
+        if self._importing:
+            self.error = "An import is already running"
+            return
+        self.importing = True
+        self._import_worker = Worker(self._run_import, self._stocktake.id, path)
+        self._import_worker.signals.result.connect(self._on_import_done)
+        self._import_worker.signals.error.connect(self._on_import_failed)
+        QThreadPool.globalInstance().start(self._import_worker)
+
+    def _run_import(self, stocktake_id: int, path: str):
+        db = Session(bind=self.db_session.get_bind())
+        try:
+            # Emitted from the pool thread; Qt queues it to the UI thread
+            return StocktakeService(db).import_counts(stocktake_id, path, self.importProgress.emit)
+        finally:
+            db.close()
+
+    @Slot(object)
+    def _on_import_done(self, report):
+        path = self._import_worker.args[1]
+        self._import_worker = None
+        self.importing = False
+        self._load_counts()
+        if not report.errors:
+            self.success = f"Counts loaded for {report.created:,} products"
+            return
+
+        report_path = os.path.splitext(path)[0] + "_errors.csv"
+        try:
+            report.write_errors(report_path)
+            where = f"See {report_path}"
+        except OSError:
+            where = "\n".join(f"Row {row}: {message}" for row, message in report.errors[:10])
+        self.error = f"Counts loaded for {report.created:,} products; {len(report.errors):,} rows were skipped. {where}"
+
+    @Slot(str)
+    def _on_import_failed(self, message):
+        self._import_worker = None
+        self.importing = False
+        self.error = f"Import failed: {message}"
@@ -1,17 +1,27 @@
-from PySide6.QtCore import QObject, Signal, Slot, Property
+from PySide6.QtCore import QObject, Signal, Slot, Property, QThreadPool
 from typing import List, Optional
 from core.services.user_service import UserService
+from core.services.user_import_service import UserImportService
+from viewmodels.base_vm import EventSubscriber, PageLoader, Worker, diff_rows, emit_row_ops, entity_id, expire_entities
 from models.user import User
+from core.events import UserCreated, UserDeleted, UserEvent
+from core.security import validate_pin
 from enums.user_role_enum import UserRole
 from sqlalchemy.orm import Session
 import math
+import os
 
 class UserViewModel(QObject):
     usersChanged = Signal()
+    userRowInserted = Signal(int, object) # row, User
+    userRowChanged = Signal(int, object) # row, User
+    userRowRemoved = Signal(int) # row
     paginationChanged = Signal()
     isLoadingChanged = Signal(bool)
     errorChanged = Signal(str)
     successChanged = Signal(str)
+    importingChanged = Signal(bool)
+    importProgress = Signal(int, int) # passwords hashed, total
 
     def __init__(self, db_session: Session):
         super().__init__()
@@ -26,6 +36,10 @@ class UserViewModel(QObject):
         self._is_loading = False
         self._error = ""
         self._success = ""
+        self.page_loader = PageLoader(db_session, self._fetch_page)
+        self._importing = False
+        self._import_worker = None
+        self.subscriber = EventSubscriber(self._on_events, [UserEvent], parent=self)
 
         # Initial load
         self.load_users()
@@ -60,6 +74,16 @@ class UserViewModel(QObject):
             self._success = value
             self.successChanged.emit(value)
 
+    @Property(bool, notify=importingChanged)
+    def importing(self):
+        return self._importing
+
+    @importing.setter
+    def importing(self, value):
+        if self._importing != value:
+            self._importing = value
+            self.importingChanged.emit(value)
+
     @Property(int, notify=paginationChanged)
     def currentPage(self):
         return self._current_page
@@ -77,22 +101,50 @@ class UserViewModel(QObject):
 
     @Slot()
     def load_users(self):
+        self._load_page()
+
+    def _load_page(self, changed=None):
+        """
+        Load the current page. With `changed` set (ids of edited users),
+        emit row signals for the difference to the rows already shown
+        instead of usersChanged.
+        """
+        previous = self._users
         self.isLoading = True
         self.error = ""
         try:
-            self._users, self._total_items = self.user_service.get_users_paginated(
-                self._current_page, self._per_page
-            )
+            self._users, self._total_items = self.page_loader.load("", self._current_page, self._per_page)
             self._total_pages = math.ceil(self._total_items / self._per_page) if self._total_items > 0 else 1
             
-            self.usersChanged.emit()
+            ops = diff_rows(previous, self._users, changed) if changed is not None else None
+            if ops is None:
+                self.usersChanged.emit()
+            else:
+                emit_row_ops(ops, self.userRowInserted, self.userRowChanged, self.userRowRemoved)
             self.paginationChanged.emit()
+
+            if self._current_page < self._total_pages:
+                self.page_loader.prefetch("", self._current_page + 1, self._per_page)
             
         except Exception as e:
             self.error = f"Failed to load users: {str(e)}"
         finally:
             self.isLoading = False
 
+    def _on_events(self, events):
+        """Refresh only what the committed changes touched"""
+        user_ids = {event.user_id for event in events}
+        expire_entities(self.db_session, User, user_ids)
+        self.page_loader.invalidate()
+
+        shown = {entity_id(user) for user in self._users} & user_ids
+        if shown or any(isinstance(event, (UserCreated, UserDeleted)) for event in events):
+            self._load_page(changed=shown)
+
+    @staticmethod
+    def _fetch_page(db: Session, query: str, page: int, per_page: int):
+        return UserService(db).get_users_paginated(page, per_page)
+
     @Slot()
     def nextPage(self):
         if self._current_page < self._total_pages:
@@ -105,17 +157,21 @@ class UserViewModel(QObject):
             self._current_page -= 1
             self.load_users()
 
-    @Slot(str, str, str)
-    def addUser(self, username: str, password: str, role_str: str):
+    @Slot(str, str, str, str)
+    def addUser(self, username: str, password: str, role_str: str, pin: str = ""):
         self.isLoading = True
         self.error = ""
         self.success = ""
         try:
             role = UserRole(role_str)
+            if pin:
+                validate_pin(pin)
             user = self.user_service.create_user(username, password, role)
             if user:
+                if pin:
+                    self.user_service.set_pin(user.id, pin)
                 self.success = "User created successfully"
-                self.load_users()
+                return user
             else:
                 self.error = "Failed to create user"
         except Exception as e:
@@ -123,19 +179,24 @@ class UserViewModel(QObject):
         finally:
             self.isLoading = False
 
-    @Slot(int, str, str, str)
-    def updateUser(self, user_id: int, username: str, role_str: str, password: str = None):
+    @Slot(int, str, str, str, str)
+    def updateUser(self, user_id: int, username: str, role_str: str, password: str = None, pin: str = ""):
         self.isLoading = True
         self.error = ""
         self.success = ""
         try:
             role = UserRole(role_str)
+            if pin:
+                validate_pin(pin)
             # Pass None if password is empty string to avoid changing it
             pwd = password if password else None
             user = self.user_service.update_user(user_id, username, role, pwd)
             if user:
+                # Empty keeps the current PIN
+                if pin:
+                    self.user_service.set_pin(user.id, pin)
                 self.success = "User updated successfully"
-                self.load_users()
+                return user
             else:
                 self.error = "Failed to update user"
         except Exception as e:
@@ -151,10 +212,56 @@ class UserViewModel(QObject):
         try:
             if self.user_service.delete_user(user_id):
                 self.success = "User deleted successfully"
-                self.load_users()
+                if len(self._users) == 1 and self._current_page > 1:
+                    self._current_page -= 1
             else:
                 self.error = "Failed to delete user"
         except Exception as e:
             self.error = f"Error deleting user: {str(e)}"
         finally:
             self.isLoading = False
+
+    @Slot(str)
+    def importUsers(self, path: str):
+        """Import a CSV/XLSX staff list on the thread pool; new rows arrive as UserCreated events"""
+        if self._importing:
+            self.error = "An import is already running"
+            return
+        self.error = ""
+        self.success = ""
+        self.importing = True
+        self._import_worker = Worker(self._run_import, path)
+        self._import_worker.signals.result.connect(self._on_import_done)
+        self._import_worker.signals.error.connect(self._on_import_failed)
+        QThreadPool.globalInstance().start(self._import_worker)
+
+    def _run_import(self, path: str):
+        db = Session(bind=self.db_session.get_bind())
+        try:
+            # Emitted from the pool thread; Qt queues it to the UI thread
+            return UserImportService(db).import_file(path, self.importProgress.emit)
+        finally:
+            db.close()
+
+    @Slot(object)
+    def _on_import_done(self, report):
+        path = self._import_worker.args[0]
+        self._import_worker = None
+        self.importing = False
+        if not report.errors:
+            self.success = f"Imported {report.created} users"
+            return
+
+        report_path = os.path.splitext(path)[0] + "_errors.csv"
+        try:
+            report.write_errors(report_path)
+            where = f"See {report_path}"
+        except OSError:
+            where = "\n".join(f"Row {row}: {message}" for row, message in report.errors[:10])
+        self.error = f"Imported {report.created} users; {len(report.errors)} rows were skipped. {where}"
+
+    @Slot(str)
+    def _on_import_failed(self, message):
+        self._import_worker = None
+        self.importing = False
+        self.error = f"Import failed: {message}"
@@ -0,0 +1,104 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton
+from PySide6.QtCore import Qt, QRegularExpression
+from PySide6.QtGui import QRegularExpressionValidator
+
+from viewmodels.auth.lock_viewmodel import LockViewModel
+from views.components.card_widget import CardWidget
+from views.components.password_field import PasswordField
+from core.security import PIN_MAX_LENGTH
+
+class LockScreen(QWidget):
+    """Covers the dashboard while the till is locked; the pages behind it stay loaded"""
+
+    def __init__(self, viewModel: LockViewModel):
+        super().__init__()
+        self.vm = viewModel
+        self.setObjectName("lockScreen")
+        self.setAttribute(Qt.WA_StyledBackground, True)
+
+        self._build_ui()
+        self._bind_viewmodel()
+
+    def _build_ui(self):
+        main_layout = QVBoxLayout(self)
+        main_layout.setAlignment(Qt.AlignCenter)
+
+        self.card = CardWidget()
+        self.card.setFixedWidth(400)
+        # The blurred shadow costs ~0.4s per repaint without a GPU, paid on
+        # every lock and unlock
+        self.card.setGraphicsEffect(None)
+
+        title = QLabel("Till Locked")
+        title.setAlignment(Qt.AlignCenter)
+        title.setObjectName("loginTitle")
+        self.card.addWidget(title)
+
+        self.user_combo = QComboBox()
+        self.user_combo.setObjectName("dialogCombo")
+        self.user_combo.setFixedHeight(44)
+        self.card.addWidget(self.user_combo)
+
+        self.pin_input = PasswordField("Enter your PIN")
+        self.pin_input.input.setMaxLength(PIN_MAX_LENGTH)
+        self.pin_input.input.setValidator(
+            QRegularExpressionValidator(QRegularExpression(r"\d*"), self.pin_input.input)
+        )
+        self.card.addWidget(self.pin_input)
+
+        self.lbl_error = QLabel()
+        self.lbl_error.setObjectName("errorLabel")
+        self.lbl_error.hide()
+        self.card.addWidget(self.lbl_error)
+
+        self.btn_unlock = QPushButton("Unlock")
+        self.btn_unlock.setCursor(Qt.PointingHandCursor)
+        self.btn_unlock.setFixedHeight(44)
+        self.btn_unlock.setProperty("variant", "accent")
+        self.card.addWidget(self.btn_unlock)
+
+        footer_layout = QHBoxLayout()
+        footer_layout.setAlignment(Qt.AlignCenter)
+        self.btn_logout = QPushButton("Sign out instead")
+        self.btn_logout.setCursor(Qt.PointingHandCursor)
+        self.btn_logout.setProperty("variant", "link")
+        footer_layout.addWidget(self.btn_logout)
+        self.card.addLayout(footer_layout)
+
+        main_layout.addWidget(self.card)
+
+    def _bind_viewmodel(self):
+        self.btn_unlock.clicked.connect(self._unlock)
+        self.pin_input.input.returnPressed.connect(self._unlock)
+
+        self.vm.usersChanged.connect(self._update_users)
+        self.vm.errorChanged.connect(self._on_error)
+
+    def reset(self):
+        """Show the lock screen fresh for the next cashier"""
+        self.pin_input.setText("")
+        self.vm.set_error("")
+        self.vm.load_users()
+        self.pin_input.input.setFocus()
+
+    def _update_users(self):
+        self.user_combo.clear()
+        for user in self.vm.get_users():
+            self.user_combo.addItem(user.user_name, user.id)
+        self.btn_unlock.setEnabled(self.user_combo.count() > 0)
+        if not self.user_combo.count():
+            self.vm.set_error("No user has a PIN yet; sign out to switch users")
+
+    def _unlock(self):
+        user_id = self.user_combo.currentData()
+        if user_id is None:
+            return
+        self.vm.unlockCommand(user_id, self.pin_input.text())
+        self.pin_input.setText("")
+
+    def _on_error(self, message):
+        if message:
+            self.lbl_error.setText(message)
+            self.lbl_error.show()
+        else:
+            self.lbl_error.hide()
@@ -8,6 +8,7 @@ from viewmodels.auth.login_viewmodel import LoginViewModel
 from views.components.input_field import InputField
 from views.components.password_field import PasswordField
 from views.components.card_widget import CardWidget
+from views.windows import show_window
 
 from views.auth.create_account_view import CreateAccountView
 from viewmodels.auth.create_account_viewmodel import CreateAccountViewModel
@@ -19,7 +20,7 @@ class LoginView(QMainWindow):
         self.vm = viewModel
 
         self.setWindowTitle("Login")
-        self.setStyleSheet("QMainWindow { background-color: #3C4753; }")
+        self.setObjectName("loginWindow")
         self.setMinimumSize(900, 700)
 
         self._build_ui()
@@ -54,14 +55,7 @@ class LoginView(QMainWindow):
         # Header
         title = QLabel("Login to Your Account")
         title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet("""
-            QLabel {
-                font-family: Sans-serif;
-                font-weight: bold;
-                font-size: 26px;
-                color: #333333;
-            }
-        """)
+        title.setObjectName("loginTitle")
         form_layout.addWidget(title)
         
         # Input Fields
@@ -73,50 +67,21 @@ class LoginView(QMainWindow):
 
         # Error Message
         self.lbl_error = QLabel("Invalid credentials")
-        self.lbl_error.setStyleSheet("""
-            QLabel {
-                font-family: Sans-serif;
-                font-size: 13px;
-                color: #DC3545;
-            }
-        """)
+        self.lbl_error.setObjectName("errorLabel")
         self.lbl_error.hide()
         form_layout.addWidget(self.lbl_error)
 
         # Remember Me Checkbox
         self.chk_remember = QCheckBox("Remember me")
         self.chk_remember.setCursor(Qt.PointingHandCursor)
-        self.chk_remember.setStyleSheet("""
-            QCheckBox {
-                font-family: Sans-serif;
-                font-size: 14px;
-                color: #333333;
-                spacing: 8px;
-            }
-        """)
+        self.chk_remember.setObjectName("rememberCheck")
         form_layout.addWidget(self.chk_remember)
 
         # Login Button
         self.btn_login = QPushButton("Login")
         self.btn_login.setCursor(Qt.PointingHandCursor)
         self.btn_login.setFixedHeight(44)
-        self.btn_login.setStyleSheet("""
-            QPushButton {
-                background-color: #4C95ED;
-                color: white;
-                font-family: Sans-serif;
-                font-weight: bold;
-                font-size: 16px;
-                border-radius: 10px;
-                border: none;
-            }
-            QPushButton:hover {
-                background-color: #3B82F6;
-            }
-            QPushButton:pressed {
-                background-color: #2563EB;
-            }
-        """)
+        self.btn_login.setProperty("variant", "accent")
         form_layout.addWidget(self.btn_login)
 
         # Footer
@@ -125,24 +90,11 @@ class LoginView(QMainWindow):
         footer_layout.setSpacing(4)
         
         lbl_dont_have = QLabel("Don't have an account?")
-        lbl_dont_have.setStyleSheet("font-family: Sans-serif; font-size: 14px; color: #333333;")
+        lbl_dont_have.setObjectName("footerLabel")
         
         self.btn_create_link = QPushButton("Create one")
         self.btn_create_link.setCursor(Qt.PointingHandCursor)
-        self.btn_create_link.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #4C95ED;
-                font-family: Sans-serif;
-                font-size: 14px;
-                text-decoration: underline;
-                border: none;
-                padding: 0;
-            }
-            QPushButton:hover {
-                color: #3B82F6;
-            }
-        """)
+        self.btn_create_link.setProperty("variant", "link")
         
         footer_layout.addWidget(lbl_dont_have)
         footer_layout.addWidget(self.btn_create_link)
@@ -168,6 +120,7 @@ class LoginView(QMainWindow):
 
         self.vm.loginRequest.connect(self._go_to_dashboard)
         self.vm.errorChanged.connect(self._on_error)
+        self.vm.isBusyChanged.connect(self._on_busy)
         self.vm.goToRegisterRequest.connect(self._go_to_create_account)
 
     def _on_error(self, message):
@@ -177,18 +130,18 @@ class LoginView(QMainWindow):
         else:
             self.lbl_error.hide()
 
+    def _on_busy(self, busy):
+        self.btn_login.setEnabled(not busy)
+        self.btn_login.setText("Signing in..." if busy else "Login")
+
     def _go_to_create_account(self):
         db_session = SessionLocal()
         create_vm = CreateAccountViewModel(db_session)
-        self.create_account_window = CreateAccountView(create_vm)
-        self.create_account_window.show()
-        self.close()
+        show_window(CreateAccountView(create_vm))
 
     def _go_to_dashboard(self):
         from views.dashboard.dashboard_view import DashboardView
         from viewmodels.dashboard.dashboard_viewmodel import DashboardViewModel
         
         dashboard_vm = DashboardViewModel(db_session=self.vm.db_session, current_user=self.vm.logged_user)
-        self.dashboard_window = DashboardView(dashboard_vm)
-        self.dashboard_window.show()
-        self.close()
\ No newline at end of file
+        show_window(DashboardView(dashboard_vm))
\ No newline at end of file
@@ -19,21 +19,7 @@ class CategoryManagementView(QWidget):
         
         self.add_btn = QPushButton("Add New Category")
         self.add_btn.setCursor(Qt.PointingHandCursor)
-        self.add_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #28A745;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-family: Sans-serif;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #218838;
-            }
-        """)
+        self.add_btn.setProperty("variant", "success")
         self.add_btn.clicked.connect(self._show_add_dialog)
         top_bar.addWidget(self.add_btn)
         
@@ -47,6 +33,9 @@ class CategoryManagementView(QWidget):
         
         # Connect ViewModel signals
         self.viewmodel.categoriesChanged.connect(self._update_table)
+        self.viewmodel.categoryRowInserted.connect(self.table.insert_category)
+        self.viewmodel.categoryRowChanged.connect(self.table.update_category)
+        self.viewmodel.categoryRowRemoved.connect(self.table.remove_category)
         self.viewmodel.errorOccurred.connect(self._show_error)
         
         # Initial Load
@@ -74,7 +63,6 @@ class CategoryManagementView(QWidget):
         msg.setIcon(QMessageBox.Question)
         msg.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
         msg.setDefaultButton(QMessageBox.No)
-        self._apply_msg_box_style(msg)
         
         if msg.exec() == QMessageBox.Yes:
             self.viewmodel.delete_category(category_id)
@@ -85,30 +73,4 @@ class CategoryManagementView(QWidget):
         msg.setText(message)
         msg.setIcon(QMessageBox.Critical)
         msg.setStandardButtons(QMessageBox.Ok)
-        self._apply_msg_box_style(msg)
         msg.exec()
-
-    def _apply_msg_box_style(self, msg_box):
-        msg_box.setStyleSheet("""
-            QMessageBox {
-                background-color: white;
-            }
-            QMessageBox QLabel {
-                color: #333333;
-                font-family: Sans-serif;
-                font-size: 14px;
-            }
-            QPushButton {
-                background-color: #2F3C64;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-family: Sans-serif;
-                font-size: 12px;
-                min-width: 60px;
-            }
-            QPushButton:hover {
-                background-color: #1E2A47;
-            }
-        """)
@@ -4,12 +4,7 @@ from PySide6.QtGui import QColor
 class CardWidget(QFrame):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #FFFFFF;
-                border-radius: 18px;
-            }
-        """)
+        self.setObjectName("card")
         
         # Shadow
         shadow = QGraphicsDropShadowEffect(self)
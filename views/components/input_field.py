@@ -12,20 +12,7 @@ class InputField(FormRow):
         self.input.setPlaceholderText(placeholder)
         self.input.setFixedHeight(44)
 
-        self.input.setStyleSheet("""
-            QLineEdit {
-                border: 1px solid #D1D5DB;
-                border-radius: 8px;
-                padding-left: 36px;
-                padding-right: 12px;
-                background: white;
-                font-size: 14px;
-                color: black;
-            }
-            QLineEdit::placeholder {
-                color: #9CA3AF;
-            }
-        """)
+        self.input.setObjectName("formInput")
 
         if icon:
             act = QAction(icon, self.input)
@@ -8,7 +8,7 @@ class TitleLabel(QLabel):
         font = QFont("Sans", 24)
         font.setBold(True)
         self.setFont(font)
-        self.setStyleSheet("color: #2F3C64;")
+        self.setObjectName("titleLabel")
 
 
 class SubtitleLabel(QLabel):
@@ -17,4 +17,4 @@ class SubtitleLabel(QLabel):
 
         font = QFont("Sans", 12)
         self.setFont(font)
-        self.setStyleSheet("color: #6B7280;")
\ No newline at end of file
+        self.setObjectName("subtitleLabel")
\ No newline at end of file
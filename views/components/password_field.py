@@ -13,20 +13,7 @@ class PasswordField(FormRow):
         self.input.setEchoMode(QLineEdit.Password)
         self.input.setFixedHeight(44)
         
-        self.input.setStyleSheet("""
-            QLineEdit {
-                border: 1px solid #D1D5DB;
-                border-radius: 8px;
-                padding-left: 36px;
-                padding-right: 12px;
-                background: white;
-                color: black;
-                font-size: 14px;
-            }
-            QLineEdit::placeholder {
-                color: #9CA3AF;
-            }
-        """)
+        self.input.setObjectName("formInput")
 
         act = QAction(icon, self.input)
         self.input.addAction(act, QLineEdit.LeadingPosition)
@@ -3,12 +3,14 @@ from PySide6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QLabel, QPushB
 from PySide6.QtCore import Qt, QSize, QTimer, QDateTime
 from PySide6.QtGui import QColor, QIcon, QPainter, QBrush, QPen
 
+from core.theme import color
+
 # --- Top Bar ---
 class TopBar(QFrame):
     def __init__(self, username=None, user_role=None):
         super().__init__()
+        self.setObjectName("topBar")
         self.setFixedHeight(70)
-        self.setStyleSheet("background-color: #FFFFFF; border-bottom: 1px solid #E0E0E0;")
         
         layout = QHBoxLayout(self)
         layout.setContentsMargins(20, 0, 20, 0)
@@ -16,9 +18,9 @@ class TopBar(QFrame):
         # System Title
         title_layout = QHBoxLayout()
         icon_label = QLabel("🛒") # Placeholder for icon
-        icon_label.setStyleSheet("font-size: 20px; color: #2F3C64;")
+        icon_label.setObjectName("topBarIcon")
         title = QLabel("POSFlow")
-        title.setStyleSheet("font-family: Sans-serif; font-weight: bold; font-size: 20px; color: #2F3C64;")
+        title.setObjectName("topBarTitle")
         title_layout.addWidget(icon_label)
         title_layout.addWidget(title)
         title_layout.setSpacing(10)
@@ -31,13 +33,13 @@ class TopBar(QFrame):
         info_layout.setSpacing(20)
         
         # User label with dynamic data
-        user_display = f"{username or 'Guest'} ({user_role or 'N/A'})"
-        self.user_label = QLabel(f"User: {user_display}")
+        self.user_label = QLabel()
+        self.set_user(username, user_role)
         # self.date_label = QLabel("Date: --") # Removed as per request
         self.time_label = QLabel("Time: --")
         
         for lbl in [self.user_label, self.time_label]:
-            lbl.setStyleSheet("font-family: Sans-serif; font-size: 14px; color: #333333;")
+            lbl.setObjectName("topBarInfo")
             info_layout.addWidget(lbl)
             
         layout.addLayout(info_layout)
@@ -49,19 +51,7 @@ class TopBar(QFrame):
         
         self.btn_logout = QPushButton("Logout")
         self.btn_logout.setCursor(Qt.PointingHandCursor)
-        self.btn_logout.setStyleSheet("""
-            QPushButton {
-                background-color: #B0D0F5;
-                color: #2F3C64;
-                border-radius: 8px;
-                padding: 8px 16px;
-                font-family: Sans-serif;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #90B0D5;
-            }
-        """)
+        self.btn_logout.setObjectName("logoutButton")
         
         self.btn_settings = QPushButton("⚙️")
         self.btn_lock = QPushButton("🔒")
@@ -69,17 +59,7 @@ class TopBar(QFrame):
         for btn in [self.btn_settings, self.btn_lock]:
             btn.setCursor(Qt.PointingHandCursor)
             btn.setFixedSize(36, 36)
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: transparent;
-                    color: #333333;
-                    font-size: 18px;
-                    border: none;
-                }
-                QPushButton:hover {
-                    color: #000000;
-                }
-            """)
+            btn.setObjectName("topBarIconButton")
             
         actions_layout.addWidget(self.btn_logout)
         actions_layout.addWidget(self.btn_settings)
@@ -93,6 +73,9 @@ class TopBar(QFrame):
         self.timer.timeout.connect(self._update_datetime)
         self.timer.start(1000)  # Update every 1 second
     
+    def set_user(self, username, user_role):
+        self.user_label.setText(f"User: {username or 'Guest'} ({user_role or 'N/A'})")
+
     def _update_datetime(self):
         """Update time label with current values"""
         current_dt = QDateTime.currentDateTime()
@@ -103,8 +86,8 @@ class TopBar(QFrame):
 class Sidebar(QFrame):
     def __init__(self):
         super().__init__()
+        self.setObjectName("sidebar")
         self.setFixedWidth(250)
-        self.setStyleSheet("background-color: #2F3C64; border: none;")
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 20, 0, 20)
@@ -112,27 +95,10 @@ class Sidebar(QFrame):
         
         self.nav_list = QListWidget()
         self.nav_list.setFrameShape(QFrame.NoFrame)
-        self.nav_list.setStyleSheet("""
-            QListWidget {
-                background-color: transparent;
-                outline: none;
-            }
-            QListWidget::item {
-                color: #FFFFFF;
-                padding: 15px 20px;
-                font-family: Sans-serif;
-                font-size: 16px;
-                border-left: 4px solid transparent;
-            }
-            QListWidget::item:hover {
-                background-color: #3E4C7A;
-            }
-            QListWidget::item:selected {
-                background-color: #4A577B;
-                border-left: 4px solid #FFFFFF;
-                color: #FFFFFF;
-            }
-        """)
+        self.nav_list.setObjectName("sidebarNav")
+        # Item size hints are computed when items are added, so the list must
+        # pick up the application stylesheet before that happens
+        self.nav_list.ensurePolished()
         
         items = [
             ("POS Screen", "🖥️"),
@@ -141,12 +107,13 @@ class Sidebar(QFrame):
             ("Reports", "📊"),
             ("Users", "👥"),
             ("Activity Log", "📝"),
+            ("Stocktake", "📋"),
             ("Settings", "⚙️")
         ]
         
         for text, icon in items:
             item = QListWidgetItem(f"{icon}   {text}")
-            if text in ["Reports", "Users", "Activity Log"]:
+            if text in ["Reports", "Users", "Activity Log", "Stocktake"]:
                 item.setText(f"{icon}   {text}   🔒")
             self.nav_list.addItem(item)
             
@@ -155,28 +122,26 @@ class Sidebar(QFrame):
 
 # --- Stat Card ---
 class StatCard(QFrame):
-    def __init__(self, title, value, value_color):
+    def __init__(self, title, value, tone="default"):
         super().__init__()
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #FFFFFF;
-                border-radius: 12px;
-                border: 1px solid #E0E0E0;
-            }
-        """)
+        self.setObjectName("dashboardCard")
         # Shadow effect can be added if needed, but simple border is clean too
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
         
         lbl_title = QLabel(title)
-        lbl_title.setStyleSheet("font-family: Sans-serif; font-size: 14px; color: #333333; border: none;")
+        lbl_title.setObjectName("statTitle")
         
-        lbl_value = QLabel(value)
-        lbl_value.setStyleSheet(f"font-family: Sans-serif; font-size: 24px; font-weight: bold; color: {value_color}; border: none;")
+        self.lbl_value = QLabel(value)
+        self.lbl_value.setObjectName("statValue")
+        self.lbl_value.setProperty("tone", tone)
         
         layout.addWidget(lbl_title)
-        layout.addWidget(lbl_value)
+        layout.addWidget(self.lbl_value)
+
+    def set_value(self, value):
+        self.lbl_value.setText(value)
 
 # --- Chart Card ---
 # Using a placeholder for chart to avoid complex dependency if QtCharts not available or setup complexity
@@ -184,18 +149,12 @@ class StatCard(QFrame):
 class ChartCard(QFrame):
     def __init__(self):
         super().__init__()
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #FFFFFF;
-                border-radius: 12px;
-                border: 1px solid #E0E0E0;
-            }
-        """)
+        self.setObjectName("dashboardCard")
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
         
         header = QLabel("Sales for Last 7 Days")
-        header.setStyleSheet("font-family: Sans-serif; font-size: 18px; font-weight: bold; color: #333333; border: none;")
+        header.setObjectName("cardHeader")
         layout.addWidget(header)
         
         self.chart_area = ChartArea()
@@ -204,7 +163,6 @@ class ChartCard(QFrame):
 class ChartArea(QWidget):
     def __init__(self):
         super().__init__()
-        self.setStyleSheet("border: none;")
         self.setMinimumHeight(200)
 
     def paintEvent(self, event):
@@ -216,7 +174,7 @@ class ChartArea(QWidget):
         h = self.height()
         padding = 30
         
-        painter.setPen(QPen(QColor("#D1D5DB"), 1))
+        painter.setPen(QPen(QColor(color("border")), 1))
         painter.drawLine(padding, h - padding, w - padding, h - padding) # X-axis
         painter.drawLine(padding, padding, padding, h - padding) # Y-axis
         
@@ -232,12 +190,12 @@ class ChartArea(QWidget):
             y = h - padding - val * scale_y
             path_points.append((x, y))
             
-        painter.setPen(QPen(QColor("#28A745"), 3))
+        painter.setPen(QPen(QColor(color("success")), 3))
         for i in range(len(path_points) - 1):
             painter.drawLine(path_points[i][0], path_points[i][1], path_points[i+1][0], path_points[i+1][1])
             
         # Draw dots
-        painter.setBrush(QBrush(QColor("#28A745")))
+        painter.setBrush(QBrush(QColor(color("success"))))
         for x, y in path_points:
             painter.drawEllipse(x - 4, y - 4, 8, 8)
 
@@ -245,51 +203,46 @@ class ChartArea(QWidget):
 class ActivityCard(QFrame):
     def __init__(self):
         super().__init__()
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #FFFFFF;
-                border-radius: 12px;
-                border: 1px solid #E0E0E0;
-            }
-        """)
+        self.setObjectName("dashboardCard")
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
         
         header = QLabel("Recent Activity")
-        header.setStyleSheet("font-family: Sans-serif; font-size: 18px; font-weight: bold; color: #333333; border: none;")
+        header.setObjectName("cardHeader")
         layout.addWidget(header)
-        
-        activities = [
-            "Sale #125 - $20.50 (Completed)",
-            "User login - Jane Doe",
-            "Product update - SKU: 123",
-            "Sale #124 - $15.75 (Completed)",
-            "Receipt print - #123"
-        ]
-        
-        for act in activities:
-            lbl = QLabel(f"• {act}")
-            lbl.setStyleSheet("font-family: Sans-serif; font-size: 14px; color: #333333; border: none; margin-bottom: 5px;")
-            layout.addWidget(lbl)
-            
+
+        self.items_layout = QVBoxLayout()
+        layout.addLayout(self.items_layout)
         layout.addStretch()
 
+    def set_activities(self, entries):
+        """Show AuditEntry objects, newest first"""
+        while self.items_layout.count():
+            self.items_layout.takeAt(0).widget().deleteLater()
+
+        if not entries:
+            entries_text = ["No activity yet"]
+        else:
+            entries_text = [
+                f"{entry.timestamp:%H:%M}  {entry.summary}"
+                + (f" ({entry.user_name})" if entry.user_name and entry.action != "login" else "")
+                for entry in entries
+            ]
+        for text in entries_text:
+            lbl = QLabel(f"• {text}")
+            lbl.setObjectName("activityItem")
+            self.items_layout.addWidget(lbl)
+
 # --- Low Stock Card ---
 class LowStockCard(QFrame):
     def __init__(self):
         super().__init__()
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #FFFFFF;
-                border-radius: 12px;
-                border: 1px solid #E0E0E0;
-            }
-        """)
+        self.setObjectName("dashboardCard")
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
         
         header = QLabel("Low Stock Products")
-        header.setStyleSheet("font-family: Sans-serif; font-size: 18px; font-weight: bold; color: #333333; border: none;")
+        header.setObjectName("cardHeader")
         layout.addWidget(header)
         
         table = QTableWidget(5, 3)
@@ -297,24 +250,7 @@ class LowStockCard(QFrame):
         table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         table.verticalHeader().setVisible(False)
         table.setShowGrid(False)
-        table.setStyleSheet("""
-            QTableWidget {
-                border: none;
-                font-family: Sans-serif;
-            }
-            QHeaderView::section {
-                background-color: white;
-                border: none;
-                border-bottom: 1px solid #E0E0E0;
-                font-weight: bold;
-                color: #333333;
-                padding: 5px;
-            }
-            QTableWidget::item {
-                padding: 5px;
-                border-bottom: 1px solid #F0F0F0;
-            }
-        """)
+        table.setObjectName("lowStockTable")
         
         data = [
             ("Product A", "5", "Warning"),
@@ -330,13 +266,13 @@ class LowStockCard(QFrame):
             
             item_status = QTableWidgetItem(status)
             if status == "Critical":
-                item_status.setForeground(QColor("#DC3545"))
+                item_status.setForeground(QColor(color("danger")))
             else:
-                item_status.setForeground(QColor("#FFC107"))
+                item_status.setForeground(QColor(color("warning")))
             table.setItem(r, 2, item_status)
             
         layout.addWidget(table)
         
         footer = QLabel("Action required: Order more stock!")
-        footer.setStyleSheet("font-family: Sans-serif; font-size: 14px; color: #DC3545; text-decoration: underline; border: none; margin-top: 10px;")
+        footer.setObjectName("lowStockFooter")
         layout.addWidget(footer)
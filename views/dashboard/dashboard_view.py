@@ -1,4 +1,4 @@
-from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget
+from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget
 from PySide6.QtCore import Qt
 
 from viewmodels.dashboard.dashboard_viewmodel import DashboardViewModel
@@ -8,27 +8,35 @@ from views.categories.category_management_view import CategoryManagementView
 from viewmodels.categories.category_viewmodel import CategoryViewModel
 from core.services.category_service import CategoryService
 from views.dashboard.summary_view import SummaryView
+from views.pos.pos_view import PosView
 from views.invoices.invoice_management_view import InvoiceManagementView
 from views.users.user_management_view import UserManagementView
+from views.stocktake.stocktake_view import StocktakeView
+from views.auth.lock_view import LockScreen
+from viewmodels.auth.lock_viewmodel import LockViewModel
+from viewmodels.base_vm import EventSubscriber
+from views.windows import show_window
 
 class DashboardView(QMainWindow):
     def __init__(self, viewModel: DashboardViewModel):
         super().__init__()
         self.vm = viewModel
+        self._released = False
         self.setWindowTitle("POSFlow Dashboard")
         self.setMinimumSize(1280, 800)
         
-        # Main Layout
+        # Main Layout: the dashboard, with the lock screen stacked over it
+        self.root_stack = QStackedWidget()
+        self.setCentralWidget(self.root_stack)
         central = QWidget()
-        self.setCentralWidget(central)
+        self.root_stack.addWidget(central)
         main_layout = QVBoxLayout(central)
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.setSpacing(0)
         
         # 1. Top Bar
-        username = self.vm.current_user.user_name if self.vm.current_user else "Guest"
-        user_role = str(self.vm.current_user.role.value) if self.vm.current_user else "N/A"
-        self.top_bar = TopBar(username=username, user_role=user_role)
+        self.top_bar = TopBar()
+        self._update_user(self.vm.current_user)
         main_layout.addWidget(self.top_bar)
         
         # 2. Content Area (Sidebar + Main Content)
@@ -42,11 +50,11 @@ class DashboardView(QMainWindow):
         
         # Main Content - Stacked Widget
         self.stacked_widget = QStackedWidget()
-        self.stacked_widget.setStyleSheet("background-color: #FFFFFF;")
+        self.stacked_widget.setObjectName("contentStack")
         
-        # View 0: Summary (POS Screen / Dashboard)
-        self.summary_view = SummaryView(self.vm)
-        self.stacked_widget.addWidget(self.summary_view)
+        # View 0: POS Screen
+        self.pos_view = PosView()
+        self.stacked_widget.addWidget(self.pos_view)
         
         # View 1: Products
         self.product_view = ProductManagementView()
@@ -59,9 +67,9 @@ class DashboardView(QMainWindow):
         self.category_view = CategoryManagementView(self.category_vm)
         self.stacked_widget.addWidget(self.category_view)
         
-        # View 3: Reports (Placeholder)
-        self.reports_view = QWidget() # Placeholder
-        self.stacked_widget.addWidget(self.reports_view)
+        # View 3: Reports (Summary dashboard)
+        self.summary_view = SummaryView(self.vm)
+        self.stacked_widget.addWidget(self.summary_view)
 
         # View 4: Users
         self.users_view = UserManagementView()
@@ -71,13 +79,21 @@ class DashboardView(QMainWindow):
         self.invoice_view = InvoiceManagementView()
         self.stacked_widget.addWidget(self.invoice_view) 
         
-        # View 6: Settings (Placeholder)
+        # View 6: Stocktake
+        self.stocktake_view = StocktakeView()
+        self.stacked_widget.addWidget(self.stocktake_view)
+
+        # View 7: Settings (Placeholder)
         self.settings_view = QWidget()
         self.stacked_widget.addWidget(self.settings_view)
 
         content_layout.addWidget(self.stacked_widget)
         
         main_layout.addLayout(content_layout)
+
+        self.lock_vm = LockViewModel(self.vm.db_session)
+        self.lock_screen = LockScreen(self.lock_vm)
+        self.root_stack.addWidget(self.lock_screen)
         
         self._bind_viewmodel()
 
@@ -87,23 +103,44 @@ class DashboardView(QMainWindow):
         
         # Handle Logout Signal
         self.vm.logoutRequested.connect(self._handle_logout)
+
+        # Lock / switch cashier
+        self.top_bar.btn_lock.clicked.connect(self.vm.lock)
+        self.vm.lockedChanged.connect(self._on_locked_changed)
+        self.vm.currentUserChanged.connect(self._update_user)
+        self.lock_vm.unlocked.connect(self.vm.switch_user)
+        self.lock_screen.btn_logout.clicked.connect(self.vm.logout)
         
         # Bind Sidebar Navigation
         self.sidebar.nav_list.currentRowChanged.connect(self._on_nav_changed)
 
     def _on_nav_changed(self, index):
         # Map sidebar index to stacked widget index
-        # 0: POS Screen -> SummaryView
+        # 0: POS Screen -> PosView
         # 1: Products -> ProductManagementView
         # 2: Categories -> CategoryManagementView
-        # 3: Reports -> Placeholder
+        # 3: Reports -> SummaryView
         # 4: Users -> UserManagementView
         # 5: Activity Log -> InvoiceManagementView
-        # 6: Settings -> Placeholder
+        # 6: Stocktake -> StocktakeView
+        # 7: Settings -> Placeholder
         
         if index < self.stacked_widget.count():
             self.stacked_widget.setCurrentIndex(index)
 
+    def _update_user(self, user):
+        if user:
+            self.top_bar.set_user(user.user_name, str(user.role.value))
+        else:
+            self.top_bar.set_user("Guest", "N/A")
+
+    def _on_locked_changed(self, locked):
+        if locked:
+            self.lock_screen.reset()
+            self.root_stack.setCurrentWidget(self.lock_screen)
+        else:
+            self.root_stack.setCurrentIndex(0)
+
     def _handle_logout(self):
         from views.auth.login_view import LoginView
         from viewmodels.auth.login_viewmodel import LoginViewModel
@@ -111,6 +148,28 @@ class DashboardView(QMainWindow):
         
         db_session = SessionLocal()
         login_vm = LoginViewModel(db_session)
-        self.login_window = LoginView(login_vm)
-        self.login_window.show()
-        self.close()
+        show_window(LoginView(login_vm))
+
+    def closeEvent(self, event):
+        self._release()
+        super().closeEvent(event)
+
+    def _release(self):
+        """
+        Once the window goes, its pages stop reacting to bus events and
+        give back their sessions and receipt workers; otherwise every
+        sale would keep refreshing the screens of each earlier login
+        """
+        if self._released:
+            return
+        self._released = True
+        pages = [self.pos_view, self.product_view, self.users_view, self.invoice_view, self.stocktake_view]
+        for vm in [self.vm, self.category_vm, self.lock_vm] + [page.vm for page in pages]:
+            for subscriber in vm.findChildren(EventSubscriber):
+                subscriber.close()
+
+        QApplication.instance().aboutToQuit.disconnect(self.pos_view.vm.shutdown)
+        self.pos_view.vm.shutdown()
+        for page in pages:
+            page.db_session.close()
+        self.vm.db_session.close()
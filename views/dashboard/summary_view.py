@@ -18,27 +18,27 @@ class SummaryView(QWidget):
         # Scroll Area
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
-        scroll_area.setStyleSheet("background-color: #F5F7FA; border: none;")
+        scroll_area.setObjectName("summaryScroll")
         
         scroll_content = QWidget()
-        scroll_content.setStyleSheet("background-color: #F5F7FA;")
+        scroll_content.setObjectName("summaryContent")
         self.scroll_layout = QVBoxLayout(scroll_content)
         self.scroll_layout.setContentsMargins(30, 30, 30, 30)
         self.scroll_layout.setSpacing(30)
         
         # --- Quick Stats ---
         lbl_stats = QLabel("Quick Stats")
-        lbl_stats.setStyleSheet("font-family: Sans-serif; font-size: 20px; font-weight: bold; color: #333333;")
+        lbl_stats.setObjectName("sectionTitle")
         self.scroll_layout.addWidget(lbl_stats)
         
         stats_layout = QHBoxLayout()
         stats_layout.setSpacing(20)
         
-        # Using data from ViewModel (which currently has mock data)
-        self.card_sales = StatCard("Total Daily Sales", self.vm.dailySales, "#28A745")
-        self.card_receipts = StatCard("Number of Receipts Today", self.vm.receiptsCount, "#333333")
-        self.card_avg = StatCard("Average Receipt Value", self.vm.avgReceiptValue, "#4C95ED")
-        self.card_stock = StatCard("Low Stock Products", self.vm.lowStockCount, "#FFC107")
+        # Using data from ViewModel
+        self.card_sales = StatCard("Total Daily Sales", self.vm.dailySales, "success")
+        self.card_receipts = StatCard("Number of Receipts Today", self.vm.receiptsCount)
+        self.card_avg = StatCard("Average Receipt Value", self.vm.avgReceiptValue, "accent")
+        self.card_stock = StatCard("Low Stock Products", self.vm.lowStockCount, "warning")
         
         stats_layout.addWidget(self.card_sales)
         stats_layout.addWidget(self.card_receipts)
@@ -46,6 +46,7 @@ class SummaryView(QWidget):
         stats_layout.addWidget(self.card_stock)
         
         self.scroll_layout.addLayout(stats_layout)
+        self.vm.statsChanged.connect(self._update_stats)
         
         # --- Charts & Activity ---
         mid_section_layout = QHBoxLayout()
@@ -53,6 +54,8 @@ class SummaryView(QWidget):
         
         self.chart_card = ChartCard()
         self.activity_card = ActivityCard()
+        self.activity_card.set_activities(self.vm.get_activity())
+        self.vm.activityChanged.connect(self._update_activity)
         
         mid_section_layout.addWidget(self.chart_card, 2)
         mid_section_layout.addWidget(self.activity_card, 1)
@@ -67,3 +70,12 @@ class SummaryView(QWidget):
         
         scroll_area.setWidget(scroll_content)
         main_layout.addWidget(scroll_area)
+
+    def _update_activity(self):
+        self.activity_card.set_activities(self.vm.get_activity())
+
+    def _update_stats(self):
+        self.card_sales.set_value(self.vm.dailySales)
+        self.card_receipts.set_value(self.vm.receiptsCount)
+        self.card_avg.set_value(self.vm.avgReceiptValue)
+        self.card_stock.set_value(self.vm.lowStockCount)
@@ -0,0 +1,89 @@
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+    QAbstractItemView, QListWidget
+)
+from PySide6.QtCore import Qt, QTimer
+
+from core.query_monitor import QueryMonitor
+
+REFRESH_MS = 1000
+COLUMNS = ["Command", "Runs", "Statements", "Per run", "Max per run", "Total ms"]
+
+
+class QueryOverlay(QWidget):
+    """Developer window over the app with the query monitor's live per-command counts and N+1 flags"""
+
+    def __init__(self, monitor: QueryMonitor, rows: int = 15):
+        super().__init__(None, Qt.Tool | Qt.WindowStaysOnTopHint)
+        self.monitor = monitor
+        self.rows = rows
+        self.setWindowTitle("Queries")
+        self.resize(720, 420)
+
+        self._build_ui()
+        self.dump_btn.clicked.connect(self._dump)
+        self.reset_btn.clicked.connect(self._reset)
+        self.monitor.nPlusOneDetected.connect(lambda *_: self.refresh())
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+
+    def _build_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+        layout.setSpacing(8)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        layout.addWidget(self.table, 3)
+
+        layout.addWidget(QLabel("Possible N+1"))
+        self.n_plus_one_list = QListWidget()
+        layout.addWidget(self.n_plus_one_list, 1)
+
+        bottom = QHBoxLayout()
+        self.status_label = QLabel("")
+        bottom.addWidget(self.status_label)
+        bottom.addStretch()
+        self.reset_btn = QPushButton("Reset")
+        self.reset_btn.setProperty("variant", "cancel")
+        bottom.addWidget(self.reset_btn)
+        self.dump_btn = QPushButton("Dump")
+        self.dump_btn.setProperty("variant", "primary")
+        bottom.addWidget(self.dump_btn)
+        layout.addLayout(bottom)
+
+    def refresh(self):
+        # Nothing to redraw for a hidden window
+        if not self.isVisible():
+            return
+        commands = list(self.monitor.snapshot().items())[:self.rows]
+        self.table.setRowCount(len(commands))
+        for row, (command, stats) in enumerate(commands):
+            values = [
+                command, stats["invocations"], stats["statements"], stats["per_invocation"],
+                stats["max_statements"], f"{stats['total_ms']:.1f}",
+            ]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if col:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, col, item)
+
+        self.n_plus_one_list.clear()
+        for found in self.monitor.n_plus_one():
+            self.n_plus_one_list.addItem(f"{found['command']} ×{found['repeats']} at {found['site']}: {found['sql']}")
+
+    def _dump(self):
+        self.status_label.setText(f"Written to {self.monitor.dump()}")
+
+    def _reset(self):
+        self.monitor.reset()
+        self.status_label.setText("")
+        self.refresh()
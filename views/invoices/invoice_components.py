@@ -1,25 +1,14 @@
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QLabel, QLineEdit, QPushButton, 
     QTableWidget, QTableWidgetItem, QHeaderView, QDialog, QFrame, 
-    QAbstractItemView, QGraphicsDropShadowEffect
+    QAbstractItemView, QGraphicsDropShadowEffect, QComboBox, QDateEdit
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QDate
 from PySide6.QtGui import QColor, QFont
 
-# --- Constants for Styling (Reusing consistent styles) ---
-COLOR_WHITE = "#FFFFFF"
-COLOR_DARK_GREY = "#333333"
-COLOR_LIGHT_GREY = "#9CA3AF"
-COLOR_MEDIUM_GREY = "#6B7280"
-COLOR_BORDER = "#D1D5DB"
-COLOR_GREEN = "#28A745"
-COLOR_RED = "#DC3545"
-COLOR_ORANGE = "#ED6B6B"
-COLOR_NAVY = "#2F3C64"
-FONT_FAMILY = "Sans-serif"
-
 class InvoiceSearchBar(QWidget):
     searchChanged = Signal(str)
+    exportClicked = Signal()
 
     def __init__(self):
         super().__init__()
@@ -30,23 +19,19 @@ class InvoiceSearchBar(QWidget):
         # Search Bar
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search by Invoice ID...")
-        self.search_input.setStyleSheet(f"""
-            QLineEdit {{
-                border: 1px solid {COLOR_BORDER};
-                border-radius: 8px;
-                padding: 10px 16px;
-                font-family: {FONT_FAMILY};
-                font-size: 14px;
-                color: {COLOR_DARK_GREY};
-                background-color: {COLOR_WHITE};
-            }}
-        """)
+        self.search_input.setObjectName("searchInput")
         self.search_input.textChanged.connect(self.searchChanged)
         layout.addWidget(self.search_input, stretch=2)
         
         # Add stretch to keep search bar to the left or fill as needed
         layout.addStretch(1)
 
+        self.export_btn = QPushButton("📤 Export")
+        self.export_btn.setCursor(Qt.PointingHandCursor)
+        self.export_btn.setObjectName("filterButton")
+        self.export_btn.clicked.connect(self.exportClicked)
+        layout.addWidget(self.export_btn)
+
 class InvoiceTable(QWidget):
     viewDetailsClicked = Signal(int) # invoice_id
 
@@ -58,7 +43,7 @@ class InvoiceTable(QWidget):
 
         # Header
         header_lbl = QLabel("Invoices")
-        header_lbl.setStyleSheet(f"font-family: {FONT_FAMILY}; font-weight: bold; font-size: 16px; color: {COLOR_DARK_GREY};")
+        header_lbl.setObjectName("tableHeader")
         layout.addWidget(header_lbl)
 
         # Table
@@ -72,33 +57,7 @@ class InvoiceTable(QWidget):
         self.table.setShowGrid(False)
         self.table.setAlternatingRowColors(True)
         
-        # Table Style
-        self.table.setStyleSheet(f"""
-            QTableWidget {{
-                background-color: {COLOR_WHITE};
-                border: none;
-                gridline-color: transparent;
-                font-family: {FONT_FAMILY};
-            }}
-            QHeaderView::section {{
-                background-color: {COLOR_WHITE};
-                color: {COLOR_DARK_GREY};
-                font-weight: bold;
-                border: none;
-                border-bottom: 2px solid #F0F0F0;
-                padding: 12px;
-                text-align: left;
-            }}
-            QTableWidget::item {{
-                padding: 12px;
-                color: {COLOR_DARK_GREY};
-                border-bottom: 1px solid #F5F5F5;
-            }}
-            QTableWidget::item:selected {{
-                background-color: #F0F9FF;
-                color: {COLOR_DARK_GREY};
-            }}
-        """)
+        self.table.setObjectName("dataTable")
         layout.addWidget(self.table)
 
     def set_invoices(self, invoices):
@@ -130,7 +89,8 @@ class InvoiceTable(QWidget):
             
             view_btn = QPushButton("View Details")
             view_btn.setCursor(Qt.PointingHandCursor)
-            view_btn.setStyleSheet(f"color: {COLOR_NAVY}; background: transparent; border: none; font-weight: bold;")
+            view_btn.setProperty("variant", "rowLink")
+            view_btn.setProperty("tone", "primary")
             view_btn.clicked.connect(lambda checked, iid=invoice.id: self.viewDetailsClicked.emit(iid))
             
             actions_layout.addWidget(view_btn)
@@ -141,7 +101,7 @@ class InvoiceDetailDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle(f"Invoice #{invoice_details['invoice'].id} Details")
         self.setFixedSize(600, 500)
-        self.setStyleSheet(f"background-color: {COLOR_WHITE};")
+        self.setObjectName("formDialog")
         
         # Remove default frame
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
@@ -152,13 +112,7 @@ class InvoiceDetailDialog(QDialog):
         
         # Card Container
         card = QFrame()
-        card.setStyleSheet(f"""
-            QFrame {{
-                background-color: {COLOR_WHITE};
-                border-radius: 12px;
-                border: 1px solid {COLOR_BORDER};
-            }}
-        """)
+        card.setObjectName("dialogCard")
         # Shadow
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(30)
@@ -173,11 +127,11 @@ class InvoiceDetailDialog(QDialog):
         # Header
         header_layout = QHBoxLayout()
         title = QLabel(f"Invoice #{invoice_details['invoice'].id}")
-        title.setStyleSheet(f"color: {COLOR_NAVY}; font-size: 20px; font-weight: bold; font-family: {FONT_FAMILY}; border: none;")
+        title.setObjectName("dialogTitle")
         
         close_btn = QPushButton("✕")
         close_btn.setCursor(Qt.PointingHandCursor)
-        close_btn.setStyleSheet("background: transparent; border: none; font-size: 18px; color: #999;")
+        close_btn.setObjectName("dialogClose")
         close_btn.clicked.connect(self.accept)
         
         header_layout.addWidget(title)
@@ -192,7 +146,7 @@ class InvoiceDetailDialog(QDialog):
         cust_lbl = QLabel(f"Customer: {customer_name}")
         
         for lbl in [date_lbl, cust_lbl]:
-            lbl.setStyleSheet(f"color: {COLOR_DARK_GREY}; font-family: {FONT_FAMILY}; font-size: 14px; border: none;")
+            lbl.setObjectName("dialogInfo")
             info_layout.addWidget(lbl)
             
         card_layout.addLayout(info_layout)
@@ -204,11 +158,7 @@ class InvoiceDetailDialog(QDialog):
         table.verticalHeader().setVisible(False)
         table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         table.setShowGrid(False)
-        table.setStyleSheet(f"""
-            QTableWidget {{ border: 1px solid {COLOR_BORDER}; border-radius: 4px; }}
-            QHeaderView::section {{ background-color: #F8F9FA; border: none; padding: 8px; font-weight: bold; }}
-            QTableWidget::item {{ padding: 8px; border-bottom: 1px solid #EEE; }}
-        """)
+        table.setObjectName("detailTable")
         
         items = invoice_details['items']
         table.setRowCount(len(items))
@@ -222,8 +172,103 @@ class InvoiceDetailDialog(QDialog):
         
         # Total
         total_lbl = QLabel(f"Total Amount: ${invoice_details['invoice'].total_amount:.2f}")
-        total_lbl.setStyleSheet(f"color: {COLOR_GREEN}; font-size: 18px; font-weight: bold; font-family: {FONT_FAMILY}; border: none; margin-top: 10px;")
+        total_lbl.setObjectName("dialogTotal")
         total_lbl.setAlignment(Qt.AlignRight)
         card_layout.addWidget(total_lbl)
         
         main_layout.addWidget(card)
+
+
+class InvoiceExportDialog(QDialog):
+    EXPORTS = [
+        ("Invoices", "invoices"),
+        ("Invoice Items", "items"),
+        ("Products", "products"),
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Export to Excel")
+        self.setFixedSize(420, 420)
+        self.setObjectName("formDialog")
+
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+
+        card = QFrame()
+        card.setObjectName("dialogCard")
+        shadow = QGraphicsDropShadowEffect()
+        shadow.setBlurRadius(30)
+        shadow.setColor(QColor(0, 0, 0, 50))
+        shadow.setYOffset(10)
+        card.setGraphicsEffect(shadow)
+
+        card_layout = QVBoxLayout(card)
+        card_layout.setContentsMargins(30, 30, 30, 30)
+        card_layout.setSpacing(15)
+
+        header = QLabel("Export to Excel")
+        header.setObjectName("dialogTitle")
+        card_layout.addWidget(header)
+
+        kind_label = QLabel("📄 Export")
+        kind_label.setObjectName("fieldLabel")
+        card_layout.addWidget(kind_label)
+        self.kind_combo = QComboBox()
+        for label, kind in self.EXPORTS:
+            self.kind_combo.addItem(label, kind)
+        self.kind_combo.setObjectName("dialogCombo")
+        self.kind_combo.currentIndexChanged.connect(self._update_dates)
+        card_layout.addWidget(self.kind_combo)
+
+        today = QDate.currentDate()
+        self.start_label, self.start_input = self._create_date("📅 From", QDate(today.year(), 1, 1))
+        self.end_label, self.end_input = self._create_date("📅 To", today)
+        for widget in (self.start_label, self.start_input, self.end_label, self.end_input):
+            card_layout.addWidget(widget)
+
+        card_layout.addStretch()
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.setCursor(Qt.PointingHandCursor)
+        cancel_btn.setProperty("variant", "cancel")
+        cancel_btn.clicked.connect(self.reject)
+
+        export_btn = QPushButton("Export")
+        export_btn.setCursor(Qt.PointingHandCursor)
+        export_btn.setProperty("variant", "save")
+        export_btn.clicked.connect(self.accept)
+
+        btn_layout.addWidget(cancel_btn)
+        btn_layout.addWidget(export_btn)
+        card_layout.addLayout(btn_layout)
+
+        main_layout.addWidget(card)
+
+    def _create_date(self, label_text, value):
+        label = QLabel(label_text)
+        label.setObjectName("fieldLabel")
+        edit = QDateEdit(value)
+        edit.setCalendarPopup(True)
+        edit.setDisplayFormat("yyyy-MM-dd")
+        edit.setObjectName("dialogInput")
+        return label, edit
+
+    def _update_dates(self):
+        # Products are a snapshot of the catalog, not a date range
+        dated = self.kind_combo.currentData() != "products"
+        for widget in (self.start_label, self.start_input, self.end_label, self.end_input):
+            widget.setVisible(dated)
+
+    def get_data(self):
+        return {
+            "kind": self.kind_combo.currentData(),
+            "start": self.start_input.date().toPython(),
+            "end": self.end_input.date().toPython(),
+        }
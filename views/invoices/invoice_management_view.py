@@ -1,9 +1,9 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QMessageBox
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QMessageBox, QDialog, QFileDialog, QProgressDialog
 from PySide6.QtCore import Qt
 
 from viewmodels.invoices.invoice_viewmodel import InvoiceViewModel
 from views.invoices.invoice_components import (
-    InvoiceSearchBar, InvoiceTable, InvoiceDetailDialog
+    InvoiceSearchBar, InvoiceTable, InvoiceDetailDialog, InvoiceExportDialog
 )
 from views.products.product_components import PaginationControls # Reuse pagination
 from data.database import SessionLocal
@@ -15,6 +15,7 @@ class InvoiceManagementView(QWidget):
         # Initialize ViewModel
         self.db_session = SessionLocal()
         self.vm = InvoiceViewModel(self.db_session)
+        self.export_progress = None
         
         self._build_ui()
         self._bind_viewmodel()
@@ -39,6 +40,7 @@ class InvoiceManagementView(QWidget):
     def _bind_viewmodel(self):
         # View -> ViewModel
         self.search_bar.searchChanged.connect(self.vm.search)
+        self.search_bar.exportClicked.connect(self._open_export_dialog)
         
         self.table.viewDetailsClicked.connect(self.vm.loadInvoiceDetails)
         
@@ -51,6 +53,8 @@ class InvoiceManagementView(QWidget):
         self.vm.errorChanged.connect(self._show_error)
         self.vm.successChanged.connect(self._show_success)
         self.vm.invoiceDetailsLoaded.connect(self._show_details_dialog)
+        self.vm.exportProgress.connect(self._update_export_progress)
+        self.vm.exportingChanged.connect(self._on_exporting_changed)
         
         # Initial State
         self._update_table()
@@ -71,6 +75,41 @@ class InvoiceManagementView(QWidget):
         dialog = InvoiceDetailDialog(self, details)
         dialog.exec()
 
+    def _open_export_dialog(self):
+        dialog = InvoiceExportDialog(self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        data = dialog.get_data()
+        if data["kind"] == "products":
+            default_name = "products.xlsx"
+        else:
+            default_name = f"{data['kind']}_{data['start']:%Y%m%d}_{data['end']:%Y%m%d}.xlsx"
+        path, _ = QFileDialog.getSaveFileName(self, "Save Export", default_name, "Excel Files (*.xlsx)")
+        if not path:
+            return
+        if not path.endswith(".xlsx"):
+            path += ".xlsx"
+        self.vm.startExport(data["kind"], path, data["start"], data["end"])
+
+    def _on_exporting_changed(self, exporting):
+        self.search_bar.export_btn.setEnabled(not exporting)
+        if exporting:
+            # Cancel isn't offered: the workbook is only valid once closed
+            self.export_progress = QProgressDialog("Exporting...", None, 0, 0, self)
+            self.export_progress.setWindowTitle("Export")
+            self.export_progress.setWindowModality(Qt.WindowModal)
+            self.export_progress.setMinimumDuration(300)
+        elif self.export_progress is not None:
+            self.export_progress.close()
+            self.export_progress = None
+
+    def _update_export_progress(self, written, total):
+        if self.export_progress is None:
+            return
+        self.export_progress.setMaximum(max(total, 1))
+        self.export_progress.setValue(min(written, max(total, 1)))
+        self.export_progress.setLabelText(f"Exported {written:,} of {total:,} rows")
+
     def _show_error(self, message):
         if message:
             msg = QMessageBox(self)
@@ -78,7 +117,6 @@ class InvoiceManagementView(QWidget):
             msg.setText(message)
             msg.setIcon(QMessageBox.Warning)
             msg.setStandardButtons(QMessageBox.Ok)
-            self._apply_msg_box_style(msg)
             msg.exec()
 
     def _show_success(self, message):
@@ -88,30 +126,4 @@ class InvoiceManagementView(QWidget):
             msg.setText(message)
             msg.setIcon(QMessageBox.Information)
             msg.setStandardButtons(QMessageBox.Ok)
-            self._apply_msg_box_style(msg)
             msg.exec()
-
-    def _apply_msg_box_style(self, msg_box):
-        msg_box.setStyleSheet("""
-            QMessageBox {
-                background-color: white;
-            }
-            QMessageBox QLabel {
-                color: #333333;
-                font-family: Sans-serif;
-                font-size: 14px;
-            }
-            QPushButton {
-                background-color: #2F3C64;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-family: Sans-serif;
-                font-size: 12px;
-                min-width: 60px;
-            }
-            QPushButton:hover {
-                background-color: #1E2A47;
-            }
-        """)
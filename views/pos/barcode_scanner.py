@@ -0,0 +1,137 @@
+import time
+from collections import deque
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import QEvent, QObject, Qt, QTimer, Signal
+from PySide6.QtGui import QKeyEvent
+from PySide6.QtWidgets import QApplication, QWidget
+import shiboken6
+
+from core.settings import get_settings
+
+TERMINATOR_KEYS = {
+    "Return": Qt.Key_Return,
+    "Enter": Qt.Key_Enter,
+    "Tab": Qt.Key_Tab,
+}
+
+
+class BarcodeScannerFilter(QObject):
+    """
+    Application-wide event filter for keyboard-wedge scanners.
+
+    Printable key presses are held back while they arrive faster than
+    `max_gap_ms` apart. A burst of at least `min_length` characters that ends
+    with a terminator key is a scan: it is queued and emitted through
+    barcodeScanned in arrival order, and the focused widget never sees it.
+    Anything else (normal typing) is replayed to the widget it was meant for.
+    """
+    barcodeScanned = Signal(str)
+
+    def __init__(
+        self,
+        parent: Optional[QObject] = None,
+        max_gap_ms: int = 30,
+        min_length: int = 4,
+        terminators: Tuple[str, ...] = ("Return", "Enter"),
+        require_terminator: bool = True,
+    ):
+        super().__init__(parent)
+        self.max_gap_ms = max_gap_ms
+        self.min_length = min_length
+        self.terminators = {TERMINATOR_KEYS[name] for name in terminators}
+        self.require_terminator = require_terminator
+
+        # Held-back key presses as (receiver, event copy)
+        self._buffer: List[Tuple[QWidget, QKeyEvent]] = []
+        self._last_key_ms = 0.0
+        self._replaying = False
+
+        self._codes: deque = deque()
+        self._drain_scheduled = False
+
+        self._gap_timer = QTimer(self)
+        self._gap_timer.setSingleShot(True)
+        self._gap_timer.timeout.connect(self._flush)
+
+    @classmethod
+    def from_settings(cls, parent: Optional[QObject] = None) -> "BarcodeScannerFilter":
+        options = dict(get_settings()["scanner"])
+        options.pop("enabled", None)
+        options["terminators"] = tuple(options.get("terminators", ("Return", "Enter")))
+        return cls(parent, **options)
+
+    def install(self, app: Optional[QApplication] = None) -> None:
+        (app or QApplication.instance()).installEventFilter(self)
+
+    def uninstall(self, app: Optional[QApplication] = None) -> None:
+        (app or QApplication.instance()).removeEventFilter(self)
+        self._flush()
+
+    def eventFilter(self, obj, event):
+        # Key events reach the QWindow first and the focused widget after;
+        # only the widget delivery is filtered
+        if self._replaying or event.type() != QEvent.KeyPress or not isinstance(obj, QWidget):
+            return False
+
+        now_ms = self._event_time(event)
+        if self._buffer and now_ms - self._last_key_ms > self.max_gap_ms:
+            self._flush()
+
+        key = event.key()
+        if key in self.terminators:
+            if self._buffer and len(self._buffer) >= self.min_length:
+                self._accept()
+                return True
+            self._flush()
+            return False
+
+        text = event.text()
+        if not text or not text.isprintable() or event.modifiers() & (Qt.ControlModifier | Qt.AltModifier):
+            self._flush()
+            return False
+
+        self._buffer.append((obj, QKeyEvent(
+            event.type(), key, event.modifiers(), text, event.isAutoRepeat(), event.count()
+        )))
+        self._last_key_ms = now_ms
+        self._gap_timer.start(self.max_gap_ms)
+        return True
+
+    def _event_time(self, event) -> float:
+        # Window-system timestamps reflect when the key was pressed, not when
+        # a busy event loop got round to it
+        timestamp = event.timestamp()
+        return float(timestamp) if timestamp else time.monotonic() * 1000
+
+    def _accept(self) -> None:
+        self._gap_timer.stop()
+        code = "".join(event.text() for _, event in self._buffer)
+        self._buffer.clear()
+        self._codes.append(code)
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            QTimer.singleShot(0, self._drain)
+
+    def _flush(self) -> None:
+        """The buffered keys were not a scan: deliver them as typed"""
+        self._gap_timer.stop()
+        if not self._buffer:
+            return
+        if not self.require_terminator and len(self._buffer) >= self.min_length:
+            self._accept()
+            return
+
+        buffered, self._buffer = self._buffer, []
+        self._replaying = True
+        try:
+            for receiver, event in buffered:
+                if shiboken6.isValid(receiver):
+                    QApplication.sendEvent(receiver, event)
+        finally:
+            self._replaying = False
+
+    def _drain(self) -> None:
+        self._drain_scheduled = False
+        while self._codes:
+            self.barcodeScanned.emit(self._codes.popleft())
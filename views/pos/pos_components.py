@@ -0,0 +1,192 @@
+from PySide6.QtWidgets import (
+    QWidget, QHBoxLayout, QVBoxLayout, QLabel, QLineEdit, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFrame, QAbstractItemView
+)
+from PySide6.QtCore import Qt, Signal
+
+class ScanInput(QWidget):
+    barcodeEntered = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(16)
+
+        self.input = QLineEdit()
+        self.input.setPlaceholderText("Scan or type a barcode and press Enter...")
+        self.input.setObjectName("searchInput")
+        self.input.returnPressed.connect(self._submit)
+        layout.addWidget(self.input, stretch=1)
+
+        self.add_btn = QPushButton("Add")
+        self.add_btn.setCursor(Qt.PointingHandCursor)
+        self.add_btn.setProperty("variant", "primary")
+        self.add_btn.clicked.connect(self._submit)
+        layout.addWidget(self.add_btn)
+
+    def _submit(self):
+        text = self.input.text().strip()
+        self.input.clear()
+        if text:
+            self.barcodeEntered.emit(text)
+
+class CartTable(QWidget):
+    quantityChangeRequested = Signal(int, int) # product_id, quantity
+    removeClicked = Signal(int) # product_id
+
+    def __init__(self):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+
+        # Header
+        header_lbl = QLabel("Cart")
+        header_lbl.setObjectName("tableHeader")
+        layout.addWidget(header_lbl)
+
+        # Table
+        self.table = QTableWidget()
+        self.table.setColumnCount(6)
+        self.table.setHorizontalHeaderLabels(["Barcode", "Product", "Unit Price", "Qty", "Total", "Actions"])
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setShowGrid(False)
+        self.table.setAlternatingRowColors(True)
+
+        self.table.setObjectName("dataTable")
+        self.table.setProperty("density", "compact")
+        layout.addWidget(self.table)
+
+    def set_lines(self, lines):
+        self.table.setRowCount(len(lines))
+        for i, line in enumerate(lines):
+            self._fill_row(i, line)
+
+    def insert_line(self, row, line):
+        self.table.insertRow(row)
+        self._fill_row(row, line)
+        self.table.scrollToItem(self.table.item(row, 0))
+
+    def update_line(self, row, line):
+        # Only quantity and total change on a repeat scan
+        self.table.item(row, 3).setText(str(line.quantity))
+        self.table.item(row, 4).setText(f"${line.total_price}")
+        self.table.selectRow(row)
+
+    def remove_line(self, row):
+        self.table.removeRow(row)
+
+    def clear(self):
+        self.table.setRowCount(0)
+
+    def _fill_row(self, row, line):
+        self.table.setItem(row, 0, QTableWidgetItem(line.barcode))
+        self.table.setItem(row, 1, QTableWidgetItem(line.name))
+        self.table.setItem(row, 2, QTableWidgetItem(f"${line.unit_price}"))
+        self.table.setItem(row, 3, QTableWidgetItem(str(line.quantity)))
+        self.table.setItem(row, 4, QTableWidgetItem(f"${line.total_price}"))
+
+        # Actions read the line when clicked, so they stay valid after repeat scans
+        actions_widget = QWidget()
+        actions_layout = QHBoxLayout(actions_widget)
+        actions_layout.setContentsMargins(0, 0, 0, 0)
+        actions_layout.setSpacing(10)
+        actions_layout.setAlignment(Qt.AlignLeft)
+
+        minus_btn = QPushButton("−")
+        minus_btn.setCursor(Qt.PointingHandCursor)
+        minus_btn.setProperty("variant", "rowLink")
+        minus_btn.setProperty("tone", "primary")
+        minus_btn.clicked.connect(
+            lambda checked, l=line: self.quantityChangeRequested.emit(l.product_id, l.quantity - 1)
+        )
+
+        plus_btn = QPushButton("+")
+        plus_btn.setCursor(Qt.PointingHandCursor)
+        plus_btn.setProperty("variant", "rowLink")
+        plus_btn.setProperty("tone", "primary")
+        plus_btn.clicked.connect(
+            lambda checked, l=line: self.quantityChangeRequested.emit(l.product_id, l.quantity + 1)
+        )
+
+        remove_btn = QPushButton("Remove")
+        remove_btn.setCursor(Qt.PointingHandCursor)
+        remove_btn.setProperty("variant", "rowLink")
+        remove_btn.setProperty("tone", "danger")
+        remove_btn.clicked.connect(lambda checked, pid=line.product_id: self.removeClicked.emit(pid))
+
+        actions_layout.addWidget(minus_btn)
+        actions_layout.addWidget(plus_btn)
+        actions_layout.addWidget(remove_btn)
+        self.table.setCellWidget(row, 5, actions_widget)
+
+class CartSummary(QFrame):
+    checkoutClicked = Signal()
+    clearClicked = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self.setObjectName("dashboardCard")
+        self.setFixedWidth(300)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(12)
+
+        title = QLabel("Summary")
+        title.setObjectName("cardHeader")
+        layout.addWidget(title)
+
+        items_title = QLabel("Items")
+        items_title.setObjectName("statTitle")
+        self.items_lbl = QLabel("0")
+        self.items_lbl.setObjectName("statValue")
+        layout.addWidget(items_title)
+        layout.addWidget(self.items_lbl)
+
+        total_title = QLabel("Total")
+        total_title.setObjectName("statTitle")
+        self.total_lbl = QLabel("$0")
+        self.total_lbl.setObjectName("statValue")
+        self.total_lbl.setProperty("tone", "success")
+        layout.addWidget(total_title)
+        layout.addWidget(self.total_lbl)
+
+        self.error_lbl = QLabel("")
+        self.error_lbl.setObjectName("errorLabel")
+        self.error_lbl.setWordWrap(True)
+        layout.addWidget(self.error_lbl)
+
+        self.success_lbl = QLabel("")
+        self.success_lbl.setObjectName("successLabel")
+        self.success_lbl.setWordWrap(True)
+        layout.addWidget(self.success_lbl)
+
+        layout.addStretch()
+
+        self.checkout_btn = QPushButton("Checkout")
+        self.checkout_btn.setCursor(Qt.PointingHandCursor)
+        self.checkout_btn.setProperty("variant", "success")
+        self.checkout_btn.clicked.connect(self.checkoutClicked)
+        layout.addWidget(self.checkout_btn)
+
+        self.clear_btn = QPushButton("Clear Cart")
+        self.clear_btn.setCursor(Qt.PointingHandCursor)
+        self.clear_btn.setProperty("variant", "outline")
+        self.clear_btn.clicked.connect(self.clearClicked)
+        layout.addWidget(self.clear_btn)
+
+    def update_totals(self, item_count, subtotal):
+        self.items_lbl.setText(str(item_count))
+        self.total_lbl.setText(f"${subtotal}")
+        self.checkout_btn.setEnabled(item_count > 0)
+
+    def show_error(self, message):
+        self.error_lbl.setText(message)
+
+    def show_success(self, message):
+        self.success_lbl.setText(message)
@@ -0,0 +1,101 @@
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel
+from PySide6.QtCore import QTimer
+
+from viewmodels.pos.pos_viewmodel import PosViewModel
+from views.pos.pos_components import ScanInput, CartTable, CartSummary
+from views.pos.barcode_scanner import BarcodeScannerFilter
+from core.settings import get_settings
+from data.database import SessionLocal
+
+class PosView(QWidget):
+    def __init__(self):
+        super().__init__()
+
+        # Initialize ViewModel
+        self.db_session = SessionLocal()
+        self.vm = PosViewModel(self.db_session)
+
+        self._build_ui()
+        self._bind_viewmodel()
+
+        # Scanner input goes straight to the cart, whichever widget has focus,
+        # while this screen is up; other screens (stocktake) take scans too
+        self.scanner = None
+        if get_settings()["scanner"]["enabled"]:
+            self.scanner = BarcodeScannerFilter.from_settings(self)
+            self.scanner.barcodeScanned.connect(self.vm.scanBarcode)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.scanner is not None:
+            self.scanner.install()
+
+    def hideEvent(self, event):
+        if self.scanner is not None:
+            self.scanner.uninstall()
+        super().hideEvent(event)
+
+    def _build_ui(self):
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(30)
+
+        left = QVBoxLayout()
+        left.setSpacing(20)
+
+        title = QLabel("POS Screen")
+        title.setObjectName("pageTitle")
+        left.addWidget(title)
+
+        self.scan_input = ScanInput()
+        left.addWidget(self.scan_input)
+
+        self.cart_table = CartTable()
+        left.addWidget(self.cart_table)
+
+        layout.addLayout(left, stretch=1)
+
+        self.summary = CartSummary()
+        layout.addWidget(self.summary)
+
+    def _bind_viewmodel(self):
+        # View -> ViewModel
+        self.scan_input.barcodeEntered.connect(self.vm.scanBarcode)
+        self.cart_table.quantityChangeRequested.connect(self._change_quantity)
+        self.cart_table.removeClicked.connect(self.vm.removeLine)
+        self.summary.checkoutClicked.connect(self.vm.checkout)
+        self.summary.clearClicked.connect(self.vm.clearCart)
+
+        # ViewModel -> View
+        self.vm.lineInserted.connect(self.cart_table.insert_line)
+        self.vm.lineChanged.connect(self.cart_table.update_line)
+        self.vm.lineRemoved.connect(self.cart_table.remove_line)
+        self.vm.cartCleared.connect(self.cart_table.clear)
+        self.vm.totalsChanged.connect(self._update_totals)
+        self.vm.errorChanged.connect(self.summary.show_error)
+        self.vm.successChanged.connect(self._show_success)
+        self.vm.receiptFailed.connect(self.summary.show_error)
+        QApplication.instance().aboutToQuit.connect(self.vm.shutdown)
+        # Start the receipt workers once the UI is up rather than on the first sale
+        QTimer.singleShot(0, self.vm.receipts.start)
+
+        # Initial State
+        self.cart_table.set_lines(self.vm.get_lines())
+        self._update_totals()
+
+    def _change_quantity(self, product_id, quantity):
+        if quantity <= 0:
+            self.vm.removeLine(product_id)
+        else:
+            self.vm.setQuantity(product_id, quantity)
+
+    def _update_totals(self):
+        # A successful change clears the last scan error and sale message
+        self.summary.show_error("")
+        self.summary.show_success("")
+        self.summary.update_totals(self.vm.itemCount, self.vm.subtotal)
+
+    def _show_success(self, message):
+        # Shown in the summary rather than a modal box, so the next
+        # customer's scans go straight on
+        self.summary.show_success(message)
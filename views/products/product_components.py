@@ -6,20 +6,13 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal, QSize
 from PySide6.QtGui import QColor, QIcon, QFont
 
-# --- Constants for Styling ---
-COLOR_WHITE = "#FFFFFF"
-COLOR_DARK_GREY = "#333333"
-COLOR_LIGHT_GREY = "#9CA3AF"
-COLOR_MEDIUM_GREY = "#6B7280"
-COLOR_BORDER = "#D1D5DB"
-COLOR_GREEN = "#28A745"
-COLOR_RED = "#DC3545"
-COLOR_ORANGE = "#ED6B6B"
-COLOR_NAVY = "#2F3C64"
-FONT_FAMILY = "Sans-serif"
+# Styling lives in resources/styles/theme.qss; widgets only set object names
+# and variant properties.
 
 class ProductSearchBar(QWidget):
     addProductClicked = Signal()
+    importClicked = Signal()
+    adjustPricesClicked = Signal()
     searchChanged = Signal(str)
 
     def __init__(self):
@@ -31,70 +24,38 @@ class ProductSearchBar(QWidget):
         # Search Bar
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search products...")
-        self.search_input.setStyleSheet(f"""
-            QLineEdit {{
-                border: 1px solid {COLOR_BORDER};
-                border-radius: 8px;
-                padding: 10px 16px;
-                font-family: {FONT_FAMILY};
-                font-size: 14px;
-                color: {COLOR_DARK_GREY};
-                background-color: {COLOR_WHITE};
-            }}
-        """)
+        self.search_input.setObjectName("searchInput")
         self.search_input.textChanged.connect(self.searchChanged)
         layout.addWidget(self.search_input, stretch=2)
 
         # Category Filter
         self.category_btn = QPushButton("Category Filter")
-        self.category_btn.setStyleSheet(f"""
-            QPushButton {{
-                border: 1px solid {COLOR_BORDER};
-                border-radius: 8px;
-                padding: 10px 16px;
-                font-family: {FONT_FAMILY};
-                font-size: 14px;
-                color: {COLOR_MEDIUM_GREY};
-                background-color: {COLOR_WHITE};
-                text-align: left;
-            }}
-        """)
+        self.category_btn.setObjectName("filterButton")
         layout.addWidget(self.category_btn)
 
         # Status Filter
         self.status_btn = QPushButton("Status Filter")
-        self.status_btn.setStyleSheet(f"""
-            QPushButton {{
-                border: 1px solid {COLOR_BORDER};
-                border-radius: 8px;
-                padding: 10px 16px;
-                font-family: {FONT_FAMILY};
-                font-size: 14px;
-                color: {COLOR_MEDIUM_GREY};
-                background-color: {COLOR_WHITE};
-                text-align: left;
-            }}
-        """)
+        self.status_btn.setObjectName("filterButton")
         layout.addWidget(self.status_btn)
 
+        # Bulk Price Button
+        self.adjust_btn = QPushButton("💲 Adjust Prices")
+        self.adjust_btn.setCursor(Qt.PointingHandCursor)
+        self.adjust_btn.setObjectName("filterButton")
+        self.adjust_btn.clicked.connect(self.adjustPricesClicked)
+        layout.addWidget(self.adjust_btn)
+
+        # Import Button
+        self.import_btn = QPushButton("📥 Import")
+        self.import_btn.setCursor(Qt.PointingHandCursor)
+        self.import_btn.setObjectName("filterButton")
+        self.import_btn.clicked.connect(self.importClicked)
+        layout.addWidget(self.import_btn)
+
         # Add New Product Button
         self.add_btn = QPushButton("Add New Product")
         self.add_btn.setCursor(Qt.PointingHandCursor)
-        self.add_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLOR_GREEN};
-                color: {COLOR_WHITE};
-                border: none;
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-family: {FONT_FAMILY};
-                font-weight: bold;
-                font-size: 14px;
-            }}
-            QPushButton:hover {{
-                background-color: #218838;
-            }}
-        """)
+        self.add_btn.setProperty("variant", "success")
         self.add_btn.clicked.connect(self.addProductClicked)
         layout.addWidget(self.add_btn)
 
@@ -110,7 +71,7 @@ class ProductTable(QWidget):
 
         # Header
         header_lbl = QLabel("Search products")
-        header_lbl.setStyleSheet(f"font-family: {FONT_FAMILY}; font-weight: bold; font-size: 16px; color: {COLOR_DARK_GREY};")
+        header_lbl.setObjectName("tableHeader")
         layout.addWidget(header_lbl)
 
         # Table
@@ -124,91 +85,81 @@ class ProductTable(QWidget):
         self.table.setShowGrid(False)
         self.table.setAlternatingRowColors(True)
         
-        # Table Style
-        self.table.setStyleSheet(f"""
-            QTableWidget {{
-                background-color: {COLOR_WHITE};
-                border: none;
-                gridline-color: transparent;
-                font-family: {FONT_FAMILY};
-            }}
-            QHeaderView::section {{
-                background-color: {COLOR_WHITE};
-                color: {COLOR_DARK_GREY};
-                font-weight: bold;
-                border: none;
-                border-bottom: 2px solid #F0F0F0;
-                padding: 8px 12px;
-                text-align: left;
-            }}
-            QTableWidget::item {{
-                padding: 8px 12px;
-                color: {COLOR_DARK_GREY};
-                border-bottom: 1px solid #F5F5F5;
-            }}
-            QTableWidget::item:selected {{
-                background-color: #F0F9FF;
-                color: {COLOR_DARK_GREY};
-            }}
-        """)
+        self.table.setObjectName("dataTable")
+        self.table.setProperty("density", "compact")
         layout.addWidget(self.table)
 
     def set_products(self, products):
         self.table.setRowCount(len(products))
         for i, product in enumerate(products):
-            # ID/Barcode
-            self.table.setItem(i, 0, QTableWidgetItem(f"{product.barcode}"))
-            
-            # Price
-            self.table.setItem(i, 1, QTableWidgetItem(f"${product.price}"))
-            
-            # Current (Stock with indicator)
-            status_widget = QWidget()
-            status_layout = QHBoxLayout(status_widget)
-            status_layout.setContentsMargins(0, 0, 0, 0)
-            status_layout.setAlignment(Qt.AlignLeft)
-            
-            indicator = QLabel()
-            indicator.setFixedSize(10, 10)
-            is_low_stock = product.quantity <= 10 # Default threshold
-            color = COLOR_RED if is_low_stock else COLOR_GREEN
-            indicator.setStyleSheet(f"background-color: {color}; border-radius: 5px;")
-            
-            text = QLabel(f"{product.quantity} in Stock")
-            text.setStyleSheet(f"margin-left: 5px; color: {COLOR_DARK_GREY};")
-            
-            status_layout.addWidget(indicator)
-            status_layout.addWidget(text)
-            self.table.setCellWidget(i, 2, status_widget)
-            
-            # Category
-            category_name = product.category.name if product.category else "Uncategorized"
-            self.table.setItem(i, 3, QTableWidgetItem(category_name))
-            
-            # Status (Text)
-            status_text = "Low Stock" if is_low_stock else "In Stock"
-            self.table.setItem(i, 4, QTableWidgetItem(status_text))
-            
-            # Actions
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(0, 0, 0, 0)
-            actions_layout.setSpacing(10)
-            actions_layout.setAlignment(Qt.AlignLeft)
-            
-            edit_btn = QPushButton("Edit")
-            edit_btn.setCursor(Qt.PointingHandCursor)
-            edit_btn.setStyleSheet(f"color: {COLOR_ORANGE}; background: transparent; border: none; font-weight: bold;")
-            edit_btn.clicked.connect(lambda checked, pid=product.id: self.editProductClicked.emit(pid))
-            
-            delete_btn = QPushButton("Delete")
-            delete_btn.setCursor(Qt.PointingHandCursor)
-            delete_btn.setStyleSheet(f"color: {COLOR_RED}; background: transparent; border: none; font-weight: bold;")
-            delete_btn.clicked.connect(lambda checked, pid=product.id: self.deleteProductClicked.emit(pid))
-            
-            actions_layout.addWidget(edit_btn)
-            actions_layout.addWidget(delete_btn)
-            self.table.setCellWidget(i, 5, actions_widget)
+            self._fill_row(i, product)
+
+    def insert_product(self, row, product):
+        self.table.insertRow(row)
+        self._fill_row(row, product)
+
+    def update_product(self, row, product):
+        self._fill_row(row, product)
+
+    def remove_product(self, row):
+        self.table.removeRow(row)
+
+    def _fill_row(self, row, product):
+        # ID/Barcode
+        self.table.setItem(row, 0, QTableWidgetItem(f"{product.barcode}"))
+        
+        # Price
+        self.table.setItem(row, 1, QTableWidgetItem(f"${product.price}"))
+        
+        # Current (Stock with indicator)
+        status_widget = QWidget()
+        status_layout = QHBoxLayout(status_widget)
+        status_layout.setContentsMargins(0, 0, 0, 0)
+        status_layout.setAlignment(Qt.AlignLeft)
+        
+        indicator = QLabel()
+        indicator.setFixedSize(10, 10)
+        is_low_stock = product.quantity <= 10 # Default threshold
+        indicator.setObjectName("stockIndicator")
+        indicator.setProperty("level", "low" if is_low_stock else "ok")
+        
+        text = QLabel(f"{product.quantity} in Stock")
+        text.setObjectName("stockText")
+        
+        status_layout.addWidget(indicator)
+        status_layout.addWidget(text)
+        self.table.setCellWidget(row, 2, status_widget)
+        
+        # Category
+        category_name = product.category.name if product.category else "Uncategorized"
+        self.table.setItem(row, 3, QTableWidgetItem(category_name))
+        
+        # Status (Text)
+        status_text = "Low Stock" if is_low_stock else "In Stock"
+        self.table.setItem(row, 4, QTableWidgetItem(status_text))
+        
+        # Actions
+        actions_widget = QWidget()
+        actions_layout = QHBoxLayout(actions_widget)
+        actions_layout.setContentsMargins(0, 0, 0, 0)
+        actions_layout.setSpacing(10)
+        actions_layout.setAlignment(Qt.AlignLeft)
+        
+        edit_btn = QPushButton("Edit")
+        edit_btn.setCursor(Qt.PointingHandCursor)
+        edit_btn.setProperty("variant", "rowLink")
+        edit_btn.setProperty("tone", "warning")
+        edit_btn.clicked.connect(lambda checked, pid=product.id: self.editProductClicked.emit(pid))
+        
+        delete_btn = QPushButton("Delete")
+        delete_btn.setCursor(Qt.PointingHandCursor)
+        delete_btn.setProperty("variant", "rowLink")
+        delete_btn.setProperty("tone", "danger")
+        delete_btn.clicked.connect(lambda checked, pid=product.id: self.deleteProductClicked.emit(pid))
+        
+        actions_layout.addWidget(edit_btn)
+        actions_layout.addWidget(delete_btn)
+        self.table.setCellWidget(row, 5, actions_widget)
 
 class PaginationControls(QWidget):
     prevClicked = Signal()
@@ -220,51 +171,27 @@ class PaginationControls(QWidget):
         layout.setContentsMargins(0, 20, 0, 0)
         
         self.info_lbl = QLabel("Showing 0-0 of 0 products")
-        self.info_lbl.setStyleSheet(f"color: {COLOR_DARK_GREY}; font-family: {FONT_FAMILY};")
+        self.info_lbl.setObjectName("paginationInfo")
         layout.addWidget(self.info_lbl)
         
         layout.addStretch()
         
         self.prev_btn = QPushButton("<< Prev")
         self.prev_btn.setCursor(Qt.PointingHandCursor)
-        self.prev_btn.setStyleSheet(self._get_btn_style())
+        self.prev_btn.setObjectName("pageButton")
         self.prev_btn.clicked.connect(self.prevClicked)
         layout.addWidget(self.prev_btn)
         
         self.page_lbl = QPushButton("1")
-        self.page_lbl.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLOR_NAVY};
-                color: {COLOR_WHITE};
-                border-radius: 4px;
-                padding: 5px 12px;
-                font-family: {FONT_FAMILY};
-                border: none;
-            }}
-        """)
+        self.page_lbl.setObjectName("pageCurrent")
         layout.addWidget(self.page_lbl)
         
         self.next_btn = QPushButton("Next >>")
         self.next_btn.setCursor(Qt.PointingHandCursor)
-        self.next_btn.setStyleSheet(self._get_btn_style())
+        self.next_btn.setObjectName("pageButton")
         self.next_btn.clicked.connect(self.nextClicked)
         layout.addWidget(self.next_btn)
 
-    def _get_btn_style(self):
-        return f"""
-            QPushButton {{
-                background-color: {COLOR_WHITE};
-                color: {COLOR_DARK_GREY};
-                border: 1px solid {COLOR_BORDER};
-                border-radius: 4px;
-                padding: 5px 10px;
-                font-family: {FONT_FAMILY};
-            }}
-            QPushButton:hover {{
-                background-color: #F5F5F5;
-            }}
-        """
-
     def update_state(self, current_page, total_pages, total_items, per_page):
         start = (current_page - 1) * per_page + 1 if total_items > 0 else 0
         end = min(current_page * per_page, total_items)
@@ -281,7 +208,7 @@ class AddEditProductDialog(QDialog):
         self.categories = categories or []
         self.setWindowTitle("Add/Edit Product")
         self.setFixedSize(450, 650)
-        self.setStyleSheet(f"background-color: {COLOR_WHITE};")
+        self.setObjectName("formDialog")
         
         # Remove default frame and make it look like a card
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
@@ -292,13 +219,7 @@ class AddEditProductDialog(QDialog):
         
         # Card Container
         card = QFrame()
-        card.setStyleSheet(f"""
-            QFrame {{
-                background-color: {COLOR_WHITE};
-                border-radius: 12px;
-                border: 1px solid {COLOR_BORDER};
-            }}
-        """)
+        card.setObjectName("dialogCard")
         # Shadow
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(30)
@@ -312,7 +233,7 @@ class AddEditProductDialog(QDialog):
         
         # Header
         header = QLabel("Add/Edit Product")
-        header.setStyleSheet(f"color: {COLOR_NAVY}; font-size: 20px; font-weight: bold; font-family: {FONT_FAMILY}; border: none;")
+        header.setObjectName("dialogTitle")
         card_layout.addWidget(header)
         
         # Fields
@@ -322,20 +243,11 @@ class AddEditProductDialog(QDialog):
         # Barcode - show for editing (read-only), auto-generated for new products
         if product:
             barcode_label = QLabel("🔢 Barcode (Auto-generated)")
-            barcode_label.setStyleSheet(f"font-weight: bold; color: {COLOR_DARK_GREY};")
+            barcode_label.setObjectName("fieldLabel")
             card_layout.addWidget(barcode_label)
             
             barcode_display = QLabel(product.barcode)
-            barcode_display.setStyleSheet(f"""
-                QLabel {{
-                    border: 1px solid {COLOR_BORDER};
-                    border-radius: 6px;
-                    padding: 10px;
-                    font-family: {FONT_FAMILY};
-                    color: {COLOR_MEDIUM_GREY};
-                    background-color: #F5F5F5;
-                }}
-            """)
+            barcode_display.setObjectName("readonlyField")
             card_layout.addWidget(barcode_display)
         
         self.price_input = self._create_input("Price", "💲 Price", str(product.price) if product else "")
@@ -345,7 +257,9 @@ class AddEditProductDialog(QDialog):
         card_layout.addWidget(self.quantity_input)
         
         # Category Dropdown
-        card_layout.addWidget(QLabel("📂 Category"))
+        category_label = QLabel("📂 Category")
+        category_label.setObjectName("fieldLabel")
+        card_layout.addWidget(category_label)
         self.category_combo = QComboBox()
         self.category_combo.addItem("Select Category", None)
         for cat in self.categories:
@@ -356,50 +270,7 @@ class AddEditProductDialog(QDialog):
             if index >= 0:
                 self.category_combo.setCurrentIndex(index)
                 
-        self.category_combo.setStyleSheet(f"""
-            QComboBox {{
-                border: 1px solid {COLOR_BORDER};
-                border-radius: 6px;
-                padding: 10px;
-                font-family: {FONT_FAMILY};
-                color: {COLOR_DARK_GREY};
-                background-color: {COLOR_WHITE};
-            }}
-            QComboBox::drop-down {{
-                border: none;
-                width: 20px;
-            }}
-            QComboBox::down-arrow {{
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid {COLOR_DARK_GREY};
-                width: 0;
-                height: 0;
-            }}
-            QComboBox QAbstractItemView {{
-                border: 1px solid {COLOR_BORDER};
-                background-color: {COLOR_WHITE};
-                color: {COLOR_DARK_GREY};
-                selection-background-color: #E8F4F8;
-                selection-color: {COLOR_DARK_GREY};
-                padding: 5px;
-                outline: none;
-            }}
-            QComboBox QAbstractItemView::item {{
-                padding: 8px 10px;
-                color: {COLOR_DARK_GREY};
-                background-color: {COLOR_WHITE};
-            }}
-            QComboBox QAbstractItemView::item:selected {{
-                background-color: #E8F4F8;
-                color: {COLOR_DARK_GREY};
-            }}
-            QComboBox QAbstractItemView::item:hover {{
-                background-color: #F0F9FF;
-                color: {COLOR_DARK_GREY};
-            }}
-        """)
+        self.category_combo.setObjectName("dialogCombo")
         card_layout.addWidget(self.category_combo)
         
         card_layout.addStretch()
@@ -410,38 +281,12 @@ class AddEditProductDialog(QDialog):
         
         cancel_btn = QPushButton("Cancel")
         cancel_btn.setCursor(Qt.PointingHandCursor)
-        cancel_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLOR_WHITE};
-                color: {COLOR_DARK_GREY};
-                border: 1px solid {COLOR_BORDER};
-                border-radius: 6px;
-                padding: 8px 20px;
-                font-weight: bold;
-                font-family: {FONT_FAMILY};
-            }}
-            QPushButton:hover {{
-                background-color: #F5F5F5;
-            }}
-        """)
+        cancel_btn.setProperty("variant", "cancel")
         cancel_btn.clicked.connect(self.reject)
         
         save_btn = QPushButton("Save")
         save_btn.setCursor(Qt.PointingHandCursor)
-        save_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLOR_GREEN};
-                color: {COLOR_WHITE};
-                border: none;
-                border-radius: 6px;
-                padding: 8px 20px;
-                font-weight: bold;
-                font-family: {FONT_FAMILY};
-            }}
-            QPushButton:hover {{
-                background-color: #218838;
-            }}
-        """)
+        save_btn.setProperty("variant", "save")
         save_btn.clicked.connect(self.accept)
         
         btn_layout.addWidget(cancel_btn)
@@ -457,7 +302,7 @@ class AddEditProductDialog(QDialog):
         layout.setSpacing(5)
         
         label = QLabel(label_text)
-        label.setStyleSheet(f"font-weight: bold; color: {COLOR_DARK_GREY};")
+        label.setObjectName("fieldLabel")
         layout.addWidget(label)
         
         input_container = QWidget()
@@ -468,35 +313,13 @@ class AddEditProductDialog(QDialog):
         inp = QLineEdit()
         inp.setPlaceholderText(placeholder)
         inp.setText(text)
-        inp.setStyleSheet(f"""
-            QLineEdit {{
-                border: 1px solid {COLOR_BORDER};
-                border-radius: 6px;
-                padding: 10px;
-                font-family: {FONT_FAMILY};
-                color: {COLOR_DARK_GREY};
-                background-color: {COLOR_WHITE};
-            }}
-        """)
+        inp.setObjectName("dialogInput")
         input_layout.addWidget(inp)
         
         if is_barcode:
             generate_btn = QPushButton("Generate")
             generate_btn.setCursor(Qt.PointingHandCursor)
-            generate_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {COLOR_NAVY};
-                    color: {COLOR_WHITE};
-                    border: none;
-                    border-radius: 6px;
-                    padding: 10px 15px;
-                    font-weight: bold;
-                    font-family: {FONT_FAMILY};
-                }}
-                QPushButton:hover {{
-                    background-color: #1E2A47;
-                }}
-            """)
+            generate_btn.setProperty("variant", "primary")
             generate_btn.clicked.connect(lambda: self.generate_barcode(inp))
             input_layout.addWidget(generate_btn)
             
@@ -519,3 +342,107 @@ class AddEditProductDialog(QDialog):
             "category_id": self.category_combo.currentData(),
             "low_stock_threshold": "10" # Default value as we removed the input
         }
+
+
+class BulkPriceDialog(QDialog):
+    """
+    Price change for a category (or every product matching the search).
+    `preview(category_id, mode, value)` returns the text shown under the
+    fields as they are edited.
+    """
+
+    def __init__(self, parent=None, categories=None, preview=None, search=""):
+        super().__init__(parent)
+        self.preview = preview
+        self.setWindowTitle("Adjust Prices")
+        self.setFixedSize(450, 480)
+        self.setObjectName("formDialog")
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+
+        card = QFrame()
+        card.setObjectName("dialogCard")
+        shadow = QGraphicsDropShadowEffect()
+        shadow.setBlurRadius(30)
+        shadow.setColor(QColor(0, 0, 0, 50))
+        shadow.setYOffset(10)
+        card.setGraphicsEffect(shadow)
+        card_layout = QVBoxLayout(card)
+        card_layout.setContentsMargins(30, 30, 30, 30)
+        card_layout.setSpacing(15)
+
+        header = QLabel("Adjust Prices")
+        header.setObjectName("dialogTitle")
+        card_layout.addWidget(header)
+
+        if search:
+            scope = QLabel(f"Only products matching \"{search}\"")
+            scope.setObjectName("fieldLabel")
+            card_layout.addWidget(scope)
+
+        category_label = QLabel("📂 Category")
+        category_label.setObjectName("fieldLabel")
+        card_layout.addWidget(category_label)
+        self.category_combo = QComboBox()
+        self.category_combo.setObjectName("dialogCombo")
+        self.category_combo.addItem("All Categories", None)
+        for cat in categories or []:
+            self.category_combo.addItem(cat.name, cat.id)
+        card_layout.addWidget(self.category_combo)
+
+        mode_label = QLabel("📈 Change")
+        mode_label.setObjectName("fieldLabel")
+        card_layout.addWidget(mode_label)
+        mode_row = QHBoxLayout()
+        self.mode_combo = QComboBox()
+        self.mode_combo.setObjectName("dialogCombo")
+        self.mode_combo.addItem("By percent", "percent")
+        self.mode_combo.addItem("By amount", "amount")
+        mode_row.addWidget(self.mode_combo)
+        self.value_input = QLineEdit()
+        self.value_input.setObjectName("dialogInput")
+        self.value_input.setPlaceholderText("e.g. 10 or -5")
+        mode_row.addWidget(self.value_input)
+        card_layout.addLayout(mode_row)
+
+        self.preview_label = QLabel()
+        self.preview_label.setObjectName("fieldLabel")
+        self.preview_label.setWordWrap(True)
+        card_layout.addWidget(self.preview_label)
+
+        card_layout.addStretch()
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.setCursor(Qt.PointingHandCursor)
+        cancel_btn.setProperty("variant", "cancel")
+        cancel_btn.clicked.connect(self.reject)
+        self.apply_btn = QPushButton("Apply")
+        self.apply_btn.setCursor(Qt.PointingHandCursor)
+        self.apply_btn.setProperty("variant", "save")
+        self.apply_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(cancel_btn)
+        btn_layout.addWidget(self.apply_btn)
+        card_layout.addLayout(btn_layout)
+
+        main_layout.addWidget(card)
+
+        self.category_combo.currentIndexChanged.connect(self._update_preview)
+        self.mode_combo.currentIndexChanged.connect(self._update_preview)
+        self.value_input.textChanged.connect(self._update_preview)
+        self._update_preview()
+
+    def _update_preview(self):
+        text = self.preview(**self.get_data()) if self.preview and self.value_input.text().strip() else ""
+        self.preview_label.setText(text)
+
+    def get_data(self):
+        return {
+            "category_id": self.category_combo.currentData(),
+            "mode": self.mode_combo.currentData(),
+            "value": self.value_input.text().strip(),
+        }
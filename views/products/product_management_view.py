@@ -1,9 +1,9 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QMessageBox
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QMessageBox, QFileDialog, QProgressDialog
 from PySide6.QtCore import Qt
 
 from viewmodels.products.product_viewmodel import ProductViewModel
 from views.products.product_components import (
-    ProductSearchBar, ProductTable, PaginationControls, AddEditProductDialog
+    ProductSearchBar, ProductTable, PaginationControls, AddEditProductDialog, BulkPriceDialog
 )
 from data.database import SessionLocal
 
@@ -14,6 +14,7 @@ class ProductManagementView(QWidget):
         # Initialize ViewModel
         self.db_session = SessionLocal()
         self.vm = ProductViewModel(self.db_session)
+        self.import_progress = None
         
         self._build_ui()
         self._bind_viewmodel()
@@ -39,6 +40,8 @@ class ProductManagementView(QWidget):
         # View -> ViewModel
         self.search_bar.searchChanged.connect(self.vm.search)
         self.search_bar.addProductClicked.connect(self._open_add_dialog)
+        self.search_bar.importClicked.connect(self._open_import_dialog)
+        self.search_bar.adjustPricesClicked.connect(self._open_adjust_dialog)
         
         self.table.editProductClicked.connect(self._open_edit_dialog)
         self.table.deleteProductClicked.connect(self._confirm_delete)
@@ -48,9 +51,14 @@ class ProductManagementView(QWidget):
         
         # ViewModel -> View
         self.vm.productsChanged.connect(self._update_table)
+        self.vm.productRowInserted.connect(self.table.insert_product)
+        self.vm.productRowChanged.connect(self.table.update_product)
+        self.vm.productRowRemoved.connect(self.table.remove_product)
         self.vm.paginationChanged.connect(self._update_pagination)
         self.vm.errorChanged.connect(self._show_error)
         self.vm.successChanged.connect(self._show_success)
+        self.vm.importingChanged.connect(self._on_importing_changed)
+        self.vm.importProgress.connect(self._update_import_progress)
         
         # Initial State
         self._update_table()
@@ -98,6 +106,40 @@ class ProductManagementView(QWidget):
                 data["low_stock_threshold"]
             )
 
+    def _open_adjust_dialog(self):
+        dialog = BulkPriceDialog(
+            self,
+            categories=self.vm.get_categories(),
+            preview=self.vm.previewPriceAdjustment,
+            search=self.vm.searchQuery,
+        )
+        if dialog.exec():
+            data = dialog.get_data()
+            self.vm.adjustPrices(data["category_id"], data["mode"], data["value"])
+
+    def _open_import_dialog(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Products", "", "Product catalogs (*.csv *.xlsx);;CSV (*.csv);;Excel (*.xlsx)"
+        )
+        if path:
+            self.vm.importProducts(path)
+
+    def _on_importing_changed(self, importing):
+        self.search_bar.import_btn.setEnabled(not importing)
+        if importing:
+            # The row count isn't known while streaming, so the bar just shows activity
+            self.import_progress = QProgressDialog("Importing products...", None, 0, 0, self)
+            self.import_progress.setWindowTitle("Import")
+            self.import_progress.setWindowModality(Qt.WindowModal)
+            self.import_progress.setMinimumDuration(300)
+        elif self.import_progress is not None:
+            self.import_progress.close()
+            self.import_progress = None
+
+    def _update_import_progress(self, rows, rate):
+        if self.import_progress is not None:
+            self.import_progress.setLabelText(f"Read {rows:,} rows ({rate:,.0f} rows/s)")
+
     def _confirm_delete(self, product_id):
         msg = QMessageBox(self)
         msg.setWindowTitle("Confirm Delete")
@@ -105,7 +147,6 @@ class ProductManagementView(QWidget):
         msg.setIcon(QMessageBox.Question)
         msg.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
         msg.setDefaultButton(QMessageBox.No)
-        self._apply_msg_box_style(msg)
         
         if msg.exec() == QMessageBox.Yes:
             self.vm.deleteProduct(product_id)
@@ -117,7 +158,6 @@ class ProductManagementView(QWidget):
             msg.setText(message)
             msg.setIcon(QMessageBox.Warning)
             msg.setStandardButtons(QMessageBox.Ok)
-            self._apply_msg_box_style(msg)
             msg.exec()
 
     def _show_success(self, message):
@@ -127,30 +167,4 @@ class ProductManagementView(QWidget):
             msg.setText(message)
             msg.setIcon(QMessageBox.Information)
             msg.setStandardButtons(QMessageBox.Ok)
-            self._apply_msg_box_style(msg)
             msg.exec()
-
-    def _apply_msg_box_style(self, msg_box):
-        msg_box.setStyleSheet("""
-            QMessageBox {
-                background-color: white;
-            }
-            QMessageBox QLabel {
-                color: #333333;
-                font-family: Sans-serif;
-                font-size: 14px;
-            }
-            QPushButton {
-                background-color: #2F3C64;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-family: Sans-serif;
-                font-size: 12px;
-                min-width: 60px;
-            }
-            QPushButton:hover {
-                background-color: #1E2A47;
-            }
-        """)
@@ -0,0 +1,209 @@
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QMessageBox, QFileDialog, QProgressDialog,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from PySide6.QtCore import Qt
+
+from viewmodels.stocktake.stocktake_viewmodel import StocktakeViewModel
+from views.pos.pos_components import ScanInput
+from views.pos.barcode_scanner import BarcodeScannerFilter
+from core.settings import get_settings
+from data.database import SessionLocal
+
+class StocktakeView(QWidget):
+    def __init__(self):
+        super().__init__()
+
+        # Initialize ViewModel
+        self.db_session = SessionLocal()
+        self.vm = StocktakeViewModel(self.db_session)
+        self.import_progress = None
+        self._filling = False
+
+        self.scanner = None
+        if get_settings()["scanner"]["enabled"]:
+            self.scanner = BarcodeScannerFilter.from_settings(self)
+            self.scanner.barcodeScanned.connect(self.vm.scan)
+
+        self._build_ui()
+        self._bind_viewmodel()
+
+    def _build_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(20)
+
+        # Top Bar (Title + Actions)
+        top_layout = QHBoxLayout()
+        title = QLabel("Stocktake")
+        title.setObjectName("pageTitle")
+        top_layout.addWidget(title)
+        top_layout.addStretch()
+
+        self.start_btn = QPushButton("Start Stocktake")
+        self.start_btn.setCursor(Qt.PointingHandCursor)
+        self.start_btn.setProperty("variant", "primary")
+        top_layout.addWidget(self.start_btn)
+
+        self.import_btn = QPushButton("📥 Import Counts")
+        self.import_btn.setCursor(Qt.PointingHandCursor)
+        self.import_btn.setObjectName("filterButton")
+        top_layout.addWidget(self.import_btn)
+
+        self.cancel_btn = QPushButton("Cancel Stocktake")
+        self.cancel_btn.setCursor(Qt.PointingHandCursor)
+        self.cancel_btn.setProperty("variant", "cancel")
+        top_layout.addWidget(self.cancel_btn)
+
+        self.apply_btn = QPushButton("Apply Approved")
+        self.apply_btn.setCursor(Qt.PointingHandCursor)
+        self.apply_btn.setProperty("variant", "success")
+        top_layout.addWidget(self.apply_btn)
+        layout.addLayout(top_layout)
+
+        self.status_label = QLabel()
+        self.status_label.setObjectName("fieldLabel")
+        layout.addWidget(self.status_label)
+
+        self.scan_input = ScanInput()
+        self.scan_input.input.setPlaceholderText("Scan or type a barcode to count one unit...")
+        self.scan_input.add_btn.setText("Count")
+        layout.addWidget(self.scan_input)
+
+        self.summary_label = QLabel()
+        self.summary_label.setObjectName("fieldLabel")
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(6)
+        self.table.setHorizontalHeaderLabels(["Product", "Barcode", "Expected", "Counted", "Difference", "Apply"])
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setObjectName("dataTable")
+        layout.addWidget(self.table)
+
+    def _bind_viewmodel(self):
+        # View -> ViewModel
+        self.start_btn.clicked.connect(self.vm.start)
+        self.import_btn.clicked.connect(self._open_import_dialog)
+        self.cancel_btn.clicked.connect(self._confirm_cancel)
+        self.apply_btn.clicked.connect(self._confirm_apply)
+        self.scan_input.barcodeEntered.connect(self.vm.scan)
+        self.table.itemChanged.connect(self._on_item_changed)
+
+        # ViewModel -> View
+        self.vm.stocktakeChanged.connect(self._update_state)
+        self.vm.countsChanged.connect(self._update_counts)
+        self.vm.errorChanged.connect(self._show_error)
+        self.vm.successChanged.connect(self._show_success)
+        self.vm.importingChanged.connect(self._on_importing_changed)
+        self.vm.importProgress.connect(self._update_import_progress)
+
+        # Initial State
+        self._update_state()
+        self._update_counts()
+
+    # Scans count stock only while this screen is up
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.scanner is not None:
+            self.scanner.install()
+
+    def hideEvent(self, event):
+        if self.scanner is not None:
+            self.scanner.uninstall()
+        super().hideEvent(event)
+
+    def _update_state(self):
+        active = self.vm.active
+        self.status_label.setText(self.vm.title)
+        self.start_btn.setVisible(not active)
+        for widget in (self.import_btn, self.cancel_btn, self.apply_btn, self.scan_input):
+            widget.setEnabled(active)
+
+    def _update_counts(self):
+        summary = self.vm.get_summary()
+        if self.vm.active:
+            self.summary_label.setText(
+                f"Counted {summary.counted:,} products ({summary.uncounted:,} not counted yet) · "
+                f"{summary.variances:,} differ · net {summary.units:+,} units, "
+                f"{'-' if summary.value < 0 else '+'}${abs(summary.value):,}"
+            )
+        else:
+            self.summary_label.setText("")
+
+        self._filling = True
+        variances = self.vm.get_variances()
+        self.table.setRowCount(len(variances))
+        for row, variance in enumerate(variances):
+            self.table.setItem(row, 0, QTableWidgetItem(variance.name))
+            self.table.setItem(row, 1, QTableWidgetItem(variance.barcode))
+            self.table.setItem(row, 2, QTableWidgetItem(str(variance.expected)))
+            self.table.setItem(row, 3, QTableWidgetItem(str(variance.counted)))
+            self.table.setItem(row, 4, QTableWidgetItem(f"{variance.difference:+}"))
+            approve = QTableWidgetItem()
+            approve.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
+            approve.setCheckState(Qt.Checked if variance.approved else Qt.Unchecked)
+            approve.setData(Qt.UserRole, variance.product_id)
+            self.table.setItem(row, 5, approve)
+        self._filling = False
+
+    def _on_item_changed(self, item):
+        if self._filling or item.column() != 5:
+            return
+        self.vm.setApproved(item.data(Qt.UserRole), item.checkState() == Qt.Checked)
+
+    def _open_import_dialog(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Counts", "", "Count sheets (*.csv *.xlsx);;CSV (*.csv);;Excel (*.xlsx)"
+        )
+        if path:
+            self.vm.importCounts(path)
+
+    def _on_importing_changed(self, importing):
+        self.import_btn.setEnabled(not importing and self.vm.active)
+        if importing:
+            self.import_progress = QProgressDialog("Loading counts...", None, 0, 0, self)
+            self.import_progress.setWindowTitle("Import")
+            self.import_progress.setWindowModality(Qt.WindowModal)
+            self.import_progress.setMinimumDuration(300)
+        elif self.import_progress is not None:
+            self.import_progress.close()
+            self.import_progress = None
+
+    def _update_import_progress(self, staged, total):
+        dialog = self.import_progress
+        if dialog is None:
+            return
+        # A window-modal setValue() processes events, which may finish the import
+        dialog.setLabelText(f"Loaded {staged:,} of {total:,} products")
+        dialog.setMaximum(max(total, 1))
+        dialog.setValue(min(staged, max(total, 1)))
+
+    def _confirm_cancel(self):
+        if self._confirm("Cancel Stocktake", "Discard every count in this stocktake?"):
+            self.vm.cancel()
+
+    def _confirm_apply(self):
+        summary = self.vm.get_summary()
+        if self._confirm("Apply Stocktake", f"Correct the stock of the approved products out of {summary.variances:,} that differ and close this stocktake?"):
+            self.vm.apply()
+
+    def _confirm(self, title, text):
+        msg = QMessageBox(self)
+        msg.setWindowTitle(title)
+        msg.setText(text)
+        msg.setIcon(QMessageBox.Question)
+        msg.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+        msg.setDefaultButton(QMessageBox.No)
+        return msg.exec() == QMessageBox.Yes
+
+    def _show_error(self, message):
+        if message:
+            QMessageBox.warning(self, "Error", message)
+
+    def _show_success(self, message):
+        if message:
+            QMessageBox.information(self, "Success", message)
@@ -3,18 +3,10 @@ from PySide6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QHeaderView, QDialog, QFrame, 
     QAbstractItemView, QComboBox, QMessageBox
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QRegularExpression
+from PySide6.QtGui import QRegularExpressionValidator
 from enums.user_role_enum import UserRole
-
-# --- Constants for Styling (Reusing consistent styles) ---
-COLOR_WHITE = "#FFFFFF"
-COLOR_DARK_GREY = "#333333"
-COLOR_LIGHT_GREY = "#9CA3AF"
-COLOR_BORDER = "#D1D5DB"
-COLOR_GREEN = "#28A745"
-COLOR_RED = "#DC3545"
-COLOR_NAVY = "#2F3C64"
-FONT_FAMILY = "Sans-serif"
+from core.security import PIN_MAX_LENGTH
 
 class UserTable(QWidget):
     editClicked = Signal(object) # User object
@@ -28,7 +20,7 @@ class UserTable(QWidget):
 
         # Header
         header_lbl = QLabel("Users")
-        header_lbl.setStyleSheet(f"font-family: {FONT_FAMILY}; font-weight: bold; font-size: 16px; color: {COLOR_DARK_GREY};")
+        header_lbl.setObjectName("tableHeader")
         layout.addWidget(header_lbl)
 
         # Table
@@ -42,108 +34,73 @@ class UserTable(QWidget):
         self.table.setShowGrid(False)
         self.table.setAlternatingRowColors(True)
         
-        # Table Style
-        self.table.setStyleSheet(f"""
-            QTableWidget {{
-                background-color: {COLOR_WHITE};
-                border: none;
-                gridline-color: transparent;
-                font-family: {FONT_FAMILY};
-                font-size: 16px;
-            }}
-            QHeaderView::section {{
-                background-color: {COLOR_WHITE};
-                color: {COLOR_DARK_GREY};
-                font-weight: bold;
-                font-size: 16px;
-                border: none;
-                border-bottom: 2px solid #F0F0F0;
-                padding: 16px;
-                text-align: left;
-            }}
-            QTableWidget::item {{
-                padding: 16px;
-                color: {COLOR_DARK_GREY};
-                border-bottom: 1px solid #F5F5F5;
-            }}
-            QTableWidget::item:selected {{
-                background-color: #F0F9FF;
-                color: {COLOR_DARK_GREY};
-            }}
-        """)
+        self.table.setObjectName("dataTable")
+        self.table.setProperty("density", "comfortable")
         layout.addWidget(self.table)
         
         # Keep track of user objects
         self.users = []
 
     def set_users(self, users):
-        self.users = users
+        self.users = list(users)
         self.table.setRowCount(len(users))
         for i, user in enumerate(users):
-            # ID
-            self.table.setItem(i, 0, QTableWidgetItem(str(user.id)))
-            
-            # Username
-            self.table.setItem(i, 1, QTableWidgetItem(user.user_name))
-            
-            # Role
-            role_str = user.role.value if hasattr(user.role, 'value') else str(user.role)
-            self.table.setItem(i, 2, QTableWidgetItem(role_str))
-            
-            # Actions
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(5, 5, 5, 5)
-            actions_layout.setSpacing(10)
-            actions_layout.setAlignment(Qt.AlignLeft)
-            
-            edit_btn = QPushButton("Edit")
-            edit_btn.setCursor(Qt.PointingHandCursor)
-            edit_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: #E3F2FD;
-                    color: {COLOR_NAVY};
-                    border: 1px solid #BBDEFB;
-                    border-radius: 6px;
-                    padding: 6px 12px;
-                    font-weight: bold;
-                    font-size: 14px;
-                }}
-                QPushButton:hover {{
-                    background-color: #BBDEFB;
-                }}
-            """)
-            edit_btn.clicked.connect(lambda checked, u=user: self.editClicked.emit(u))
-            
-            delete_btn = QPushButton("Delete")
-            delete_btn.setCursor(Qt.PointingHandCursor)
-            delete_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: #FFEBEE;
-                    color: {COLOR_RED};
-                    border: 1px solid #FFCDD2;
-                    border-radius: 6px;
-                    padding: 6px 12px;
-                    font-weight: bold;
-                    font-size: 14px;
-                }}
-                QPushButton:hover {{
-                    background-color: #FFCDD2;
-                }}
-            """)
-            delete_btn.clicked.connect(lambda checked, uid=user.id: self.deleteClicked.emit(uid))
-            
-            actions_layout.addWidget(edit_btn)
-            actions_layout.addWidget(delete_btn)
-            self.table.setCellWidget(i, 3, actions_widget)
+            self._fill_row(i, user)
+
+    def insert_user(self, row, user):
+        self.users.insert(row, user)
+        self.table.insertRow(row)
+        self._fill_row(row, user)
+
+    def update_user(self, row, user):
+        self.users[row] = user
+        self._fill_row(row, user)
+
+    def remove_user(self, row):
+        del self.users[row]
+        self.table.removeRow(row)
+
+    def _fill_row(self, row, user):
+        # ID
+        self.table.setItem(row, 0, QTableWidgetItem(str(user.id)))
+        
+        # Username
+        self.table.setItem(row, 1, QTableWidgetItem(user.user_name))
+        
+        # Role
+        role_str = user.role.value if hasattr(user.role, 'value') else str(user.role)
+        self.table.setItem(row, 2, QTableWidgetItem(role_str))
+        
+        # Actions
+        actions_widget = QWidget()
+        actions_layout = QHBoxLayout(actions_widget)
+        actions_layout.setContentsMargins(5, 5, 5, 5)
+        actions_layout.setSpacing(10)
+        actions_layout.setAlignment(Qt.AlignLeft)
+        
+        edit_btn = QPushButton("Edit")
+        edit_btn.setCursor(Qt.PointingHandCursor)
+        edit_btn.setProperty("variant", "rowPill")
+        edit_btn.setProperty("tone", "primary")
+        edit_btn.clicked.connect(lambda checked, u=user: self.editClicked.emit(u))
+        
+        delete_btn = QPushButton("Delete")
+        delete_btn.setCursor(Qt.PointingHandCursor)
+        delete_btn.setProperty("variant", "rowPill")
+        delete_btn.setProperty("tone", "danger")
+        delete_btn.clicked.connect(lambda checked, uid=user.id: self.deleteClicked.emit(uid))
+        
+        actions_layout.addWidget(edit_btn)
+        actions_layout.addWidget(delete_btn)
+        self.table.setCellWidget(row, 3, actions_widget)
 
 class AddEditUserDialog(QDialog):
     def __init__(self, parent=None, user=None):
         super().__init__(parent)
         self.user = user
         self.setWindowTitle("Edit User" if user else "Add New User")
-        self.setFixedSize(400, 350)
-        self.setStyleSheet(f"background-color: {COLOR_WHITE};")
+        self.setFixedSize(400, 420)
+        self.setObjectName("formDialog")
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -151,13 +108,13 @@ class AddEditUserDialog(QDialog):
         
         # Title
         title = QLabel("Edit User" if user else "Add New User")
-        title.setStyleSheet(f"font-size: 18px; font-weight: bold; color: {COLOR_DARK_GREY}; margin-bottom: 10px;")
+        title.setObjectName("dialogTitle")
         layout.addWidget(title)
         
         # Username
         self.username_input = QLineEdit()
         self.username_input.setPlaceholderText("Username")
-        self.username_input.setStyleSheet(self._input_style())
+        self.username_input.setObjectName("dialogInput")
         if user:
             self.username_input.setText(user.user_name)
         layout.addWidget(QLabel("Username"))
@@ -166,50 +123,7 @@ class AddEditUserDialog(QDialog):
         # Role
         self.role_input = QComboBox()
         self.role_input.addItems([r.value for r in UserRole])
-        self.role_input.setStyleSheet(f"""
-            QComboBox {{
-                border: 1px solid {COLOR_BORDER};
-                border-radius: 4px;
-                padding: 8px;
-                font-family: {FONT_FAMILY};
-                color: {COLOR_DARK_GREY};
-                background-color: {COLOR_WHITE};
-            }}
-            QComboBox::drop-down {{
-                border: none;
-                width: 20px;
-            }}
-            QComboBox::down-arrow {{
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid {COLOR_DARK_GREY};
-                width: 0;
-                height: 0;
-            }}
-            QComboBox QAbstractItemView {{
-                border: 1px solid {COLOR_BORDER};
-                background-color: {COLOR_WHITE};
-                color: {COLOR_DARK_GREY};
-                selection-background-color: #E8F4F8;
-                selection-color: {COLOR_DARK_GREY};
-                padding: 5px;
-                outline: none;
-            }}
-            QComboBox QAbstractItemView::item {{
-                padding: 8px 10px;
-                color: {COLOR_DARK_GREY};
-                background-color: {COLOR_WHITE};
-            }}
-            QComboBox QAbstractItemView::item:selected {{
-                background-color: #E8F4F8;
-                color: {COLOR_DARK_GREY};
-            }}
-            QComboBox QAbstractItemView::item:hover {{
-                background-color: #F0F9FF;
-                color: {COLOR_DARK_GREY};
-            }}
-        """)
+        self.role_input.setObjectName("dialogCombo")
         if user:
             self.role_input.setCurrentText(user.role.value)
         layout.addWidget(QLabel("Role"))
@@ -219,9 +133,19 @@ class AddEditUserDialog(QDialog):
         self.password_input = QLineEdit()
         self.password_input.setPlaceholderText("Password (leave empty to keep current)" if user else "Password")
         self.password_input.setEchoMode(QLineEdit.Password)
-        self.password_input.setStyleSheet(self._input_style())
+        self.password_input.setObjectName("dialogInput")
         layout.addWidget(QLabel("Password"))
         layout.addWidget(self.password_input)
+
+        # PIN for unlocking a locked till
+        self.pin_input = QLineEdit()
+        self.pin_input.setPlaceholderText("PIN (leave empty to keep current)" if user else "PIN (optional)")
+        self.pin_input.setEchoMode(QLineEdit.Password)
+        self.pin_input.setMaxLength(PIN_MAX_LENGTH)
+        self.pin_input.setValidator(QRegularExpressionValidator(QRegularExpression(r"\d*"), self.pin_input))
+        self.pin_input.setObjectName("dialogInput")
+        layout.addWidget(QLabel("Lock screen PIN"))
+        layout.addWidget(self.pin_input)
         
         # Buttons
         btn_layout = QHBoxLayout()
@@ -229,30 +153,22 @@ class AddEditUserDialog(QDialog):
         
         cancel_btn = QPushButton("Cancel")
         cancel_btn.setCursor(Qt.PointingHandCursor)
-        cancel_btn.setStyleSheet(f"background-color: {COLOR_LIGHT_GREY}; color: white; border-radius: 4px; padding: 8px 16px;")
+        cancel_btn.setProperty("variant", "cancel")
         cancel_btn.clicked.connect(self.reject)
         
         save_btn = QPushButton("Save")
         save_btn.setCursor(Qt.PointingHandCursor)
-        save_btn.setStyleSheet(f"background-color: {COLOR_GREEN}; color: white; border-radius: 4px; padding: 8px 16px;")
+        save_btn.setProperty("variant", "save")
         save_btn.clicked.connect(self.accept)
         
         btn_layout.addWidget(cancel_btn)
         btn_layout.addWidget(save_btn)
         layout.addLayout(btn_layout)
 
-    def _input_style(self):
-        return f"""
-            border: 1px solid {COLOR_BORDER};
-            border-radius: 4px;
-            padding: 8px;
-            font-family: {FONT_FAMILY};
-            color: {COLOR_DARK_GREY};
-        """
-
     def get_data(self):
         return {
             "username": self.username_input.text(),
             "role": self.role_input.currentText(),
-            "password": self.password_input.text()
+            "password": self.password_input.text(),
+            "pin": self.pin_input.text()
         }
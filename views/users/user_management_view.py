@@ -1,5 +1,5 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QMessageBox, QLabel
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QMessageBox, QLabel, QFileDialog, QProgressDialog
 )
 from PySide6.QtCore import Qt
 
@@ -15,6 +15,7 @@ class UserManagementView(QWidget):
         # Initialize ViewModel
         self.db_session = SessionLocal()
         self.vm = UserViewModel(self.db_session)
+        self.import_progress = None
         
         self._build_ui()
         self._bind_viewmodel()
@@ -27,26 +28,19 @@ class UserManagementView(QWidget):
         # Top Bar (Title + Add Button)
         top_layout = QHBoxLayout()
         title = QLabel("User Management")
-        title.setStyleSheet("font-size: 24px; font-weight: bold; color: #333;")
+        title.setObjectName("pageTitle")
         top_layout.addWidget(title)
         
         top_layout.addStretch()
+
+        self.import_btn = QPushButton("📥 Import")
+        self.import_btn.setCursor(Qt.PointingHandCursor)
+        self.import_btn.setObjectName("filterButton")
+        top_layout.addWidget(self.import_btn)
         
         self.add_btn = QPushButton("+ Add New User")
         self.add_btn.setCursor(Qt.PointingHandCursor)
-        self.add_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2F3C64;
-                color: white;
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #1a2540;
-            }
-        """)
+        self.add_btn.setProperty("variant", "primary")
         top_layout.addWidget(self.add_btn)
         layout.addLayout(top_layout)
         
@@ -61,6 +55,7 @@ class UserManagementView(QWidget):
     def _bind_viewmodel(self):
         # View -> ViewModel
         self.add_btn.clicked.connect(self._show_add_dialog)
+        self.import_btn.clicked.connect(self._open_import_dialog)
         self.table.editClicked.connect(self._show_edit_dialog)
         self.table.deleteClicked.connect(self._confirm_delete)
         
@@ -69,9 +64,14 @@ class UserManagementView(QWidget):
         
         # ViewModel -> View
         self.vm.usersChanged.connect(self._update_table)
+        self.vm.userRowInserted.connect(self.table.insert_user)
+        self.vm.userRowChanged.connect(self.table.update_user)
+        self.vm.userRowRemoved.connect(self.table.remove_user)
         self.vm.paginationChanged.connect(self._update_pagination)
         self.vm.errorChanged.connect(self._show_error)
         self.vm.successChanged.connect(self._show_success)
+        self.vm.importingChanged.connect(self._on_importing_changed)
+        self.vm.importProgress.connect(self._update_import_progress)
         
         # Initial State
         self._update_table()
@@ -92,13 +92,38 @@ class UserManagementView(QWidget):
         dialog = AddEditUserDialog(self)
         if dialog.exec():
             data = dialog.get_data()
-            self.vm.addUser(data['username'], data['password'], data['role'])
+            self.vm.addUser(data['username'], data['password'], data['role'], data['pin'])
 
     def _show_edit_dialog(self, user):
         dialog = AddEditUserDialog(self, user)
         if dialog.exec():
             data = dialog.get_data()
-            self.vm.updateUser(user.id, data['username'], data['role'], data['password'])
+            self.vm.updateUser(user.id, data['username'], data['role'], data['password'], data['pin'])
+
+    def _open_import_dialog(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Users", "", "Staff lists (*.csv *.xlsx);;CSV (*.csv);;Excel (*.xlsx)"
+        )
+        if path:
+            self.vm.importUsers(path)
+
+    def _on_importing_changed(self, importing):
+        self.import_btn.setEnabled(not importing)
+        if importing:
+            self.import_progress = QProgressDialog("Importing users...", None, 0, 0, self)
+            self.import_progress.setWindowTitle("Import")
+            self.import_progress.setWindowModality(Qt.WindowModal)
+            self.import_progress.setMinimumDuration(300)
+        elif self.import_progress is not None:
+            self.import_progress.close()
+            self.import_progress = None
+
+    def _update_import_progress(self, hashed, total):
+        if self.import_progress is None:
+            return
+        self.import_progress.setMaximum(max(total, 1))
+        self.import_progress.setValue(min(hashed, max(total, 1)))
+        self.import_progress.setLabelText(f"Secured {hashed:,} of {total:,} passwords")
 
     def _confirm_delete(self, user_id):
         msg = QMessageBox(self)
@@ -107,7 +132,6 @@ class UserManagementView(QWidget):
         msg.setIcon(QMessageBox.Question)
         msg.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
         msg.setDefaultButton(QMessageBox.No)
-        self._apply_msg_box_style(msg)
         
         if msg.exec() == QMessageBox.Yes:
             self.vm.deleteUser(user_id)
@@ -119,7 +143,6 @@ class UserManagementView(QWidget):
             msg.setText(message)
             msg.setIcon(QMessageBox.Warning)
             msg.setStandardButtons(QMessageBox.Ok)
-            self._apply_msg_box_style(msg)
             msg.exec()
 
     def _show_success(self, message):
@@ -129,30 +152,4 @@ class UserManagementView(QWidget):
             msg.setText(message)
             msg.setIcon(QMessageBox.Information)
             msg.setStandardButtons(QMessageBox.Ok)
-            self._apply_msg_box_style(msg)
             msg.exec()
-
-    def _apply_msg_box_style(self, msg_box):
-        msg_box.setStyleSheet("""
-            QMessageBox {
-                background-color: white;
-            }
-            QMessageBox QLabel {
-                color: #333333;
-                font-family: Sans-serif;
-                font-size: 14px;
-            }
-            QPushButton {
-                background-color: #2F3C64;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-family: Sans-serif;
-                font-size: 12px;
-                min-width: 60px;
-            }
-            QPushButton:hover {
-                background-color: #1E2A47;
-            }
-        """)
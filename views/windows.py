@@ -0,0 +1,17 @@
+from typing import Optional
+
+from PySide6.QtWidgets import QWidget
+
+# Top-level windows have no parent, so this reference is what keeps the
+# one on screen alive; the window it replaces is deleted
+_current: Optional[QWidget] = None
+
+
+def show_window(window: QWidget) -> None:
+    """Show `window` in place of the current top-level window, which is closed and deleted"""
+    global _current
+    previous, _current = _current, window
+    window.show()
+    if previous is not None and previous is not window:
+        previous.close()
+        previous.deleteLater()